@@ -0,0 +1,126 @@
+"""Benchmark reduced-resolution (draft) decoding for thumbnails and collage tiles.
+
+Compares the full-decode path used before draft mode with the current
+thumbnail and collage tile code on a synthetic multi-megapixel JPEG, and
+reports how far the outputs differ.
+
+    uv run python benchmarks/bench_draft.py [--width 7680 --height 4320 --runs 5]
+"""
+
+import argparse
+import math
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image, ImageChops, ImageStat
+
+from schenesort.cli import load_collage_tile
+from schenesort.thumbnails import THUMBNAIL_HEIGHT, THUMBNAIL_WIDTH, draft_for_size
+
+
+def make_source(path: Path, width: int, height: int, mode: str) -> None:
+    """Write a JPEG with gradients and noise so the encoder has real detail to keep."""
+    noise = Image.effect_noise((width, height), 64).convert("L")
+    gradient = Image.linear_gradient("L").resize((width, height))
+    mandel = Image.effect_mandelbrot((width, height), (-2.0, -1.25, 1.0, 1.25), 64)
+    img = Image.merge("RGB", (noise, gradient, mandel))
+    if mode == "CMYK":
+        img = img.convert("CMYK")
+    img.save(path, "JPEG", quality=92)
+
+
+def full_thumbnail(path: Path) -> Image.Image:
+    """Thumbnail the way generate_thumbnail did before the explicit draft call."""
+    with Image.open(path) as img:
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        img.thumbnail((THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT), Image.Resampling.LANCZOS)
+        return img.copy()
+
+
+def draft_thumbnail(path: Path) -> Image.Image:
+    """Thumbnail with the current generate_thumbnail pipeline (without the save)."""
+    with Image.open(path) as img:
+        draft_for_size(img, (THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT))
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        img.thumbnail((THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT), Image.Resampling.LANCZOS)
+        return img.copy()
+
+
+def full_tile(path: Path, tile_width: int, tile_height: int) -> Image.Image:
+    """Collage tile the way the collage command built it before draft mode."""
+    with Image.open(path) as img:
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+        img_ratio = img.width / img.height
+        if img_ratio > tile_width / tile_height:
+            new_height = tile_height
+            new_width = int(tile_height * img_ratio)
+        else:
+            new_width = tile_width
+            new_height = int(tile_width / img_ratio)
+        img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        left = (new_width - tile_width) // 2
+        top = (new_height - tile_height) // 2
+        return img.crop((left, top, left + tile_width, top + tile_height))
+
+
+def timed(func, runs: int) -> tuple[float, Image.Image]:
+    """Return the best wall time over runs and the last result."""
+    best = math.inf
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    assert result is not None
+    return best, result
+
+
+def psnr(a: Image.Image, b: Image.Image) -> float:
+    """Peak signal-to-noise ratio between two same-size RGB images."""
+    diff = ImageChops.difference(a.convert("RGB"), b.convert("RGB"))
+    mse = sum(v * v for v in ImageStat.Stat(diff).rms) / 3
+    return math.inf if mse == 0 else 20 * math.log10(255 / math.sqrt(mse))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--width", type=int, default=7680)
+    parser.add_argument("--height", type=int, default=4320)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("RGB", "CMYK"):
+            source = Path(tmp) / f"source_{mode.lower()}.jpg"
+            make_source(source, args.width, args.height, mode)
+            print(f"{mode} JPEG {args.width}x{args.height}")
+
+            cases = [
+                (
+                    "thumbnail",
+                    lambda s=source: full_thumbnail(s),
+                    lambda s=source: draft_thumbnail(s),
+                ),
+                (
+                    "collage tile",
+                    lambda s=source: full_tile(s, 480, 270),
+                    lambda s=source: load_collage_tile(s, 480, 270),
+                ),
+            ]
+            for name, old, new in cases:
+                old_time, old_img = timed(old, args.runs)
+                new_time, new_img = timed(new, args.runs)
+                print(
+                    f"  {name:<12} full {old_time * 1000:8.1f} ms   "
+                    f"draft {new_time * 1000:8.1f} ms   "
+                    f"speedup {old_time / new_time:5.1f}x   "
+                    f"PSNR {psnr(old_img, new_img):5.1f} dB"
+                )
+
+
+if __name__ == "__main__":
+    main()
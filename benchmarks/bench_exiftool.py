@@ -0,0 +1,92 @@
+"""Benchmark embedding metadata with exiftool.
+
+Writes a description and tags into small JPEGs, once by spawning exiftool
+per image (as metadata embed did before) and once through -stay_open
+sessions, and reports images per second.
+
+    uv run python benchmarks/bench_exiftool.py [--count 200 --jobs 4]
+"""
+
+import argparse
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from schenesort.exiftool import ExifTool, ExifToolPool
+from schenesort.parallel import bounded_map
+
+
+def make_images(root: Path, count: int) -> list[Path]:
+    images = []
+    for i in range(count):
+        path = root / f"wallpaper_{i:04}.jpg"
+        Image.new("RGB", (320, 200), color=(i % 256, 80, 160)).save(path)
+        images.append(path)
+    return images
+
+
+def embed_args(path: Path) -> list[str]:
+    return [
+        "-overwrite_original",
+        f"-IPTC:Caption-Abstract=Wallpaper {path.stem}. A quiet landscape at night.",
+        f"-XMP:Description=Wallpaper {path.stem}. A quiet landscape at night.",
+        *[f"-XMP:Subject={tag}" for tag in ("mountain", "night", "sky", "snow", "calm")],
+        str(path),
+    ]
+
+
+def spawn_each(executable: str, images: list[Path], jobs: int) -> None:
+    for image in images:
+        subprocess.run(
+            [executable, *embed_args(image)],
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            check=True,
+        )
+
+
+def session(executable: str, images: list[Path], jobs: int) -> None:
+    with ExifTool(executable) as exiftool:
+        for image in images:
+            assert exiftool.execute(embed_args(image)).ok
+
+
+def pool(executable: str, images: list[Path], jobs: int) -> None:
+    with ExifToolPool(jobs, executable) as exiftool:
+        for _, result in bounded_map(lambda p: exiftool.execute(embed_args(p)), images, jobs):
+            assert result.ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=4)
+    parser.add_argument("--exiftool", default="exiftool", help="exiftool executable")
+    args = parser.parse_args()
+
+    executable = shutil.which(args.exiftool)
+    if executable is None:
+        raise SystemExit(f"{args.exiftool} not found")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        images = make_images(Path(tmp), args.count)
+        print(f"{args.count} images")
+
+        cases = [
+            ("spawn per image", spawn_each),
+            ("one session", session),
+            (f"{args.jobs} sessions", pool),
+        ]
+        for name, run in cases:
+            start = time.perf_counter()
+            run(executable, images, args.jobs)
+            elapsed = time.perf_counter() - start
+            print(f"  {name:<16} {elapsed:7.2f} s   {args.count / elapsed:8.1f} images/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Benchmark bulk index writes.
+
+Indexes synthetic metadata the way the index command did before bulk
+ingest (one statement per row and child, default journal mode, full-text
+index kept in sync by per-row triggers) and with WallpaperDB.index_many,
+and reports rows per second for both.
+
+    uv run python benchmarks/bench_index.py [--count 100000 --batch-size 5000]
+"""
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from schenesort.db import FTS_SCHEMA, SCHEMA, WallpaperDB
+from schenesort.xmp import ImageMetadata
+
+STYLES = ["photography", "digital art", "illustration", "3d render", "anime", "painting"]
+TAGS = ["mountain", "city", "neon", "forest", "ocean", "space", "night", "rain", "sky", "snow"]
+MOODS = ["peaceful", "dramatic", "mysterious", "vibrant", "melancholic"]
+COLORS = ["red", "blue", "green", "purple", "orange", "black", "white"]
+
+LEGACY_FTS_TRIGGERS = """
+CREATE TRIGGER wallpapers_fts_insert AFTER INSERT ON wallpapers BEGIN
+    INSERT INTO wallpapers_fts (rowid, description, scene, style, subject)
+    VALUES (new.id, new.description, new.scene, new.style, new.subject);
+END;
+
+CREATE TRIGGER wallpapers_fts_delete AFTER DELETE ON wallpapers BEGIN
+    INSERT INTO wallpapers_fts (wallpapers_fts, rowid, description, scene, style, subject)
+    VALUES ('delete', old.id, old.description, old.scene, old.style, old.subject);
+END;
+"""
+
+
+def make_items(root: Path, count: int) -> list[tuple[Path, ImageMetadata]]:
+    """Build metadata resembling generated sidecars (5 tags, 2 moods, 3 colors)."""
+    items = []
+    for i in range(count):
+        metadata = ImageMetadata(
+            description=f"{TAGS[i % 10]} {STYLES[i % 6]} wallpaper {i}",
+            scene="A wide view of a quiet landscape under a changing sky.",
+            tags=[TAGS[(i + k) % 10] for k in range(5)],
+            mood=[MOODS[(i + k) % 5] for k in range(2)],
+            style=STYLES[i % 6],
+            colors=[COLORS[(i + k) % 7] for k in range(3)],
+            time_of_day="night",
+            subject="landscape",
+            width=3840,
+            height=2160,
+            recommended_screen="4K",
+        )
+        items.append((root / f"dir{i % 100}" / f"wallpaper_{i:06}.jpg", metadata))
+    return items
+
+
+def legacy_index(db_path: Path, items: list[tuple[Path, ImageMetadata]]) -> None:
+    """Index one statement at a time, as index_image did before bulk ingest."""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    conn.executescript(FTS_SCHEMA)
+    conn.executescript(LEGACY_FTS_TRIGGERS)
+    for image_path, m in items:
+        row = conn.execute(
+            "SELECT id, mtime FROM wallpapers WHERE path = ?", (str(image_path),)
+        ).fetchone()
+        if row:
+            conn.execute("DELETE FROM wallpapers WHERE id = ?", (row["id"],))
+        cursor = conn.execute(
+            """INSERT INTO wallpapers
+               (path, filename, extension, description, scene, style, time_of_day,
+                subject, source, ai_model, width, height, recommended_screen, mtime)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                str(image_path),
+                image_path.name,
+                image_path.suffix,
+                m.description,
+                m.scene,
+                m.style,
+                m.time_of_day,
+                m.subject,
+                None,
+                None,
+                m.width,
+                m.height,
+                m.recommended_screen,
+                0,
+            ),
+        )
+        wallpaper_id = cursor.lastrowid
+        for tag in m.tags:
+            conn.execute("INSERT INTO tags (wallpaper_id, tag) VALUES (?, ?)", (wallpaper_id, tag))
+        for mood in m.mood:
+            conn.execute(
+                "INSERT INTO moods (wallpaper_id, mood) VALUES (?, ?)", (wallpaper_id, mood)
+            )
+        for color in m.colors:
+            conn.execute(
+                "INSERT INTO colors (wallpaper_id, color) VALUES (?, ?)", (wallpaper_id, color)
+            )
+    conn.commit()
+    conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        items = make_items(root / "wallpapers", args.count)
+        print(f"{args.count} images")
+
+        cases = [
+            ("per-row", lambda: legacy_index(root / "legacy.db", items)),
+            ("index_many", lambda: bulk_index(root / "bulk.db", items, args.batch_size)),
+            # Second pass over an existing index, where every entry is unchanged
+            ("index_many again", lambda: bulk_index(root / "bulk.db", items, args.batch_size)),
+        ]
+        for name, run in cases:
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            print(f"  {name:<17} {elapsed:7.2f} s   {args.count / elapsed:10.0f} rows/s")
+
+
+def bulk_index(db_path: Path, items: list[tuple[Path, ImageMetadata]], batch_size: int) -> None:
+    with WallpaperDB(db_path) as db:
+        db.index_many(items, batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark decoding wallpapers for the preview panel.
+
+Builds a few 8K JPEGs and, for each, times a full-size decode scaled to
+the panel afterwards (what the preview widget was handed before) against
+decode_preview, which decodes straight at the panel's pixel size. The
+preview's prefetcher runs the latter off the UI thread, so a step to a
+prefetched image costs a cache lookup.
+
+    uv run python benchmarks/bench_preview.py [--count 6] [--panel 1200x900]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from schenesort.tui.widgets.image_preview import decode_preview
+
+SOURCE_SIZE = (7680, 4320)
+
+
+def make_corpus(root: Path, count: int) -> list[Path]:
+    paths = []
+    gradient = Image.linear_gradient("L").resize(SOURCE_SIZE)
+    for i in range(count):
+        path = root / f"wallpaper_{i:03}.jpg"
+        image = Image.merge(
+            "RGB", (gradient, gradient.point(lambda v, i=i: (v + i * 40) % 256), gradient)
+        )
+        image.save(path, quality=90)
+        paths.append(path)
+    return paths
+
+
+def full_decode(path: Path, size: tuple[int, int]) -> Image.Image:
+    with Image.open(path) as img:
+        img.load()
+        scale = min(size[0] / img.width, size[1] / img.height)
+        return img.resize((round(img.width * scale), round(img.height * scale)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=6)
+    parser.add_argument("--panel", default="1200x900", help="Panel size in pixels")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.panel.split("x"))
+    size = (width, height)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_corpus(Path(tmp), args.count)
+        source = "x".join(map(str, SOURCE_SIZE))
+        print(f"{args.count} images {source} to {args.panel} (best of {args.repeat})")
+
+        for name, decode in [("full decode", full_decode), ("preview", decode_preview)]:
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                for path in paths:
+                    decode(path, size)
+                best = min(best, time.perf_counter() - start)
+            print(f"  {name:<12} {best / args.count * 1000:8.1f} ms/image")
+
+
+if __name__ == "__main__":
+    main()
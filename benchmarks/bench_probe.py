@@ -0,0 +1,67 @@
+"""Benchmark reading image dimensions.
+
+Builds a mixed corpus of JPEG, PNG, GIF, BMP, WebP and TIFF files and
+reads every file's size by opening it with PIL (as get_image_dimensions
+did before) and with the header probe, and reports files per second.
+
+    uv run python benchmarks/bench_probe.py [--count 600]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from schenesort.probe import probe_dimensions
+
+FORMATS = ["jpg", "png", "gif", "bmp", "webp", "tiff"]
+
+
+def make_corpus(root: Path, count: int) -> list[Path]:
+    paths = []
+    for i in range(count):
+        ext = FORMATS[i % len(FORMATS)]
+        path = root / f"wallpaper_{i:05}.{ext}"
+        image = Image.new("RGB", (640 + i % 7, 400 + i % 5), (i % 256, 90, 30))
+        if ext == "jpg":
+            # Camera-style EXIF block ahead of the frame header
+            exif = Image.Exif()
+            exif[0x010E] = "x" * 8000
+            image.save(path, exif=exif)
+        else:
+            image.save(path)
+        paths.append(path)
+    return paths
+
+
+def pil_size(path: Path) -> tuple[int, int]:
+    with Image.open(path) as img:
+        return img.size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=600)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_corpus(Path(tmp), args.count)
+        print(f"{args.count} files, {', '.join(FORMATS)} (best of {args.repeat})")
+
+        expected = [pil_size(p) for p in paths]
+        for name, read in [("PIL open", pil_size), ("probe", probe_dimensions)]:
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                sizes = [read(p) for p in paths]
+                best = min(best, time.perf_counter() - start)
+            if sizes != expected:
+                raise SystemExit(f"{name} read different sizes")
+            print(f"  {name:<9} {best:7.3f} s   {args.count / best:10.0f} files/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark collecting images from a collection.
+
+Builds a synthetic tree and collects every image with its size and
+sidecar state, once with Path.glob plus is_file, stat and a sidecar
+exists check per image (as the commands did before the shared walker),
+and once with schenesort.walker.walk.
+
+    uv run python benchmarks/bench_walk.py [--count 20000 --dirs 50]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from schenesort.walker import VALID_IMAGE_EXTENSIONS, walk
+
+
+def make_tree(root: Path, count: int, dirs: int) -> None:
+    """Create empty images spread over dirs subdirectories, half with sidecars."""
+    for d in range(dirs):
+        (root / f"dir{d:03}").mkdir(parents=True)
+    for i in range(count):
+        image = root / f"dir{i % dirs:03}" / f"wallpaper_{i:06}.jpg"
+        image.write_bytes(b"")
+        if i % 2:
+            image.with_name(f"{image.name}.xmp").write_bytes(b"")
+
+
+def glob_collect(root: Path) -> list[tuple[Path, int, bool]]:
+    result = []
+    for f in sorted(root.glob("**/*")):
+        if f.suffix.lower() in VALID_IMAGE_EXTENSIONS and f.is_file():
+            sidecar = f.parent / f"{f.name}.xmp"
+            result.append((f, f.stat().st_size, sidecar.exists()))
+    return result
+
+
+def walker_collect(root: Path) -> list[tuple[Path, int, bool]]:
+    return [(e.path, e.stat().st_size, e.has_sidecar) for e in walk(root, recursive=True)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--dirs", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "wallpapers"
+        make_tree(root, args.count, args.dirs)
+        print(f"{args.count} images in {args.dirs} directories (best of {args.repeat})")
+
+        expected = None
+        for name, collect in [("glob", glob_collect), ("walker", walker_collect)]:
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                found = collect(root)
+                best = min(best, time.perf_counter() - start)
+            if expected is None:
+                expected = sorted(found)
+            elif sorted(found) != expected:
+                raise SystemExit(f"{name} found different images")
+            print(f"  {name:<7} {best:7.3f} s   {args.count / best:10.0f} images/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark reading XMP sidecars.
+
+Writes synthetic sidecars with write_xmp and parses them with the general
+defusedxml path (one find() per property) and with the single-pass fast
+path read_xmp now takes, and reports sidecars parsed per second.
+
+    uv run python benchmarks/bench_xmp.py [--count 5000]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from schenesort.xmp import ImageMetadata, _parse_fast, _parse_general, get_xmp_path, write_xmp
+
+TAGS = ["mountain", "city", "neon", "forest", "ocean", "space", "night", "rain", "sky", "snow"]
+
+
+def make_sidecars(root: Path, count: int) -> list[bytes]:
+    """Write sidecars resembling generated ones and return their contents."""
+    documents = []
+    for i in range(count):
+        image = root / f"wallpaper_{i:06}.jpg"
+        metadata = ImageMetadata(
+            description=f"{TAGS[i % 10]} wallpaper {i}",
+            scene="A wide view of a quiet landscape under a changing sky, with soft light.",
+            tags=[TAGS[(i + k) % 10] for k in range(5)],
+            mood=["peaceful", "dramatic"],
+            style="photography",
+            colors=["blue", "orange", "black"],
+            time_of_day="night",
+            subject="landscape",
+            source="https://example.com/wallpapers",
+            ai_model="llava:13b",
+            width=3840,
+            height=2160,
+            recommended_screen="4K",
+        )
+        write_xmp(image, metadata)
+        documents.append(get_xmp_path(image).read_bytes())
+    return documents
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = make_sidecars(Path(tmp), args.count)
+        print(f"{args.count} sidecars (best of {args.repeat})")
+
+        for name, parse in [("general", _parse_general), ("fast", _parse_fast)]:
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                for data in documents:
+                    parse(data)
+                best = min(best, time.perf_counter() - start)
+            print(f"  {name:<8} {best:7.3f} s   {args.count / best:10.0f} sidecars/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,38 @@
 """Schenesort CLI - Wallpaper collection management tool."""
 
 import base64
+import io
 import re
+from contextlib import AbstractContextManager, nullcontext
+from itertools import repeat
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated
 
 import filetype
 import ollama
 import typer
 
 from schenesort.config import load_config
-from schenesort.xmp import get_recommended_screen, get_xmp_path, read_xmp, write_xmp
+from schenesort.inference_cache import InferenceCache, hash_file
+from schenesort.ollama_pool import HostDispatcher
+from schenesort.probe import get_image_dimensions, read_signature
+from schenesort.walker import (
+    VALID_IMAGE_EXTENSIONS,
+    find_files,
+    find_images,
+    scan_tree,
+    walk,
+)
+from schenesort.xmp import (
+    get_recommended_screen,
+    get_xmp_path,
+    read_xmp,
+    read_xmp_many,
+    write_xmp,
+)
+
+if TYPE_CHECKING:
+    from PIL import Image
 
 app = typer.Typer(
     name="schenesort",
@@ -18,8 +40,6 @@ app = typer.Typer(
     no_args_is_help=True,
 )
 
-VALID_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tiff", ".tif"}
-
 
 def sanitise_filename(name: str) -> str:
     """
@@ -85,7 +105,7 @@ def sanitise_filename(name: str) -> str:
 
 def get_actual_image_type(filepath: Path) -> str | None:
     """Detect actual image type by reading file header."""
-    kind = filetype.guess(filepath)
+    kind = filetype.guess(read_signature(filepath))
     if kind is None:
         return None
     if kind.mime.startswith("image/"):
@@ -114,17 +134,6 @@ def validate_extension(filepath: Path) -> tuple[bool, str | None]:
     return current_ext == actual_type, actual_type
 
 
-def get_image_dimensions(filepath: Path) -> tuple[int, int]:
-    """Get image width and height using PIL."""
-    try:
-        from PIL import Image
-
-        with Image.open(filepath) as img:
-            return img.size  # (width, height)
-    except Exception:
-        return 0, 0
-
-
 @app.command()
 def sanitise(
     path: Annotated[Path, typer.Argument(help="Directory or file to sanitise")],
@@ -142,14 +151,9 @@ def sanitise(
         typer.echo(f"Error: Path '{path}' does not exist.", err=True)
         raise typer.Exit(1)
 
-    if path.is_file():
-        files = [path]
-    else:
-        pattern = "**/*" if recursive else "*"
-        files = [f for f in path.glob(pattern) if f.is_file()]
-
     renamed_count = 0
-    for filepath in files:
+    for entry in find_files(path, recursive):
+        filepath = entry.path
         # Skip .xmp sidecar files - they follow their parent image
         if filepath.suffix.lower() == ".xmp":
             continue
@@ -173,7 +177,7 @@ def sanitise(
 
             # Handle associated XMP sidecar file
             old_xmp = get_xmp_path(filepath)
-            if old_xmp.exists():
+            if entry.has_sidecar:
                 new_xmp = get_xmp_path(new_path)
                 if dry_run:
                     typer.echo(f"Would rename: {old_xmp} -> {new_xmp}")
@@ -201,39 +205,58 @@ def validate(
     recursive: Annotated[
         bool, typer.Option("--recursive", "-r", help="Process directories recursively")
     ] = False,
+    jobs: Annotated[
+        int | None,
+        typer.Option("--jobs", "-j", help="Number of threads reading headers (default: 1)"),
+    ] = None,
+    as_json: Annotated[
+        bool, typer.Option("--json", help="Print a JSON summary instead of a report")
+    ] = False,
 ) -> None:
     """Validate that image file extensions match their actual content type."""
+    import json
+    import time
+
+    from schenesort.parallel import bounded_map
+
     path = path.resolve()
 
     if not path.exists():
         typer.echo(f"Error: Path '{path}' does not exist.", err=True)
         raise typer.Exit(1)
 
-    if path.is_file():
-        files = [path]
-    else:
-        pattern = "**/*" if recursive else "*"
-        files = [f for f in path.glob(pattern) if f.is_file()]
+    start = time.monotonic()
+    files = [entry.path for entry in find_images(path, recursive)]
 
     valid_count = 0
     invalid_count = 0
     non_image_count = 0
     fixed_count = 0
-
-    for filepath in files:
-        if filepath.suffix.lower() not in VALID_IMAGE_EXTENSIONS:
-            continue
-
-        is_valid, actual_ext = validate_extension(filepath)
-
+    formats: dict[str, int] = {}
+    invalid_files: list[dict[str, str]] = []
+    non_image_files: list[str] = []
+
+    def report(message: str) -> None:
+        if not as_json:
+            typer.echo(message)
+
+    # Results come back in file order, so the report does not depend on --jobs
+    for filepath, (is_valid, actual_ext) in bounded_map(
+        validate_extension, files, jobs or 1, ordered=True
+    ):
         if actual_ext is None:
-            typer.echo(f"[NOT IMAGE] {filepath}")
+            report(f"[NOT IMAGE] {filepath}")
             non_image_count += 1
-        elif is_valid:
+            non_image_files.append(str(filepath))
+            continue
+
+        formats[actual_ext] = formats.get(actual_ext, 0) + 1
+        if is_valid:
             valid_count += 1
         else:
-            typer.echo(f"[INVALID] {filepath} (actual: {actual_ext})")
+            report(f"[INVALID] {filepath} (actual: {actual_ext})")
             invalid_count += 1
+            invalid_files.append({"path": str(filepath), "actual": actual_ext})
 
             if fix:
                 new_path = filepath.with_suffix(actual_ext)
@@ -241,8 +264,25 @@ def validate(
                     typer.echo(f"  Cannot fix: target '{new_path}' already exists", err=True)
                 else:
                     filepath.rename(new_path)
-                    typer.echo(f"  Fixed: {filepath.name} -> {new_path.name}")
+                    report(f"  Fixed: {filepath.name} -> {new_path.name}")
                     fixed_count += 1
+                    invalid_files[-1]["fixed"] = str(new_path)
+
+    if as_json:
+        summary = {
+            "path": str(path),
+            "files": len(files),
+            "valid": valid_count,
+            "invalid": invalid_count,
+            "not_images": non_image_count,
+            "fixed": fixed_count,
+            "formats": dict(sorted(formats.items())),
+            "invalid_files": invalid_files,
+            "not_image_files": non_image_files,
+            "elapsed_seconds": round(time.monotonic() - start, 3),
+        }
+        typer.echo(json.dumps(summary, indent=2))
+        return
 
     typer.echo("\nValidation complete:")
     typer.echo(f"  Valid: {valid_count}")
@@ -270,18 +310,17 @@ def info(
         typer.echo(f"Error: Path '{path}' is not a directory.", err=True)
         raise typer.Exit(1)
 
-    pattern = "**/*" if recursive else "*"
-    files = [f for f in path.glob(pattern) if f.is_file()]
+    files = [entry for _, listing in scan_tree(path, recursive) for entry in listing.values()]
 
     ext_counts: dict[str, int] = {}
     total_size = 0
     files_with_spaces = 0
 
-    for filepath in files:
-        ext = filepath.suffix.lower() or "(no extension)"
+    for entry in files:
+        ext = Path(entry.name).suffix.lower() or "(no extension)"
         ext_counts[ext] = ext_counts.get(ext, 0) + 1
-        total_size += filepath.stat().st_size
-        if " " in filepath.name:
+        total_size += entry.stat().st_size
+        if " " in entry.name:
             files_with_spaces += 1
 
     typer.echo(f"Collection: {path}")
@@ -314,23 +353,22 @@ def cleanup(
         typer.echo(f"Error: Path '{path}' is not a directory.", err=True)
         raise typer.Exit(1)
 
-    pattern = "**/*.xmp" if recursive else "*.xmp"
-    xmp_files = list(path.glob(pattern))
-
-    if not xmp_files:
-        typer.echo("No XMP sidecar files found.")
-        raise typer.Exit(0)
-
+    found_xmp = False
     orphaned_count = 0
     total_size = 0
 
-    for xmp_path in xmp_files:
-        # The image path is the XMP path without the .xmp suffix
-        # e.g., "image.jpg.xmp" -> "image.jpg"
-        image_path = xmp_path.parent / xmp_path.stem
+    for directory, listing in scan_tree(path, recursive):
+        for name in sorted(listing):
+            if not name.endswith(".xmp"):
+                continue
+            found_xmp = True
+            # The image is the XMP name without the .xmp suffix, in the same listing
+            # e.g., "image.jpg.xmp" -> "image.jpg"
+            if name[:-4] in listing:
+                continue
 
-        if not image_path.exists():
-            size = xmp_path.stat().st_size
+            xmp_path = directory / name
+            size = listing[name].stat().st_size
             total_size += size
 
             if dry_run:
@@ -341,6 +379,10 @@ def cleanup(
 
             orphaned_count += 1
 
+    if not found_xmp:
+        typer.echo("No XMP sidecar files found.")
+        raise typer.Exit(0)
+
     if orphaned_count == 0:
         typer.echo("No orphaned XMP sidecars found.")
     else:
@@ -359,6 +401,10 @@ def index(
         bool, typer.Option("--prune", "-p", help="Remove entries for deleted files")
     ] = False,
     rebuild: Annotated[bool, typer.Option("--rebuild", help="Rebuild index from scratch")] = False,
+    jobs: Annotated[
+        int | None,
+        typer.Option("--jobs", "-j", help="Number of threads reading sidecars (default: 1)"),
+    ] = None,
 ) -> None:
     """Build or update the SQLite index of wallpaper metadata."""
     from schenesort.db import WallpaperDB
@@ -378,24 +424,38 @@ def index(
             typer.echo("Rebuilding index from scratch...")
             db.clear()
 
-        pattern = "**/*" if recursive else "*"
-        image_files = [
-            f
-            for f in path.glob(pattern)
-            if f.is_file() and f.suffix.lower() in VALID_IMAGE_EXTENSIONS
-        ]
+        entries = list(walk(path, recursive))
+        image_files = [entry.path for entry in entries]
 
         typer.echo(f"Indexing {len(image_files)} image(s)...")
 
+        # Compare sidecar mtimes against the index first and only parse what changed
+        indexed_mtimes = db.get_mtimes()
+        sidecar_mtimes: dict[str, float] = {}
         indexed = 0
-        for filepath in image_files:
-            xmp_path = get_xmp_path(filepath)
-            if xmp_path.exists():
-                metadata = read_xmp(filepath)
-                db.index_image(filepath, metadata)
+        unchanged = 0
+
+        def changed_images():
+            nonlocal indexed, unchanged
+            for entry in entries:
+                try:
+                    mtime = entry.sidecar_mtime()
+                except OSError:
+                    continue
+                if mtime is None:
+                    continue
                 indexed += 1
+                filepath = entry.path
+                key = str(filepath)
+                if indexed_mtimes.get(key) == mtime:
+                    unchanged += 1
+                    continue
+                sidecar_mtimes[key] = mtime
+                yield filepath
 
-        db.commit()
+        db.index_many(
+            read_xmp_many(changed_images(), jobs or 1, ordered=False), mtimes=sidecar_mtimes
+        )
 
         if prune:
             valid_paths = {str(f) for f in image_files}
@@ -403,7 +463,10 @@ def index(
             if pruned:
                 typer.echo(f"Pruned {pruned} removed file(s) from index.")
 
-        typer.echo(f"Indexed {indexed} wallpaper(s) with metadata.")
+        typer.echo(
+            f"Indexed {indexed} wallpaper(s) with metadata "
+            f"({indexed - unchanged} parsed, {unchanged} unchanged)."
+        )
 
         # Show stats
         stats = db.stats()
@@ -412,6 +475,53 @@ def index(
         typer.echo(f"With metadata: {stats.get('with_metadata', 0)}")
 
 
+@app.command()
+def watch(
+    path: Annotated[Path, typer.Argument(help="Directory to watch")],
+    recursive: Annotated[
+        bool, typer.Option("--recursive/--no-recursive", "-r", help="Watch subdirectories")
+    ] = True,
+    thumbnails: Annotated[
+        bool, typer.Option("--thumbnails", "-t", help="Generate thumbnails for new images")
+    ] = False,
+    poll: Annotated[
+        bool, typer.Option("--poll", help="Poll for changes instead of using inotify")
+    ] = False,
+    debounce: Annotated[
+        float, typer.Option("--debounce", help="Seconds to wait for changes to settle")
+    ] = 1.0,
+) -> None:
+    """Keep the index up to date as images and sidecars change (run index first)."""
+    import time
+
+    from schenesort.db import WallpaperDB
+    from schenesort.watch import IndexUpdater, InotifyWatcher, UpdateResult, open_watcher, run
+
+    path = path.resolve()
+
+    if not path.is_dir():
+        typer.echo(f"Error: Path '{path}' is not a directory.", err=True)
+        raise typer.Exit(1)
+
+    watcher = open_watcher(path, recursive, poll)
+    method = "inotify" if isinstance(watcher, InotifyWatcher) else "polling"
+    typer.echo(f"Watching {path} ({method}), press Ctrl+C to stop.")
+
+    def report(result: UpdateResult) -> None:
+        parts = [f"indexed {result.indexed}", f"removed {result.removed}"]
+        if thumbnails:
+            parts.append(f"{result.thumbnails} thumbnail(s)")
+        typer.echo(f"[{time.strftime('%H:%M:%S')}] " + ", ".join(parts))
+
+    try:
+        with WallpaperDB() as db:
+            run(watcher, IndexUpdater(db, recursive, thumbnails), debounce, on_update=report)
+    except KeyboardInterrupt:
+        typer.echo("\nStopped watching.")
+    finally:
+        watcher.close()
+
+
 @app.command()
 def thumbnail(
     path: Annotated[Path, typer.Argument(help="Directory to generate thumbnails for")],
@@ -422,14 +532,23 @@ def thumbnail(
     clear: Annotated[
         bool, typer.Option("--clear", help="Clear thumbnail cache before generating")
     ] = False,
+    jobs: Annotated[
+        int | None,
+        typer.Option("--jobs", "-j", help="Number of worker processes (default: CPU count)"),
+    ] = None,
 ) -> None:
     """Generate thumbnails for gallery view."""
+    from functools import partial
+
     from rich.progress import BarColumn, Progress, TaskProgressColumn, TextColumn
 
+    from schenesort.parallel import bounded_map, default_jobs
     from schenesort.thumbnails import (
         clear_cache,
         generate_thumbnail,
         get_cache_stats,
+        get_thumbnail_cache,
+        get_thumbnail_path,
         thumbnail_exists,
     )
 
@@ -447,10 +566,7 @@ def thumbnail(
         cleared = clear_cache()
         typer.echo(f"Cleared {cleared} cached thumbnail(s).")
 
-    pattern = "**/*" if recursive else "*"
-    image_files = [
-        f for f in path.glob(pattern) if f.is_file() and f.suffix.lower() in VALID_IMAGE_EXTENSIONS
-    ]
+    image_files = [entry.path for entry in walk(path, recursive)]
 
     if not image_files:
         typer.echo("No image files found.")
@@ -459,6 +575,7 @@ def thumbnail(
     generated = 0
     skipped = 0
     failed = 0
+    cached = []
 
     with Progress(
         TextColumn("[progress.description]{task.description}"),
@@ -468,15 +585,22 @@ def thumbnail(
     ) as progress:
         task = progress.add_task("Generating thumbnails", total=len(image_files))
 
+        pending = []
         for filepath in image_files:
             if not force and thumbnail_exists(filepath):
                 skipped += 1
+                cached.append(get_thumbnail_path(filepath))
                 progress.advance(task)
-                continue
+            else:
+                pending.append(filepath)
 
-            result = generate_thumbnail(filepath, force=force)
+        # Workers return as they finish, so the bar keeps moving on slow files
+        worker = partial(generate_thumbnail, force=force)
+        workers = jobs if jobs is not None else default_jobs()
+        for _, result in bounded_map(worker, pending, workers, ordered=False, processes=True):
             if result:
                 generated += 1
+                cached.append(result)
             else:
                 failed += 1
 
@@ -484,11 +608,19 @@ def thumbnail(
 
     typer.echo(f"\nGenerated: {generated}, Skipped: {skipped}, Failed: {failed}")
 
+    # Everything just generated or found counts as recently used
+    with get_thumbnail_cache() as cache:
+        cache.record(cached)
+        evicted = cache.evict()
+    if evicted:
+        typer.echo(f"Evicted {evicted} least recently used thumbnail(s) to stay within budget.")
+
     # Show cache stats
     stats = get_cache_stats()
     typer.echo(f"\nCache: {stats['path']}")
     typer.echo(f"Total thumbnails: {stats['count']}")
-    typer.echo(f"Cache size: {stats['size_mb']:.1f} MB")
+    limit = f"limit {stats['max_mb']:.0f} MB" if stats["max_mb"] else "no limit"
+    typer.echo(f"Cache size: {stats['size_mb']:.1f} MB ({limit})")
 
 
 @app.command()
@@ -509,7 +641,12 @@ def get(
         int | None, typer.Option("--min-height", help="Minimum height in pixels")
     ] = None,
     search: Annotated[
-        str | None, typer.Option("--search", "-q", help="Search description, scene, style, subject")
+        str | None,
+        typer.Option(
+            "--search",
+            "-q",
+            help='Search description, scene, style, subject (prefix words, "exact phrases")',
+        ),
     ] = None,
     limit: Annotated[
         int | None, typer.Option("--limit", "-n", help="Maximum number of results")
@@ -678,7 +815,20 @@ def gallery(
         int | None, typer.Option("--min-height", help="Minimum height in pixels")
     ] = None,
     search: Annotated[
-        str | None, typer.Option("--search", "-q", help="Search description, scene, style, subject")
+        str | None,
+        typer.Option(
+            "--search",
+            "-q",
+            help='Search description, scene, style, subject (prefix words, "exact phrases")',
+        ),
+    ] = None,
+    jobs: Annotated[
+        int | None,
+        typer.Option(
+            "--jobs",
+            "-j",
+            help="Processes generating missing thumbnails (default: CPU count, 0 to disable)",
+        ),
     ] = None,
 ) -> None:
     """Browse wallpapers in a thumbnail grid with filter sidebar."""
@@ -698,7 +848,7 @@ def gallery(
         min_height=min_height,
     )
 
-    app_instance = GridBrowser(initial_filters=initial_filters)
+    app_instance = GridBrowser(initial_filters=initial_filters, jobs=jobs)
     app_instance.run()
 
 
@@ -729,6 +879,9 @@ def config(
 
 DEFAULT_MODEL = "llava"
 
+# Vision models resize their input to well under this, so larger uploads are wasted
+DEFAULT_MAX_IMAGE_SIZE = 1024
+
 
 def get_ollama_settings(
     host: str | None = None, model: str | None = None
@@ -740,18 +893,103 @@ def get_ollama_settings(
     return effective_host, effective_model
 
 
+def get_ollama_hosts(hosts: list[str] | None = None) -> list[str | None]:
+    """Get the Ollama hosts to spread requests over, using config defaults if not specified.
+
+    None stands for the default local server.
+    """
+    if hosts:
+        return list(hosts)
+    config = load_config()
+    if config.ollama_hosts:
+        return list(config.ollama_hosts)
+    return [config.ollama_host or None]
+
+
+def get_ollama_timeout(timeout: float | None = None) -> float | None:
+    """Get the per-request timeout in seconds, or None to wait indefinitely."""
+    if timeout is None:
+        timeout = load_config().ollama_timeout
+    return timeout if timeout > 0 else None
+
+
+def echo_host_stats(dispatcher: HostDispatcher) -> None:
+    """Print connection reuse, and per-host request stats when several hosts were used."""
+    connections = dispatcher.connections
+    if connections.requests:
+        typer.echo(
+            f"Ollama connections: {connections.connections} opened for "
+            f"{connections.requests} request(s) ({connections.reuse_rate:.0%} reused)."
+        )
+    lines = dispatcher.summary()
+    if len(dispatcher.hosts) > 1 and lines:
+        typer.echo("\nOllama hosts:")
+        for line in lines:
+            typer.echo(f"  {line}")
+
+
+def get_max_image_size(max_size: int | None = None, resize: bool = True) -> int | None:
+    """Get the long edge images are downscaled to before upload, or None to send originals."""
+    if not resize:
+        return None
+    if max_size is None:
+        max_size = load_config().ollama_max_image_size
+    return max_size if max_size > 0 else None
+
+
+def open_inference_cache(enabled: bool = True) -> AbstractContextManager[InferenceCache | None]:
+    """Open the inference result cache, or a context yielding None when disabled."""
+    if not enabled:
+        return nullcontext()
+    return InferenceCache(max_entries=load_config().inference_cache_size)
+
+
+def encode_image(filepath: Path, max_size: int | None = DEFAULT_MAX_IMAGE_SIZE) -> str:
+    """Read an image and base64-encode it for the vision model.
+
+    Images with a long edge above max_size are downscaled and re-encoded as
+    JPEG in memory, which keeps requests small for 8K sources. Smaller
+    images, files PIL cannot read and max_size=None send the original bytes.
+    """
+    if max_size:
+        from PIL import Image
+
+        from schenesort.thumbnails import draft_for_size
+
+        try:
+            with Image.open(filepath) as img:
+                if max(img.size) > max_size:
+                    draft_for_size(img, (max_size, max_size))
+                    if img.mode != "RGB":
+                        img = img.convert("RGB")
+                    img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+
+                    buffer = io.BytesIO()
+                    img.save(buffer, "JPEG", quality=90)
+                    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+        except OSError:
+            pass
+
+    with open(filepath, "rb") as f:
+        return base64.b64encode(f.read()).decode("utf-8")
+
+
 @app.command()
 def models(
     host: Annotated[
         str | None,
         typer.Option("--host", "-H", help="Ollama server URL (e.g., http://server:11434)"),
     ] = None,
+    timeout: Annotated[
+        float | None,
+        typer.Option("--timeout", help="Seconds to wait for each Ollama request (0 for no limit)"),
+    ] = None,
 ) -> None:
     """List available models on the Ollama server."""
     effective_host, _ = get_ollama_settings(host=host)
     try:
-        client = ollama.Client(host=effective_host) if effective_host else ollama
-        response = client.list()
+        with HostDispatcher([effective_host], get_ollama_timeout(timeout)) as dispatcher:
+            response = dispatcher.client(effective_host).list()
 
         if not response.models:
             typer.echo("No models found.")
@@ -802,32 +1040,59 @@ Time: night
 Subject: urban"""
 
 
+def chat_with_image(
+    prompt: str,
+    image_data: str,
+    model: str,
+    use_cpu: bool = False,
+    host: str | None = None,
+    dispatcher: HostDispatcher | None = None,
+) -> str:
+    """Send one base64 image with a prompt to the vision model and return the reply."""
+    options = {"num_gpu": 0} if use_cpu else {}
+
+    with nullcontext(dispatcher) if dispatcher else HostDispatcher([host]) as active:
+
+        def request(target: str | None) -> str:
+            response = active.client(target).chat(
+                model=model,
+                messages=[{"role": "user", "content": prompt, "images": [image_data]}],
+                options=options,
+            )
+            return response["message"]["content"]
+
+        return active.run(request)
+
+
 def describe_image(
     filepath: Path,
     model: str = DEFAULT_MODEL,
     use_cpu: bool = False,
     host: str | None = None,
+    max_size: int | None = DEFAULT_MAX_IMAGE_SIZE,
+    cache: InferenceCache | None = None,
+    dispatcher: HostDispatcher | None = None,
 ) -> str | None:
-    """Use Ollama vision model to describe an image (simple description only)."""
+    """Use Ollama vision model to describe an image (simple description only).
+
+    With a dispatcher the request goes to whichever of its hosts is least loaded
+    and host is ignored.
+    """
     try:
-        with open(filepath, "rb") as f:
-            image_data = base64.b64encode(f.read()).decode("utf-8")
-
-        options = {"num_gpu": 0} if use_cpu else {}
-        client = ollama.Client(host=host) if host else ollama
-
-        response = client.chat(
-            model=model,
-            messages=[
-                {
-                    "role": "user",
-                    "content": DESCRIBE_PROMPT,
-                    "images": [image_data],
-                }
-            ],
-            options=options,
-        )
-        return response["message"]["content"].strip()
+        # Keyed by content, so renamed or moved images still hit
+        content_hash = ""
+        if cache is not None:
+            content_hash = hash_file(filepath)
+            cached = cache.get(content_hash, model, DESCRIBE_PROMPT)
+            if cached is not None:
+                return cached.strip()
+
+        image_data = encode_image(filepath, max_size)
+
+        content = chat_with_image(DESCRIBE_PROMPT, image_data, model, use_cpu, host, dispatcher)
+        if cache is not None and content.strip():
+            cache.put(content_hash, model, DESCRIBE_PROMPT, content)
+        return content.strip()
     except ollama.ResponseError as e:
         typer.echo(f"Ollama error: {e}", err=True)
         return None
@@ -868,27 +1133,26 @@ def analyze_image(
     model: str = DEFAULT_MODEL,
     use_cpu: bool = False,
     host: str | None = None,
+    max_size: int | None = DEFAULT_MAX_IMAGE_SIZE,
+    cache: InferenceCache | None = None,
+    dispatcher: HostDispatcher | None = None,
 ) -> dict[str, str | list[str]] | None:
     """Use Ollama vision model to analyze an image and extract full metadata."""
     try:
-        with open(filepath, "rb") as f:
-            image_data = base64.b64encode(f.read()).decode("utf-8")
-
-        options = {"num_gpu": 0} if use_cpu else {}
-        client = ollama.Client(host=host) if host else ollama
-
-        response = client.chat(
-            model=model,
-            messages=[
-                {
-                    "role": "user",
-                    "content": ANALYZE_PROMPT,
-                    "images": [image_data],
-                }
-            ],
-            options=options,
-        )
-        return parse_metadata_response(response["message"]["content"])
+        # Keyed by content, so renamed or moved images still hit
+        content_hash = ""
+        if cache is not None:
+            content_hash = hash_file(filepath)
+            cached = cache.get(content_hash, model, ANALYZE_PROMPT)
+            if cached is not None:
+                return parse_metadata_response(cached)
+
+        image_data = encode_image(filepath, max_size)
+
+        content = chat_with_image(ANALYZE_PROMPT, image_data, model, use_cpu, host, dispatcher)
+        if cache is not None and content.strip():
+            cache.put(content_hash, model, ANALYZE_PROMPT, content)
+        return parse_metadata_response(content)
     except ollama.ResponseError as e:
         typer.echo(f"Ollama error: {e}", err=True)
         return None
@@ -912,12 +1176,32 @@ def describe(
     ] = None,
     cpu: Annotated[bool, typer.Option("--cpu", help="Use CPU only (no GPU acceleration)")] = False,
     host: Annotated[
-        str | None,
-        typer.Option("--host", "-H", help="Ollama server URL (e.g., http://server:11434)"),
+        list[str] | None,
+        typer.Option(
+            "--host",
+            "-H",
+            help="Ollama server URL (e.g., http://server:11434), repeat to use several",
+        ),
     ] = None,
+    timeout: Annotated[
+        float | None,
+        typer.Option("--timeout", help="Seconds to wait for each Ollama request (0 for no limit)"),
+    ] = None,
+    max_size: Annotated[
+        int | None,
+        typer.Option("--max-size", help="Downscale images to this long edge before sending"),
+    ] = None,
+    resize: Annotated[
+        bool, typer.Option("--resize/--no-resize", help="Downscale large images before sending")
+    ] = True,
+    use_cache: Annotated[
+        bool, typer.Option("--cache/--no-cache", help="Reuse cached results for known images")
+    ] = True,
 ) -> None:
     """Rename images based on AI-generated descriptions using Ollama."""
-    effective_host, effective_model = get_ollama_settings(host=host, model=model)
+    _, effective_model = get_ollama_settings(model=model)
+    dispatcher = HostDispatcher(get_ollama_hosts(host), get_ollama_timeout(timeout))
+    effective_max_size = get_max_image_size(max_size, resize)
 
     path = path.resolve()
 
@@ -925,14 +1209,7 @@ def describe(
         typer.echo(f"Error: Path '{path}' does not exist.", err=True)
         raise typer.Exit(1)
 
-    if path.is_file():
-        files = [path]
-    else:
-        pattern = "**/*" if recursive else "*"
-        files = [f for f in path.glob(pattern) if f.is_file()]
-
-    # Filter to only image files
-    image_files = [f for f in files if f.suffix.lower() in VALID_IMAGE_EXTENSIONS]
+    image_files = [entry.path for entry in find_images(path, recursive)]
 
     if not image_files:
         typer.echo("No image files found.")
@@ -943,64 +1220,77 @@ def describe(
     renamed_count = 0
     skipped_count = 0
 
-    for filepath in image_files:
-        typer.echo(f"Analyzing: {filepath.name}...", nl=False)
-
-        description = describe_image(filepath, effective_model, use_cpu=cpu, host=effective_host)
-        if not description:
-            typer.echo(" [FAILED]")
-            skipped_count += 1
-            continue
+    with open_inference_cache(use_cache) as inference_cache, dispatcher:
+        for filepath in image_files:
+            typer.echo(f"Analyzing: {filepath.name}...", nl=False)
+
+            description = describe_image(
+                filepath,
+                effective_model,
+                use_cpu=cpu,
+                max_size=effective_max_size,
+                cache=inference_cache,
+                dispatcher=dispatcher,
+            )
+            if not description:
+                typer.echo(" [FAILED]")
+                skipped_count += 1
+                continue
 
-        # Create new filename from description
-        new_stem = sanitise_filename(description)
-        new_name = new_stem + filepath.suffix.lower()
+            # Create new filename from description
+            new_stem = sanitise_filename(description)
+            new_name = new_stem + filepath.suffix.lower()
 
-        typer.echo(f" -> {description}")
+            typer.echo(f" -> {description}")
 
-        if filepath.name == new_name:
-            typer.echo("  (no change needed)")
-            continue
-
-        new_path = filepath.parent / new_name
+            if filepath.name == new_name:
+                typer.echo("  (no change needed)")
+                continue
 
-        # Handle filename collisions by adding a number
-        counter = 1
-        while new_path.exists() and new_path != filepath:
-            new_name = f"{new_stem}_{counter}{filepath.suffix.lower()}"
             new_path = filepath.parent / new_name
-            counter += 1
-
-        if dry_run:
-            typer.echo(f"  Would rename: {filepath.name} -> {new_name}")
-        else:
-            # Rename any existing XMP sidecar first
-            old_xmp = get_xmp_path(filepath)
-            if old_xmp.exists():
-                new_xmp = get_xmp_path(new_path)
-                old_xmp.rename(new_xmp)
 
-            filepath.rename(new_path)
-            typer.echo(f"  Renamed: {filepath.name} -> {new_name}")
+            # Handle filename collisions by adding a number
+            counter = 1
+            while new_path.exists() and new_path != filepath:
+                new_name = f"{new_stem}_{counter}{filepath.suffix.lower()}"
+                new_path = filepath.parent / new_name
+                counter += 1
 
-            # Save description to XMP sidecar
-            metadata = read_xmp(new_path)
-            metadata.description = description
-            metadata.ai_model = effective_model
-
-            # Add image dimensions
-            width, height = get_image_dimensions(new_path)
-            if width and height:
-                metadata.width = width
-                metadata.height = height
-                metadata.recommended_screen = get_recommended_screen(width, height)
+            if dry_run:
+                typer.echo(f"  Would rename: {filepath.name} -> {new_name}")
+            else:
+                # Rename any existing XMP sidecar first
+                old_xmp = get_xmp_path(filepath)
+                if old_xmp.exists():
+                    new_xmp = get_xmp_path(new_path)
+                    old_xmp.rename(new_xmp)
 
-            write_xmp(new_path, metadata)
-            typer.echo(f"  Saved metadata to {get_xmp_path(new_path).name}")
-        renamed_count += 1
+                filepath.rename(new_path)
+                typer.echo(f"  Renamed: {filepath.name} -> {new_name}")
+
+                # Save description to XMP sidecar
+                metadata = read_xmp(new_path)
+                metadata.description = description
+                metadata.ai_model = effective_model
+
+                # Add image dimensions
+                width, height = get_image_dimensions(new_path)
+                if width and height:
+                    metadata.width = width
+                    metadata.height = height
+                    metadata.recommended_screen = get_recommended_screen(width, height)
+
+                if write_xmp(new_path, metadata):
+                    typer.echo(f"  Saved metadata to {get_xmp_path(new_path).name}")
+                else:
+                    typer.echo(f"  Metadata unchanged in {get_xmp_path(new_path).name}")
+            renamed_count += 1
 
     action = "Would rename" if dry_run else "Renamed"
     typer.echo(f"\n{action} {renamed_count} file(s), skipped {skipped_count}.")
+    if inference_cache is not None and inference_cache.hits:
+        typer.echo(f"Reused {inference_cache.hits} cached result(s).")
+    echo_host_stats(dispatcher)
 
 
 # Metadata subcommand group
@@ -1014,6 +1304,10 @@ def metadata_show(
     recursive: Annotated[
         bool, typer.Option("--recursive", "-r", help="Process directories recursively")
     ] = False,
+    jobs: Annotated[
+        int | None,
+        typer.Option("--jobs", "-j", help="Number of threads reading sidecars (default: 1)"),
+    ] = None,
 ) -> None:
     """Display metadata for image(s)."""
     path = path.resolve()
@@ -1022,20 +1316,13 @@ def metadata_show(
         typer.echo(f"Error: Path '{path}' does not exist.", err=True)
         raise typer.Exit(1)
 
-    if path.is_file():
-        files = [path]
-    else:
-        pattern = "**/*" if recursive else "*"
-        files = [f for f in path.glob(pattern) if f.is_file()]
-
-    image_files = [f for f in files if f.suffix.lower() in VALID_IMAGE_EXTENSIONS]
+    image_files = [entry.path for entry in find_images(path, recursive)]
 
     if not image_files:
         typer.echo("No image files found.")
         raise typer.Exit(0)
 
-    for filepath in image_files:
-        metadata = read_xmp(filepath)
+    for filepath, metadata in read_xmp_many(image_files, jobs or 1):
         xmp_path = get_xmp_path(filepath)
 
         typer.echo(f"\n{filepath.name}")
@@ -1121,8 +1408,10 @@ def metadata_set(
         metadata.source = source
 
     # Write metadata
-    write_xmp(path, metadata)
-    typer.echo(f"Updated metadata for {path.name}")
+    if write_xmp(path, metadata):
+        typer.echo(f"Updated metadata for {path.name}")
+    else:
+        typer.echo(f"Metadata for {path.name} already up to date")
 
 
 @metadata_app.command("generate")
@@ -1145,12 +1434,47 @@ def metadata_generate(
     ] = True,
     cpu: Annotated[bool, typer.Option("--cpu", help="Use CPU only (no GPU acceleration)")] = False,
     host: Annotated[
-        str | None,
-        typer.Option("--host", "-H", help="Ollama server URL (e.g., http://server:11434)"),
+        list[str] | None,
+        typer.Option(
+            "--host",
+            "-H",
+            help="Ollama server URL (e.g., http://server:11434), repeat to use several",
+        ),
     ] = None,
+    concurrency: Annotated[
+        int,
+        typer.Option("--concurrency", "-c", help="Number of Ollama requests to keep in flight"),
+    ] = 1,
+    timeout: Annotated[
+        float | None,
+        typer.Option("--timeout", help="Seconds to wait for each Ollama request (0 for no limit)"),
+    ] = None,
+    max_size: Annotated[
+        int | None,
+        typer.Option("--max-size", help="Downscale images to this long edge before sending"),
+    ] = None,
+    resize: Annotated[
+        bool, typer.Option("--resize/--no-resize", help="Downscale large images before sending")
+    ] = True,
+    use_cache: Annotated[
+        bool, typer.Option("--cache/--no-cache", help="Reuse cached results for known images")
+    ] = True,
+    resume: Annotated[
+        bool, typer.Option("--resume", help="Continue the last interrupted run on this path")
+    ] = False,
+    retry_failed: Annotated[
+        bool, typer.Option("--retry-failed", help="Resume, processing only files that failed")
+    ] = False,
 ) -> None:
     """Generate metadata using AI vision model and optionally rename files."""
-    effective_host, effective_model = get_ollama_settings(host=host, model=model)
+    import time
+
+    from schenesort.journal import DONE, FAILED, RunJournal
+    from schenesort.parallel import bounded_map
+
+    _, effective_model = get_ollama_settings(model=model)
+    dispatcher = HostDispatcher(get_ollama_hosts(host), get_ollama_timeout(timeout))
+    effective_max_size = get_max_image_size(max_size, resize)
 
     path = path.resolve()
 
@@ -1158,13 +1482,7 @@ def metadata_generate(
         typer.echo(f"Error: Path '{path}' does not exist.", err=True)
         raise typer.Exit(1)
 
-    if path.is_file():
-        files = [path]
-    else:
-        pattern = "**/*" if recursive else "*"
-        files = [f for f in path.glob(pattern) if f.is_file()]
-
-    image_files = [f for f in files if f.suffix.lower() in VALID_IMAGE_EXTENSIONS]
+    image_files = [entry.path for entry in find_images(path, recursive)]
 
     if not image_files:
         typer.echo("No image files found.")
@@ -1174,113 +1492,183 @@ def metadata_generate(
 
     generated_count = 0
     skipped_count = 0
+    analyzed_count = 0
+    resumed_count = 0
+    completed: set[str] = set()
+    failed: set[str] = set()
+
+    def pending_files():
+        """Yield files that still need metadata, reading sidecars lazily."""
+        nonlocal skipped_count, resumed_count
+        for filepath in image_files:
+            # Finished in the interrupted run, no need to parse the sidecar again
+            if str(filepath) in completed:
+                resumed_count += 1
+                continue
+            if retry_failed and str(filepath) not in failed:
+                continue
 
-    for filepath in image_files:
-        # Check if metadata already exists
-        existing = read_xmp(filepath)
-        if existing.description and not overwrite:
-            typer.echo(f"Skipping: {filepath.name} (already has description)")
-            skipped_count += 1
-            continue
+            # Check if metadata already exists
+            existing = read_xmp(filepath)
+            if existing.description and not overwrite:
+                typer.echo(f"Skipping: {filepath.name} (already has description)")
+                skipped_count += 1
+                if journal is not None:
+                    journal.mark_done(filepath, filepath)
+                continue
+            if concurrency <= 1:
+                typer.echo(f"Analyzing: {filepath.name}...", nl=False)
+            yield filepath, existing
+
+    def analyze(item):
+        return analyze_image(
+            item[0],
+            effective_model,
+            use_cpu=cpu,
+            max_size=effective_max_size,
+            cache=inference_cache,
+            dispatcher=dispatcher,
+        )
 
-        typer.echo(f"Analyzing: {filepath.name}...", nl=False)
+    # Requests run on worker threads; renames and sidecar writes stay on this
+    # thread and happen in input order, so collision handling is unchanged
+    with (
+        open_inference_cache(use_cache) as inference_cache,
+        nullcontext() if dry_run else RunJournal(path) as journal,
+        dispatcher,
+    ):
+        if journal is not None:
+            if resume or retry_failed:
+                entries = journal.load()
+                for original, entry in entries.items():
+                    if entry.state == DONE:
+                        completed.update(p for p in (original, entry.target) if p)
+                    elif entry.state == FAILED:
+                        failed.add(original)
+                done = sum(1 for entry in entries.values() if entry.state == DONE)
+                typer.echo(f"Resuming previous run: {done} done, {len(failed)} failed.\n")
+            else:
+                journal.start(image_files)
 
-        result = analyze_image(filepath, effective_model, use_cpu=cpu, host=effective_host)
-        if not result:
-            typer.echo(" [FAILED]")
-            skipped_count += 1
-            continue
+        start = time.perf_counter()
+        for (filepath, existing), result in bounded_map(analyze, pending_files(), concurrency):
+            analyzed_count += 1
+            if concurrency > 1:
+                typer.echo(f"Analyzing: {filepath.name}...", nl=False)
 
-        description = result.get("description", "")
-        typer.echo(f" -> {description}")
+            if not result:
+                typer.echo(" [FAILED]")
+                skipped_count += 1
+                if journal is not None:
+                    journal.mark_failed(filepath)
+                continue
 
-        if dry_run:
-            if rename:
-                new_stem = sanitise_filename(str(description))
-                new_name = new_stem + filepath.suffix.lower()
-                typer.echo(f"  Would rename: {filepath.name} -> {new_name}")
-            if result.get("scene"):
-                typer.echo(f"  Scene: {result['scene']}")
-            if result.get("tags"):
-                typer.echo(f"  Tags: {', '.join(result['tags'])}")
-            if result.get("mood"):
-                typer.echo(f"  Mood: {', '.join(result['mood'])}")
-            if result.get("style"):
-                typer.echo(f"  Style: {result['style']}")
-            if result.get("colors"):
-                typer.echo(f"  Colors: {', '.join(result['colors'])}")
-            if result.get("time"):
-                typer.echo(f"  Time: {result['time']}")
-            if result.get("subject"):
-                typer.echo(f"  Subject: {result['subject']}")
-            typer.echo("  (dry run, not saving)")
-        else:
-            # Rename file if requested
-            target_path = filepath
-            if rename:
-                new_stem = sanitise_filename(str(description))
-                new_name = new_stem + filepath.suffix.lower()
-
-                if filepath.name != new_name:
-                    new_path = filepath.parent / new_name
-
-                    # Handle filename collisions
-                    counter = 1
-                    while new_path.exists() and new_path != filepath:
-                        new_name = f"{new_stem}_{counter}{filepath.suffix.lower()}"
+            description = result.get("description", "")
+            typer.echo(f" -> {description}")
+
+            if dry_run:
+                if rename:
+                    new_stem = sanitise_filename(str(description))
+                    new_name = new_stem + filepath.suffix.lower()
+                    typer.echo(f"  Would rename: {filepath.name} -> {new_name}")
+                if result.get("scene"):
+                    typer.echo(f"  Scene: {result['scene']}")
+                if result.get("tags"):
+                    typer.echo(f"  Tags: {', '.join(result['tags'])}")
+                if result.get("mood"):
+                    typer.echo(f"  Mood: {', '.join(result['mood'])}")
+                if result.get("style"):
+                    typer.echo(f"  Style: {result['style']}")
+                if result.get("colors"):
+                    typer.echo(f"  Colors: {', '.join(result['colors'])}")
+                if result.get("time"):
+                    typer.echo(f"  Time: {result['time']}")
+                if result.get("subject"):
+                    typer.echo(f"  Subject: {result['subject']}")
+                typer.echo("  (dry run, not saving)")
+            else:
+                # Rename file if requested
+                target_path = filepath
+                if rename:
+                    new_stem = sanitise_filename(str(description))
+                    new_name = new_stem + filepath.suffix.lower()
+
+                    if filepath.name != new_name:
                         new_path = filepath.parent / new_name
-                        counter += 1
 
-                    # Rename any existing XMP sidecar first
-                    old_xmp = get_xmp_path(filepath)
-                    if old_xmp.exists():
-                        new_xmp = get_xmp_path(new_path)
-                        old_xmp.rename(new_xmp)
+                        # Handle filename collisions
+                        counter = 1
+                        while new_path.exists() and new_path != filepath:
+                            new_name = f"{new_stem}_{counter}{filepath.suffix.lower()}"
+                            new_path = filepath.parent / new_name
+                            counter += 1
+
+                        # Rename any existing XMP sidecar first
+                        old_xmp = get_xmp_path(filepath)
+                        if old_xmp.exists():
+                            new_xmp = get_xmp_path(new_path)
+                            old_xmp.rename(new_xmp)
+
+                        filepath.rename(new_path)
+                        target_path = new_path
+                        typer.echo(f"  Renamed: {filepath.name} -> {new_name}")
+
+                # Build and save metadata
+                metadata = existing
+                metadata.description = str(description)
+                metadata.ai_model = effective_model
+                scene = result.get("scene")
+                if isinstance(scene, str):
+                    metadata.scene = scene
+                tags = result.get("tags")
+                if isinstance(tags, list):
+                    metadata.tags = tags
+                mood = result.get("mood")
+                if isinstance(mood, list):
+                    metadata.mood = mood
+                style = result.get("style")
+                if isinstance(style, str):
+                    metadata.style = style
+                colors = result.get("colors")
+                if isinstance(colors, list):
+                    metadata.colors = colors
+                time_val = result.get("time")
+                if isinstance(time_val, str):
+                    metadata.time_of_day = time_val
+                subject = result.get("subject")
+                if isinstance(subject, str):
+                    metadata.subject = subject
+
+                # Add image dimensions
+                width, height = get_image_dimensions(target_path)
+                if width and height:
+                    metadata.width = width
+                    metadata.height = height
+                    metadata.recommended_screen = get_recommended_screen(width, height)
+
+                if write_xmp(target_path, metadata):
+                    typer.echo(f"  Saved to {get_xmp_path(target_path).name}")
+                else:
+                    typer.echo(f"  Unchanged: {get_xmp_path(target_path).name}")
+                if journal is not None:
+                    journal.mark_done(filepath, target_path)
 
-                    filepath.rename(new_path)
-                    target_path = new_path
-                    typer.echo(f"  Renamed: {filepath.name} -> {new_name}")
-
-            # Build and save metadata
-            metadata = existing
-            metadata.description = str(description)
-            metadata.ai_model = effective_model
-            scene = result.get("scene")
-            if isinstance(scene, str):
-                metadata.scene = scene
-            tags = result.get("tags")
-            if isinstance(tags, list):
-                metadata.tags = tags
-            mood = result.get("mood")
-            if isinstance(mood, list):
-                metadata.mood = mood
-            style = result.get("style")
-            if isinstance(style, str):
-                metadata.style = style
-            colors = result.get("colors")
-            if isinstance(colors, list):
-                metadata.colors = colors
-            time_val = result.get("time")
-            if isinstance(time_val, str):
-                metadata.time_of_day = time_val
-            subject = result.get("subject")
-            if isinstance(subject, str):
-                metadata.subject = subject
-
-            # Add image dimensions
-            width, height = get_image_dimensions(target_path)
-            if width and height:
-                metadata.width = width
-                metadata.height = height
-                metadata.recommended_screen = get_recommended_screen(width, height)
-
-            write_xmp(target_path, metadata)
-            typer.echo(f"  Saved to {get_xmp_path(target_path).name}")
-
-        generated_count += 1
+            generated_count += 1
+
+    elapsed = time.perf_counter() - start
 
     action = "Would generate" if dry_run else "Generated"
     typer.echo(f"\n{action} metadata for {generated_count} file(s), skipped {skipped_count}.")
+    if resumed_count:
+        typer.echo(f"Skipped {resumed_count} file(s) completed in the previous run.")
+    if analyzed_count and elapsed > 0:
+        typer.echo(
+            f"Analyzed {analyzed_count} image(s) in {elapsed:.1f}s "
+            f"({analyzed_count / elapsed:.2f} images/s)."
+        )
+    if inference_cache is not None and inference_cache.hits:
+        typer.echo(f"Reused {inference_cache.hits} cached result(s).")
+    echo_host_stats(dispatcher)
 
 
 @metadata_app.command("update-dimensions")
@@ -1292,6 +1680,10 @@ def metadata_update_dimensions(
     recursive: Annotated[
         bool, typer.Option("--recursive", "-r", help="Process directories recursively")
     ] = False,
+    jobs: Annotated[
+        int | None,
+        typer.Option("--jobs", "-j", help="Number of threads reading sidecars (default: 1)"),
+    ] = None,
 ) -> None:
     """Update existing XMP sidecars with image dimensions (no AI inference)."""
     path = path.resolve()
@@ -1300,16 +1692,8 @@ def metadata_update_dimensions(
         typer.echo(f"Error: Path '{path}' does not exist.", err=True)
         raise typer.Exit(1)
 
-    if path.is_file():
-        files = [path]
-    else:
-        pattern = "**/*" if recursive else "*"
-        files = [f for f in path.glob(pattern) if f.is_file()]
-
     # Filter to image files that have existing sidecars
-    image_files = [
-        f for f in files if f.suffix.lower() in VALID_IMAGE_EXTENSIONS and get_xmp_path(f).exists()
-    ]
+    image_files = [entry.path for entry in find_images(path, recursive) if entry.has_sidecar]
 
     if not image_files:
         typer.echo("No image files with existing XMP sidecars found.")
@@ -1318,9 +1702,13 @@ def metadata_update_dimensions(
     typer.echo(f"Updating dimensions for {len(image_files)} image(s)...\n")
 
     updated_count = 0
+    unchanged_count = 0
     skipped_count = 0
 
-    for filepath in image_files:
+    # A dry run never needs the sidecars' contents
+    sidecars = zip(image_files, repeat(None)) if dry_run else read_xmp_many(image_files, jobs or 1)
+
+    for filepath, metadata in sidecars:
         width, height = get_image_dimensions(filepath)
 
         if not width or not height:
@@ -1333,17 +1721,58 @@ def metadata_update_dimensions(
         if dry_run:
             typer.echo(f"Would update: {filepath.name} -> {width}x{height} ({recommended})")
         else:
-            metadata = read_xmp(filepath)
             metadata.width = width
             metadata.height = height
             metadata.recommended_screen = recommended
-            write_xmp(filepath, metadata)
+            if not write_xmp(filepath, metadata):
+                unchanged_count += 1
+                continue
             typer.echo(f"Updated: {filepath.name} -> {width}x{height} ({recommended})")
 
         updated_count += 1
 
     action = "Would update" if dry_run else "Updated"
-    typer.echo(f"\n{action} {updated_count} sidecar(s), skipped {skipped_count}.")
+    unchanged = f", {unchanged_count} already up to date" if unchanged_count else ""
+    typer.echo(f"\n{action} {updated_count} sidecar(s){unchanged}, skipped {skipped_count}.")
+
+
+def load_collage_tile(filepath: Path, tile_width: int, tile_height: int) -> "Image.Image":
+    """Load an image scaled and center-cropped to fill a collage tile."""
+    from PIL import Image
+
+    from schenesort.thumbnails import DRAFT_REDUCING_GAP, draft_for_size
+
+    with Image.open(filepath) as img:
+        # Resize to fit tile while preserving aspect ratio, then crop to fill
+        img_ratio = img.width / img.height
+        tile_ratio = tile_width / tile_height
+
+        if img_ratio > tile_ratio:
+            # Image is wider - fit by height, crop width
+            new_height = tile_height
+            new_width = int(tile_height * img_ratio)
+        else:
+            # Image is taller - fit by width, crop height
+            new_width = tile_width
+            new_height = int(tile_width / img_ratio)
+
+        # Tiles are tiny next to a wallpaper, so let JPEGs decode at reduced size
+        draft_for_size(img, (new_width, new_height))
+
+        # Convert to RGB if necessary (handles RGBA, palette, etc.)
+        if img.mode != "RGB":
+            img = img.convert("RGB")
+
+        img = img.resize(
+            (new_width, new_height),
+            Image.Resampling.LANCZOS,
+            reducing_gap=DRAFT_REDUCING_GAP,
+        )
+
+        # Center crop to tile size
+        left = (new_width - tile_width) // 2
+        top = (new_height - tile_height) // 2
+        return img.crop((left, top, left + tile_width, top + tile_height))
 
 
 @app.command()
@@ -1365,7 +1794,12 @@ def collage(
         int | None, typer.Option("--min-height", help="Minimum height in pixels")
     ] = None,
     search: Annotated[
-        str | None, typer.Option("--search", "-q", help="Search description, scene, style, subject")
+        str | None,
+        typer.Option(
+            "--search",
+            "-q",
+            help='Search description, scene, style, subject (prefix words, "exact phrases")',
+        ),
     ] = None,
     cols: Annotated[int, typer.Option("--cols", help="Number of columns")] = 6,
     rows: Annotated[int, typer.Option("--rows", help="Number of rows")] = 6,
@@ -1434,37 +1868,14 @@ def collage(
             col = idx % cols
 
             try:
-                with Image.open(filepath) as img:
-                    # Convert to RGB if necessary (handles RGBA, palette, etc.)
-                    if img.mode != "RGB":
-                        img = img.convert("RGB")
-
-                    # Resize to fit tile while preserving aspect ratio, then crop to fill
-                    img_ratio = img.width / img.height
-                    tile_ratio = tile_width / tile_height
-
-                    if img_ratio > tile_ratio:
-                        # Image is wider - fit by height, crop width
-                        new_height = tile_height
-                        new_width = int(tile_height * img_ratio)
-                    else:
-                        # Image is taller - fit by width, crop height
-                        new_width = tile_width
-                        new_height = int(tile_width / img_ratio)
-
-                    img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-                    # Center crop to tile size
-                    left = (new_width - tile_width) // 2
-                    top = (new_height - tile_height) // 2
-                    img = img.crop((left, top, left + tile_width, top + tile_height))
+                tile = load_collage_tile(filepath, tile_width, tile_height)
 
-                    # Paste into collage
-                    x = col * tile_width
-                    y = row * tile_height
-                    collage_img.paste(img, (x, y))
+                # Paste into collage
+                x = col * tile_width
+                y = row * tile_height
+                collage_img.paste(tile, (x, y))
 
-                    typer.echo(f"  [{row},{col}] {filepath.name}")
+                typer.echo(f"  [{row},{col}] {filepath.name}")
 
             except Exception as e:
                 typer.echo(f"  [{row},{col}] Failed to load {filepath.name}: {e}", err=True)
@@ -1487,10 +1898,16 @@ def metadata_embed(
     recursive: Annotated[
         bool, typer.Option("--recursive", "-r", help="Process directories recursively")
     ] = False,
+    jobs: Annotated[
+        int | None,
+        typer.Option("--jobs", "-j", help="Number of exiftool processes (default: 1)"),
+    ] = None,
 ) -> None:
     """Embed XMP sidecar metadata into image files using exiftool."""
     import shutil
-    import subprocess
+
+    from schenesort.exiftool import ExifToolError, ExifToolPool
+    from schenesort.parallel import bounded_map
 
     # Check for exiftool
     if not shutil.which("exiftool"):
@@ -1505,16 +1922,8 @@ def metadata_embed(
         typer.echo(f"Error: Path '{path}' does not exist.", err=True)
         raise typer.Exit(1)
 
-    if path.is_file():
-        files = [path]
-    else:
-        pattern = "**/*" if recursive else "*"
-        files = [f for f in path.glob(pattern) if f.is_file()]
-
     # Filter to image files that have sidecars
-    image_files = [
-        f for f in files if f.suffix.lower() in VALID_IMAGE_EXTENSIONS and get_xmp_path(f).exists()
-    ]
+    image_files = [entry.path for entry in find_images(path, recursive) if entry.has_sidecar]
 
     if not image_files:
         typer.echo("No image files with XMP sidecars found.")
@@ -1522,19 +1931,19 @@ def metadata_embed(
 
     typer.echo(f"Embedding metadata into {len(image_files)} image(s)...\n")
 
+    workers = jobs or 1
     embedded_count = 0
     skipped_count = 0
+    pending: list[tuple[Path, list[str]]] = []
 
-    for filepath in image_files:
-        metadata = read_xmp(filepath)
-
+    for filepath, metadata in read_xmp_many(image_files, workers):
         if metadata.is_empty():
             typer.echo(f"Skipping: {filepath.name} (empty sidecar)")
             skipped_count += 1
             continue
 
         # Build exiftool arguments
-        args = ["exiftool", "-overwrite_original"]
+        args = ["-overwrite_original"]
 
         # Description: combine short description and scene for full context
         full_description = metadata.description
@@ -1576,20 +1985,26 @@ def metadata_embed(
                 typer.echo(f"  Keywords: {', '.join(metadata.tags)}")
             if custom_fields:
                 typer.echo(f"  (sidecar-only: {'; '.join(custom_fields)})")
+            embedded_count += 1
         else:
-            result = subprocess.run(args, capture_output=True, text=True)
-            if result.returncode == 0:
-                typer.echo(f"Embedded: {filepath.name}")
-                embedded_count += 1
-            else:
-                typer.echo(f"Failed: {filepath.name} - {result.stderr.strip()}", err=True)
-                skipped_count += 1
-                continue
+            pending.append((filepath, args))
 
-        if not dry_run:
-            pass  # already counted above
-        else:
-            embedded_count += 1
+    if pending:
+        # A few long-running exiftool processes rather than one per image
+        with ExifToolPool(workers) as exiftool:
+            try:
+                for (filepath, _), result in bounded_map(
+                    lambda item: exiftool.execute(item[1]), pending, workers
+                ):
+                    if result.ok:
+                        typer.echo(f"Embedded: {filepath.name}")
+                        embedded_count += 1
+                    else:
+                        typer.echo(f"Failed: {filepath.name} - {result.message}", err=True)
+                        skipped_count += 1
+            except ExifToolError as e:
+                typer.echo(f"Error: {e}", err=True)
+                raise typer.Exit(1) from None
 
     action = "Would embed" if dry_run else "Embedded"
     typer.echo(f"\n{action} metadata in {embedded_count} file(s), skipped {skipped_count}.")
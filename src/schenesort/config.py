@@ -29,7 +29,13 @@ class Config:
 
     # Ollama settings
     ollama_host: str = ""
+    # Several servers to spread requests over (takes precedence over ollama_host)
+    ollama_hosts: list[str] = field(default_factory=list)
     ollama_model: str = "llava"
+    # Long edge in pixels images are downscaled to before upload (0 sends originals)
+    ollama_max_image_size: int = 1024
+    # Seconds to wait for a single request (0 waits indefinitely)
+    ollama_timeout: float = 0.0
 
     # Collection paths (optional defaults)
     wallpaper_path: str = ""
@@ -37,6 +43,13 @@ class Config:
     # Database settings
     db_path: str = ""
 
+    # Maximum number of vision model responses kept in the inference cache
+    inference_cache_size: int = 100_000
+
+    # Thumbnail cache budget, least recently used thumbnails go first (0: no limit)
+    thumbnail_cache_mb: int = 4096
+    thumbnail_cache_entries: int = 0
+
     # Additional settings as needed
     extra: dict = field(default_factory=dict)
 
@@ -58,8 +71,14 @@ def load_config() -> Config:
         ollama = data.get("ollama", {})
         if ollama.get("host"):
             config.ollama_host = ollama["host"]
+        if ollama.get("hosts"):
+            config.ollama_hosts = [str(h) for h in ollama["hosts"]]
         if ollama.get("model"):
             config.ollama_model = ollama["model"]
+        if "max_image_size" in ollama:
+            config.ollama_max_image_size = int(ollama["max_image_size"])
+        if "timeout" in ollama:
+            config.ollama_timeout = float(ollama["timeout"])
 
         # Paths section
         paths = data.get("paths", {})
@@ -68,6 +87,15 @@ def load_config() -> Config:
         if paths.get("database"):
             config.db_path = paths["database"]
 
+        # Cache section
+        cache = data.get("cache", {})
+        if "inference_max_entries" in cache:
+            config.inference_cache_size = int(cache["inference_max_entries"])
+        if "thumbnail_max_mb" in cache:
+            config.thumbnail_cache_mb = int(cache["thumbnail_max_mb"])
+        if "thumbnail_max_entries" in cache:
+            config.thumbnail_cache_entries = int(cache["thumbnail_max_entries"])
+
         # Store any extra settings
         config.extra = data
 
@@ -101,15 +129,32 @@ def create_default_config() -> Path:
 # Ollama server URL (leave empty for localhost:11434)
 # host = "http://server:11434"
 
+# Several servers to spread requests over, least loaded first
+# hosts = ["http://box1:11434", "http://box2:11434"]
+
 # Default vision model
 model = "llava"
 
+# Downscale images to this long edge (pixels) before sending, 0 sends originals
+# max_image_size = 1024
+
+# Seconds to wait for a single request, 0 waits indefinitely
+# timeout = 300
+
 [paths]
 # Default wallpaper collection path
 # wallpaper = "~/wallpapers"
 
 # Database path (default: ~/.local/share/schenesort/index.db)
 # database = ""
+
+[cache]
+# Vision model responses kept for reuse across renames and moves
+# inference_max_entries = 100000
+
+# Thumbnail cache budget; least recently viewed thumbnails are removed first (0: no limit)
+# thumbnail_max_mb = 4096
+# thumbnail_max_entries = 0
 """
 
     config_path.write_text(default_config)
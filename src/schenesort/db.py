@@ -1,10 +1,14 @@
 """SQLite database for wallpaper collection indexing."""
 
 import os
+import re
 import sqlite3
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from itertools import batched
 from pathlib import Path
 
-from schenesort.xmp import ImageMetadata, get_xmp_path
+from schenesort.xmp import ImageMetadata
 
 APP_NAME = "schenesort"
 
@@ -76,16 +80,105 @@ CREATE INDEX IF NOT EXISTS idx_wallpapers_height ON wallpapers(height);
 CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags(tag);
 CREATE INDEX IF NOT EXISTS idx_moods_mood ON moods(mood);
 CREATE INDEX IF NOT EXISTS idx_colors_color ON colors(color);
+CREATE INDEX IF NOT EXISTS idx_tags_wallpaper_id ON tags(wallpaper_id);
+CREATE INDEX IF NOT EXISTS idx_moods_wallpaper_id ON moods(wallpaper_id);
+CREATE INDEX IF NOT EXISTS idx_colors_wallpaper_id ON colors(wallpaper_id);
 """
 
+# Images written per transaction by index_many
+DEFAULT_BATCH_SIZE = 5000
 
-class WallpaperDB:
-    """SQLite database for wallpaper metadata."""
+# Stay well below SQLite's bound parameter limit in IN (...) lookups
+_MAX_PARAMS = 900
+
+# Separator for the tag, mood and color lists get_metadata reads in one row:
+# the ASCII unit separator, which XML text (and so a sidecar) cannot contain
+_LIST_SEPARATOR_CODE = 31
+
+# Full-text index over the searchable columns. The write methods keep it in
+# sync with set-based statements; per-row triggers would make FTS5 flush its
+# pending terms on every statement, which dominated bulk index time.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS wallpapers_fts USING fts5(
+    description, scene, style, subject,
+    content='wallpapers', content_rowid='id'
+);
+
+DROP TRIGGER IF EXISTS wallpapers_fts_insert;
+DROP TRIGGER IF EXISTS wallpapers_fts_delete;
+DROP TRIGGER IF EXISTS wallpapers_fts_update;
+"""
+
+# bm25 column weights for description, scene, style, subject
+FTS_WEIGHTS = (4.0, 1.0, 2.0, 2.0)
+
+SEARCH_COLUMNS = ("description", "scene", "style", "subject")
+
+
+def _words(text: str) -> list[str]:
+    """Split text into lowercase words the way the FTS5 unicode61 tokenizer does."""
+    return re.findall(r"[^\W_]+", text.lower())
+
+
+@dataclass(frozen=True)
+class SearchTerm:
+    """One term of a search: its text as typed, its words, and whether it is prefix matched."""
+
+    text: str
+    words: list[str]
+    prefix: bool
+
+
+def parse_search(search: str) -> list[SearchTerm]:
+    """Split search text into terms that must all match.
+
+    Bare words are prefix matched, so "mount" finds "mountain"; "quoted
+    text" must match as an exact phrase. Words joined by punctuation such
+    as "sci-fi" stay together. Terms without any words are dropped.
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"?|(\S+)', search):
+        text = phrase or word
+        words = _words(text)
+        if words:
+            terms.append(SearchTerm(text.strip(), words, not phrase))
+    return terms
+
+
+def build_fts_query(terms: list[SearchTerm]) -> str:
+    """Build an FTS5 MATCH expression from parsed search terms."""
+    return " AND ".join(
+        '"' + " ".join(term.words) + '"' + ("*" if term.prefix else "") for term in terms
+    )
+
+
+def _group_list(table: str, column: str) -> str:
+    """SQL for one wallpaper's values from a child table, joined in insertion order."""
+    return (
+        f"(SELECT group_concat({column}, char({_LIST_SEPARATOR_CODE})) FROM "
+        f"(SELECT {column} FROM {table} WHERE wallpaper_id = w.id ORDER BY id))"
+    )
 
-    def __init__(self, db_path: Path = DEFAULT_DB_PATH) -> None:
-        self.db_path = db_path
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+def _split_list(value: str | None) -> list[str]:
+    return value.split(chr(_LIST_SEPARATOR_CODE)) if value else []
+
+
+class WallpaperDB:
+    """SQLite database for wallpaper metadata.
+
+    With read_only the database must already exist. The connection then
+    skips the schema setup and may be used from other threads, one
+    statement at a time, which suits the browsers' background queries.
+    """
+
+    def __init__(self, db_path: Path | None = None, read_only: bool = False) -> None:
+        self.db_path = db_path or get_default_db_path()
+        self.read_only = read_only
+        if not read_only:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.conn: sqlite3.Connection | None = None
+        self.has_fts = False
 
     def __enter__(self) -> "WallpaperDB":
         self.connect()
@@ -95,12 +188,56 @@ class WallpaperDB:
         self.close()
 
     def connect(self) -> None:
+        if self.read_only:
+            self._connect_read_only()
+            return
         self.conn = sqlite3.connect(self.db_path)
         self.conn.row_factory = sqlite3.Row
         self.conn.execute("PRAGMA foreign_keys = ON")
+        # WAL lets the gallery read while an index runs, and with synchronous=NORMAL
+        # a commit no longer waits for fsync
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("PRAGMA cache_size = -65536")
+        self.conn.execute("PRAGMA temp_store = MEMORY")
         self.conn.executescript(SCHEMA)
+        self._setup_fts()
         self.conn.commit()
 
+    def _connect_read_only(self) -> None:
+        uri = f"{self.db_path.absolute().as_uri()}?mode=ro"
+        self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA cache_size = -65536")
+        self.conn.execute("PRAGMA temp_store = MEMORY")
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'wallpapers_fts'"
+        ).fetchone()
+        self.has_fts = row is not None
+
+    def interrupt(self) -> None:
+        """Abort the statement running on this connection, from any thread.
+
+        It fails with sqlite3.OperationalError ("interrupted").
+        """
+        if self.conn:
+            self.conn.interrupt()
+
+    def _setup_fts(self) -> None:
+        """Create the full-text index, or leave has_fts unset when SQLite lacks FTS5."""
+        assert self.conn is not None
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'wallpapers_fts'"
+        ).fetchone()
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            return
+        if not exists:
+            # Index rows written before the full-text table existed
+            self.conn.execute("INSERT INTO wallpapers_fts (wallpapers_fts) VALUES ('rebuild')")
+        self.has_fts = True
+
     def close(self) -> None:
         if self.conn:
             self.conn.close()
@@ -114,37 +251,59 @@ class WallpaperDB:
         self.conn.execute("DELETE FROM moods")
         self.conn.execute("DELETE FROM tags")
         self.conn.execute("DELETE FROM wallpapers")
+        if self.has_fts:
+            self.conn.execute("INSERT INTO wallpapers_fts (wallpapers_fts) VALUES ('delete-all')")
         self.conn.commit()
 
     def index_image(self, image_path: Path, metadata: ImageMetadata) -> None:
         """Add or update an image in the index."""
         if not self.conn:
             return
+        self._write_batch([(image_path, metadata)])
 
-        xmp_path = get_xmp_path(image_path)
-        mtime = xmp_path.stat().st_mtime if xmp_path.exists() else 0
-
-        # Check if already indexed with same mtime
-        cursor = self.conn.execute(
-            "SELECT id, mtime FROM wallpapers WHERE path = ?", (str(image_path),)
-        )
-        row = cursor.fetchone()
-
-        if row and row["mtime"] == mtime:
-            return  # Already up to date
+    def index_many(
+        self,
+        items: Iterable[tuple[Path, ImageMetadata]],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        mtimes: Mapping[str, float] | None = None,
+    ) -> int:
+        """Add or update many images, committing once per batch.
+
+        Returns the number of images written; entries whose sidecar mtime
+        matches the index are left alone. Sidecar mtimes the caller already
+        has can be passed in mtimes (keyed by image path) to skip a stat.
+        """
+        if not self.conn:
+            return 0
 
-        # Delete existing entry if present
-        if row:
-            self.conn.execute("DELETE FROM wallpapers WHERE id = ?", (row["id"],))
+        written = 0
+        for batch in batched(items, batch_size, strict=False):
+            with self.conn:
+                written += self._write_batch(batch, mtimes)
+        return written
 
-        # Insert new entry
-        cursor = self.conn.execute(
-            """INSERT INTO wallpapers
-               (path, filename, extension, description, scene, style, time_of_day,
-                subject, source, ai_model, width, height, recommended_screen, mtime)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                str(image_path),
+    def _write_batch(
+        self,
+        items: Iterable[tuple[Path, ImageMetadata]],
+        mtimes: Mapping[str, float] | None = None,
+    ) -> int:
+        """Write images with executemany, without committing."""
+        assert self.conn is not None
+
+        # The last entry wins when a path appears twice
+        rows: dict[str, tuple] = {}
+        children: dict[str, ImageMetadata] = {}
+        for image_path, metadata in items:
+            path = str(image_path)
+            mtime = mtimes.get(path) if mtimes is not None else None
+            if mtime is None:
+                try:
+                    # The sidecar path (see xmp.get_xmp_path), without pathlib overhead
+                    mtime = os.stat(path + ".xmp").st_mtime
+                except OSError:
+                    mtime = 0
+            rows[path] = (
+                path,
                 image_path.name,
                 image_path.suffix.lower(),
                 metadata.description or None,
@@ -158,27 +317,142 @@ class WallpaperDB:
                 metadata.height or None,
                 metadata.recommended_screen or None,
                 mtime,
-            ),
+            )
+            children[path] = metadata
+
+        # Skip entries already indexed with the same mtime, replace the rest
+        existing = self._select_by_path(list(rows), "id, path, mtime")
+        stale = []
+        for row in existing:
+            if row["mtime"] == rows[row["path"]][-1]:
+                del rows[row["path"]]
+            else:
+                stale.append(row["id"])
+        if not rows:
+            return 0
+
+        self._delete_ids(stale)
+        self.conn.executemany(
+            """INSERT INTO wallpapers
+               (path, filename, extension, description, scene, style, time_of_day,
+                subject, source, ai_model, width, height, recommended_screen, mtime)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            rows.values(),
         )
-        wallpaper_id = cursor.lastrowid
 
-        # Insert tags
-        for tag in metadata.tags:
-            self.conn.execute(
-                "INSERT INTO tags (wallpaper_id, tag) VALUES (?, ?)", (wallpaper_id, tag)
+        ids = {row["path"]: row["id"] for row in self._select_by_path(list(rows), "id, path")}
+        if self.has_fts:
+            self._for_ids(
+                "INSERT INTO wallpapers_fts (rowid, description, scene, style, subject) "
+                "SELECT id, description, scene, style, subject FROM wallpapers "
+                "WHERE id IN ({ids})",
+                list(ids.values()),
             )
-
-        # Insert moods
-        for mood in metadata.mood:
-            self.conn.execute(
-                "INSERT INTO moods (wallpaper_id, mood) VALUES (?, ?)", (wallpaper_id, mood)
+        self.conn.executemany(
+            "INSERT INTO tags (wallpaper_id, tag) VALUES (?, ?)",
+            ((ids[path], tag) for path in rows for tag in children[path].tags),
+        )
+        self.conn.executemany(
+            "INSERT INTO moods (wallpaper_id, mood) VALUES (?, ?)",
+            ((ids[path], mood) for path in rows for mood in children[path].mood),
+        )
+        self.conn.executemany(
+            "INSERT INTO colors (wallpaper_id, color) VALUES (?, ?)",
+            ((ids[path], color) for path in rows for color in children[path].colors),
+        )
+        return len(rows)
+
+    def _delete_ids(self, ids: list[int]) -> None:
+        """Delete wallpapers rows and their full-text entries (children cascade)."""
+        if self.has_fts:
+            self._for_ids(
+                "INSERT INTO wallpapers_fts "
+                "(wallpapers_fts, rowid, description, scene, style, subject) "
+                "SELECT 'delete', id, description, scene, style, subject FROM wallpapers "
+                "WHERE id IN ({ids})",
+                ids,
             )
+        self._for_ids("DELETE FROM wallpapers WHERE id IN ({ids})", ids)
+
+    def _for_ids(self, sql: str, ids: list[int]) -> None:
+        """Run sql once per chunk of ids, substituted for its {ids} placeholder."""
+        assert self.conn is not None
+        for chunk in batched(ids, _MAX_PARAMS, strict=False):
+            self.conn.execute(sql.format(ids=", ".join("?" * len(chunk))), chunk)
+
+    def _select_by_path(self, paths: list[str], columns: str) -> list[sqlite3.Row]:
+        """Fetch columns of the wallpapers rows matching any of paths."""
+        assert self.conn is not None
+        result = []
+        for chunk in batched(paths, _MAX_PARAMS, strict=False):
+            placeholders = ", ".join("?" * len(chunk))
+            cursor = self.conn.execute(
+                f"SELECT {columns} FROM wallpapers WHERE path IN ({placeholders})", chunk
+            )
+            result.extend(cursor.fetchall())
+        return result
 
-        # Insert colors
-        for color in metadata.colors:
-            self.conn.execute(
-                "INSERT INTO colors (wallpaper_id, color) VALUES (?, ?)", (wallpaper_id, color)
+    def get_metadata(self, paths: Iterable[str | Path]) -> dict[str, ImageMetadata]:
+        """Get the indexed metadata for paths, keyed by path; unindexed paths are left out."""
+        if not self.conn:
+            return {}
+        result = {}
+        for chunk in batched(map(str, paths), _MAX_PARAMS, strict=False):
+            placeholders = ", ".join("?" * len(chunk))
+            cursor = self.conn.execute(
+                f"""SELECT w.path, w.description, w.scene, w.style, w.time_of_day, w.subject,
+                           w.source, w.ai_model, w.width, w.height, w.recommended_screen,
+                           {_group_list("tags", "tag")} AS tags,
+                           {_group_list("moods", "mood")} AS moods,
+                           {_group_list("colors", "color")} AS colors
+                    FROM wallpapers w WHERE w.path IN ({placeholders})""",
+                chunk,
             )
+            for row in cursor:
+                result[row["path"]] = ImageMetadata(
+                    description=row["description"] or "",
+                    scene=row["scene"] or "",
+                    tags=_split_list(row["tags"]),
+                    mood=_split_list(row["moods"]),
+                    style=row["style"] or "",
+                    colors=_split_list(row["colors"]),
+                    time_of_day=row["time_of_day"] or "",
+                    subject=row["subject"] or "",
+                    source=row["source"] or "",
+                    ai_model=row["ai_model"] or "",
+                    width=row["width"] or 0,
+                    height=row["height"] or 0,
+                    recommended_screen=row["recommended_screen"] or "",
+                )
+        return result
+
+    def remove_paths(self, paths: Iterable[str]) -> int:
+        """Remove the entries for paths, returning how many were indexed."""
+        if not self.conn:
+            return 0
+        ids = [row["id"] for row in self._select_by_path(list(paths), "id")]
+        self._delete_ids(ids)
+        self.conn.commit()
+        return len(ids)
+
+    def paths_under(self, directory: Path) -> list[str]:
+        """Get the indexed paths inside a directory, at any depth."""
+        if not self.conn:
+            return []
+        # Range scan on the path index: everything between "dir/" and "dir0"
+        prefix = str(directory).rstrip(os.sep) + os.sep
+        cursor = self.conn.execute(
+            "SELECT path FROM wallpapers WHERE path >= ? AND path < ?",
+            (prefix, prefix[:-1] + chr(ord(os.sep) + 1)),
+        )
+        return [row["path"] for row in cursor]
+
+    def get_mtimes(self) -> dict[str, float]:
+        """Get the sidecar mtime recorded for every indexed image, keyed by path."""
+        if not self.conn:
+            return {}
+        cursor = self.conn.execute("SELECT path, mtime FROM wallpapers")
+        return {path: mtime for path, mtime in cursor}
 
     def commit(self) -> None:
         if self.conn:
@@ -200,7 +474,11 @@ class WallpaperDB:
         limit: int | None = None,
         random: bool = False,
     ) -> list[dict]:
-        """Query wallpapers with filters."""
+        """Query wallpapers with filters.
+
+        search matches description, scene, style and subject; see parse_search
+        for the syntax. Results are ranked by relevance unless random is set.
+        """
         if not self.conn:
             return []
 
@@ -235,11 +513,27 @@ class WallpaperDB:
             conditions.append("w.height >= ?")
             params.append(min_height)
 
-        if search:
-            conditions.append(
-                "(w.description LIKE ? OR w.scene LIKE ? OR w.style LIKE ? OR w.subject LIKE ?)"
-            )
-            params.extend([f"%{search}%"] * 4)
+        join_clause = ""
+        rank_order = ""
+        terms = parse_search(search) if search else []
+        if search and search.strip() and not terms:
+            # Nothing searchable, such as only punctuation, matches nothing
+            return []
+        if terms and self.has_fts:
+            join_clause = "JOIN wallpapers_fts ON wallpapers_fts.rowid = w.id"
+            conditions.append("wallpapers_fts MATCH ?")
+            params.append(build_fts_query(terms))
+            weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+            rank_order = f"bm25(wallpapers_fts, {weights}), "
+        else:
+            # Without FTS5 every term is a substring match against any searchable column,
+            # on the text as typed so "sci-fi" and "it's" keep their punctuation
+            for term in terms:
+                pattern = f"%{term.text}%"
+                conditions.append(
+                    "(" + " OR ".join(f"w.{column} LIKE ?" for column in SEARCH_COLUMNS) + ")"
+                )
+                params.extend([pattern] * len(SEARCH_COLUMNS))
 
         if tag:
             conditions.append(
@@ -260,13 +554,14 @@ class WallpaperDB:
             params.append(f"%{color}%")
 
         where_clause = " AND ".join(conditions) if conditions else "1=1"
-        order_clause = "ORDER BY RANDOM()" if random else "ORDER BY w.filename"
+        order_clause = "ORDER BY RANDOM()" if random else f"ORDER BY {rank_order}w.filename"
         limit_clause = f"LIMIT {limit}" if limit else ""
 
         query = f"""
-            SELECT DISTINCT w.path, w.filename, w.description, w.style, w.subject,
+            SELECT w.path, w.filename, w.description, w.style, w.subject,
                    w.time_of_day, w.recommended_screen, w.width, w.height
             FROM wallpapers w
+            {join_clause}
             WHERE {where_clause}
             {order_clause}
             {limit_clause}
@@ -334,8 +629,21 @@ class WallpaperDB:
         cursor = self.conn.execute("SELECT id, path FROM wallpapers")
         to_delete = [row["id"] for row in cursor.fetchall() if row["path"] not in valid_paths]
 
-        for wallpaper_id in to_delete:
-            self.conn.execute("DELETE FROM wallpapers WHERE id = ?", (wallpaper_id,))
+        self._delete_ids(to_delete)
 
         self.conn.commit()
         return len(to_delete)
+
+
+def load_indexed_metadata(
+    paths: Iterable[str | Path], db_path: Path | None = None
+) -> dict[str, ImageMetadata]:
+    """Get the indexed metadata for paths, or nothing when there is no usable index."""
+    db_path = db_path or get_default_db_path()
+    if not db_path.exists():
+        return {}
+    try:
+        with WallpaperDB(db_path, read_only=True) as db:
+            return db.get_metadata(paths)
+    except sqlite3.Error:
+        return {}
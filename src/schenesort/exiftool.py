@@ -0,0 +1,191 @@
+"""Long-running exiftool processes for writing metadata into images."""
+
+import itertools
+import queue
+import re
+import subprocess
+import threading
+from contextlib import suppress
+from dataclasses import dataclass, field
+
+# Lines of exiftool's summary that count files it could not process
+_FAILED_SUMMARY = re.compile(r"^\s*(\d+) (?:image )?files? (?:weren't|were not) ", re.IGNORECASE)
+
+
+class ExifToolError(Exception):
+    """The exiftool process could not be started or stopped responding."""
+
+
+@dataclass
+class ExifToolResult:
+    """Outcome of one exiftool command."""
+
+    output: str = ""
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def message(self) -> str:
+        """The first error, or the output when exiftool reported none."""
+        return self.errors[0] if self.errors else self.output.strip()
+
+
+def _encode_arg(arg: str) -> str:
+    """Put one argument on a single argfile line."""
+    if "\n" not in arg and "\r" not in arg:
+        return arg
+    # exiftool reads lines starting with #[CSTR] as C strings, so newlines survive
+    escaped = arg.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r")
+    return f"#[CSTR]{escaped}"
+
+
+def parse_result(stdout: str, stderr: str) -> ExifToolResult:
+    """Sort exiftool's messages for one command into errors and warnings."""
+    result = ExifToolResult(output=stdout)
+    for line in stderr.splitlines():
+        line = line.strip()
+        if line.startswith("Error"):
+            result.errors.append(line)
+        elif line.startswith("Warning"):
+            result.warnings.append(line)
+        elif line:
+            result.errors.append(line)
+    if not result.errors:
+        for line in stdout.splitlines():
+            match = _FAILED_SUMMARY.match(line)
+            if match and int(match.group(1)):
+                result.errors.append(line.strip())
+    return result
+
+
+class ExifTool:
+    """One exiftool process in -stay_open mode, reading arguments from stdin.
+
+    Each command's arguments are written one per line and closed with a
+    numbered -execute. exiftool then prints a matching {ready} marker on
+    stdout, and -echo4 prints the same marker on stderr once the command's
+    messages are out, so both streams can be read up to a known point.
+    The process is started on first use and restarted if it dies.
+    Safe to share between threads; commands are run one at a time.
+    """
+
+    def __init__(self, executable: str = "exiftool") -> None:
+        self.executable = executable
+        self._process: subprocess.Popen[str] | None = None
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "ExifTool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _start(self) -> subprocess.Popen[str]:
+        try:
+            return subprocess.Popen(
+                [self.executable, "-stay_open", "True", "-@", "-"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+            )
+        except OSError as e:
+            raise ExifToolError(f"Cannot start {self.executable}: {e}") from e
+
+    def execute(self, args: list[str]) -> ExifToolResult:
+        """Run one exiftool command, given its arguments without the executable."""
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._process = self._start()
+            process = self._process
+            assert process.stdin and process.stdout and process.stderr
+
+            number = next(self._counter)
+            marker = f"{{ready{number}}}"
+            lines = [*map(_encode_arg, args), "-echo4", marker, f"-execute{number}"]
+            try:
+                process.stdin.write("\n".join(lines) + "\n")
+                process.stdin.flush()
+                stdout = self._read_until(process.stdout, marker)
+                stderr = self._read_until(process.stderr, marker)
+            except (OSError, ExifToolError):
+                self._kill()
+                raise ExifToolError(f"{self.executable} exited unexpectedly") from None
+            return parse_result(stdout, stderr)
+
+    @staticmethod
+    def _read_until(stream, marker: str) -> str:
+        lines = []
+        while True:
+            line = stream.readline()
+            if not line:
+                raise ExifToolError("unexpected end of output")
+            if line.rstrip("\r\n") == marker:
+                return "".join(lines)
+            lines.append(line)
+
+    @staticmethod
+    def _close_pipes(process: subprocess.Popen[str]) -> None:
+        for stream in (process.stdin, process.stdout, process.stderr):
+            if stream is not None:
+                with suppress(OSError):
+                    stream.close()
+
+    def _kill(self) -> None:
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+            self._close_pipes(self._process)
+            self._process = None
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Ask exiftool to exit, killing it if it does not within timeout seconds."""
+        with self._lock:
+            process = self._process
+            if process is None:
+                return
+            self._process = None
+            try:
+                assert process.stdin
+                process.stdin.write("-stay_open\nFalse\n")
+                process.stdin.close()
+                process.wait(timeout)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+                process.wait()
+            self._close_pipes(process)
+
+
+class ExifToolPool:
+    """Several exiftool sessions, each command going to whichever is free."""
+
+    def __init__(self, size: int = 1, executable: str = "exiftool") -> None:
+        self.sessions = [ExifTool(executable) for _ in range(max(size, 1))]
+        self._idle: queue.SimpleQueue[ExifTool] = queue.SimpleQueue()
+        for session in self.sessions:
+            self._idle.put(session)
+
+    def __enter__(self) -> "ExifToolPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def execute(self, args: list[str]) -> ExifToolResult:
+        """Run one command on a free session, waiting for one if all are busy."""
+        session = self._idle.get()
+        try:
+            return session.execute(args)
+        finally:
+            self._idle.put(session)
+
+    def close(self) -> None:
+        for session in self.sessions:
+            session.close()
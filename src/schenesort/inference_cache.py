@@ -0,0 +1,142 @@
+"""Persistent cache of vision model responses keyed by image content."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from schenesort.db import get_data_dir
+
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Fraction of max_entries removed per eviction pass, so eviction is not run on every put
+EVICTION_SLACK = 0.05
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    content_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    response TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (content_hash, model, prompt_version)
+);
+
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used);
+"""
+
+
+def get_default_cache_path() -> Path:
+    """Get the default inference cache path (next to the index database)."""
+    return get_data_dir() / "inference_cache.db"
+
+
+def hash_file(filepath: Path) -> str:
+    """Get the SHA-256 hex digest of a file's content."""
+    with open(filepath, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def prompt_version(prompt: str) -> str:
+    """Get a short version key for a prompt, so editing a prompt invalidates old entries."""
+    return hashlib.sha256(prompt.encode()).hexdigest()[:16]
+
+
+class InferenceCache:
+    """SQLite cache of raw model responses with least-recently-used eviction.
+
+    Entries are keyed by image content hash, model and prompt version, so a
+    renamed or moved image still hits. Safe to share between worker threads.
+    """
+
+    def __init__(
+        self, cache_path: Path | None = None, max_entries: int = DEFAULT_MAX_ENTRIES
+    ) -> None:
+        self.cache_path = cache_path or get_default_cache_path()
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.conn: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "InferenceCache":
+        self.connect()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def connect(self) -> None:
+        self.conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self._count = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def get(self, content_hash: str, model: str, prompt: str) -> str | None:
+        """Get a cached response, or None on a miss."""
+        if not self.conn:
+            return None
+
+        key = (content_hash, model, prompt_version(prompt))
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT response FROM responses "
+                "WHERE content_hash = ? AND model = ? AND prompt_version = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.conn.execute(
+                "UPDATE responses SET last_used = ? "
+                "WHERE content_hash = ? AND model = ? AND prompt_version = ?",
+                (time.time(), *key),
+            )
+            self.conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, content_hash: str, model: str, prompt: str, response: str) -> None:
+        """Store a response, evicting the least recently used entries when full."""
+        if not self.conn:
+            return
+
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(content_hash, model, prompt_version, response, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (content_hash, model, prompt_version(prompt), response, time.time()),
+            )
+            self._count += cursor.rowcount
+            if self._count > self.max_entries:
+                self._evict()
+            self.conn.commit()
+
+    def _evict(self) -> None:
+        """Drop the oldest entries until the cache is under its budget again."""
+        assert self.conn is not None
+        self._count = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        excess = self._count - self.max_entries
+        if excess <= 0:
+            return
+
+        excess += int(self.max_entries * EVICTION_SLACK)
+        cursor = self.conn.execute(
+            "DELETE FROM responses WHERE rowid IN "
+            "(SELECT rowid FROM responses ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+        self._count -= cursor.rowcount
+
+    def __len__(self) -> int:
+        return self._count
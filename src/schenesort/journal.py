@@ -0,0 +1,110 @@
+"""Run journal for resuming interrupted metadata generation."""
+
+import sqlite3
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from schenesort.db import get_data_dir
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    root TEXT NOT NULL,
+    path TEXT NOT NULL,
+    state TEXT NOT NULL,
+    target TEXT,
+    updated REAL NOT NULL,
+    PRIMARY KEY (root, path)
+);
+"""
+
+
+def get_default_journal_path() -> Path:
+    """Get the default journal database path (next to the index database)."""
+    return get_data_dir() / "journal.db"
+
+
+@dataclass
+class JournalEntry:
+    """Recorded state of one file in a run."""
+
+    state: str
+    target: str | None = None
+
+
+class RunJournal:
+    """Per-file state of a metadata generate run over one root path.
+
+    Every state change is committed straight away, so a run killed at any
+    point can be resumed from the last finished file.
+    """
+
+    def __init__(self, root: Path, journal_path: Path | None = None) -> None:
+        self.root = str(root)
+        self.journal_path = journal_path or get_default_journal_path()
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn: sqlite3.Connection | None = None
+
+    def __enter__(self) -> "RunJournal":
+        self.connect()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def connect(self) -> None:
+        self.conn = sqlite3.connect(self.journal_path)
+        # One commit per file; WAL without fsync per commit keeps that cheap
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self) -> None:
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def start(self, paths: Iterable[Path]) -> None:
+        """Begin a new run, discarding any previous journal for this root."""
+        if not self.conn:
+            return
+        now = time.time()
+        self.conn.execute("DELETE FROM journal WHERE root = ?", (self.root,))
+        self.conn.executemany(
+            "INSERT INTO journal (root, path, state, updated) VALUES (?, ?, ?, ?)",
+            ((self.root, str(p), PENDING, now) for p in paths),
+        )
+        self.conn.commit()
+
+    def load(self) -> dict[str, JournalEntry]:
+        """Get the recorded entries for this root, keyed by original path."""
+        if not self.conn:
+            return {}
+        cursor = self.conn.execute(
+            "SELECT path, state, target FROM journal WHERE root = ?", (self.root,)
+        )
+        return {path: JournalEntry(state, target) for path, state, target in cursor}
+
+    def mark_done(self, path: Path, target: Path) -> None:
+        """Record that a file is finished, and where it ended up after renaming."""
+        self._set(path, DONE, str(target))
+
+    def mark_failed(self, path: Path) -> None:
+        """Record that a file failed and should be retried."""
+        self._set(path, FAILED, None)
+
+    def _set(self, path: Path, state: str, target: str | None) -> None:
+        if not self.conn:
+            return
+        self.conn.execute(
+            "INSERT OR REPLACE INTO journal (root, path, state, target, updated) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (self.root, str(path), state, target, time.time()),
+        )
+        self.conn.commit()
@@ -0,0 +1,201 @@
+"""Spreading vision model requests over several Ollama hosts."""
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import httpx
+import ollama
+
+DEFAULT_HOST_LABEL = "localhost:11434"
+
+# Seconds a host is avoided after its first error, doubling per consecutive error
+BASE_BACKOFF = 2.0
+MAX_BACKOFF = 60.0
+
+# Unreachable hosts should fail over quickly even when inference may take minutes
+CONNECT_TIMEOUT = 10.0
+
+
+def is_host_error(error: Exception) -> bool:
+    """Check whether an error means the host is unwell rather than the request bad.
+
+    Connection problems, timeouts and 5xx responses are the host's; other
+    Ollama responses such as a missing model (404) or an image it cannot
+    decode (400) would fail the same way on any host.
+    """
+    if isinstance(error, ollama.ResponseError):
+        return error.status_code >= 500
+    # ollama turns httpx.ConnectError into the builtin ConnectionError
+    return isinstance(error, httpx.TransportError | ConnectionError | TimeoutError)
+
+
+@dataclass
+class HostStats:
+    """Request counters for one host."""
+
+    requests: int = 0
+    failures: int = 0
+    busy_seconds: float = 0.0
+    in_flight: int = 0
+    consecutive_failures: int = 0
+    backoff_until: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return self.requests - self.failures
+
+
+class ConnectionStats:
+    """Counts HTTP requests and the new connections opened to serve them.
+
+    Fed by an httpx request hook that attaches an httpcore trace callback,
+    so a request that reused a keep-alive connection adds no connect event.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def on_request(self, request: httpx.Request) -> None:
+        with self._lock:
+            self.requests += 1
+        request.extensions["trace"] = self._trace
+
+    def _trace(self, event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections += 1
+
+    @property
+    def reuse_rate(self) -> float:
+        """Fraction of requests served on an already open connection."""
+        if not self.requests:
+            return 0.0
+        return max(self.requests - self.connections, 0) / self.requests
+
+
+class HostDispatcher:
+    """Send each request to the least-loaded healthy host.
+
+    A host that fails (see is_host_error) is avoided for a backoff period
+    that doubles with every consecutive failure, and the request is retried
+    on another host. Any other error is raised straight away.
+    When every host is backing off, the one that recovers soonest is used
+    rather than waiting. Safe to share between worker threads.
+
+    One keep-alive client is kept per host for the dispatcher's lifetime, so
+    a batch command pays for connection setup once rather than per image.
+    timeout limits each request in seconds (None waits indefinitely); opening
+    a connection is always limited to CONNECT_TIMEOUT.
+    """
+
+    def __init__(self, hosts: list[str | None], timeout: float | None = None) -> None:
+        self.hosts = list(dict.fromkeys(hosts)) or [None]
+        self.timeout = timeout
+        self.stats = {host: HostStats() for host in self.hosts}
+        self.connections = ConnectionStats()
+        self.started = time.monotonic()
+        self._clients: dict[str | None, ollama.Client] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "HostDispatcher":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def client(self, host: str | None) -> ollama.Client:
+        """Get the shared client for a host, creating it on first use."""
+        with self._lock:
+            client = self._clients.get(host)
+            if client is None:
+                client = ollama.Client(
+                    host=host,
+                    timeout=httpx.Timeout(
+                        self.timeout, connect=min(self.timeout or CONNECT_TIMEOUT, CONNECT_TIMEOUT)
+                    ),
+                    event_hooks={"request": [self.connections.on_request]},
+                )
+                self._clients[host] = client
+            return client
+
+    def close(self) -> None:
+        """Close every client's connections."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+    def run[R](self, request: Callable[[str | None], R]) -> R:
+        """Call request(host) on the best host, trying each host at most once.
+
+        Raises the last error if every host fails, and an error from the
+        request itself at once, without trying further hosts.
+        """
+        tried: set[str | None] = set()
+        last_error: Exception | None = None
+
+        while len(tried) < len(self.hosts):
+            host = self._acquire(tried)
+            tried.add(host)
+            start = time.monotonic()
+            try:
+                result = request(host)
+            except Exception as e:
+                self._release(host, start, e)
+                if not is_host_error(e):
+                    raise
+                last_error = e
+                continue
+            self._release(host, start)
+            return result
+
+        assert last_error is not None
+        raise last_error
+
+    def _acquire(self, exclude: set[str | None]) -> str | None:
+        with self._lock:
+            now = time.monotonic()
+            candidates = [h for h in self.hosts if h not in exclude]
+            healthy = [h for h in candidates if self.stats[h].backoff_until <= now]
+            if healthy:
+                host = min(healthy, key=lambda h: (self.stats[h].in_flight, self.stats[h].requests))
+            else:
+                host = min(candidates, key=lambda h: self.stats[h].backoff_until)
+            self.stats[host].in_flight += 1
+            return host
+
+    def _release(self, host: str | None, start: float, error: Exception | None = None) -> None:
+        with self._lock:
+            stats = self.stats[host]
+            now = time.monotonic()
+            stats.in_flight -= 1
+            stats.requests += 1
+            stats.busy_seconds += now - start
+            if error is not None:
+                stats.failures += 1
+            if error is not None and is_host_error(error):
+                stats.consecutive_failures += 1
+                backoff = BASE_BACKOFF * 2 ** (stats.consecutive_failures - 1)
+                stats.backoff_until = now + min(backoff, MAX_BACKOFF)
+            else:
+                stats.consecutive_failures = 0
+                stats.backoff_until = 0.0
+
+    def summary(self) -> list[str]:
+        """Get one line of throughput stats per host that received requests."""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        lines = []
+        for host, stats in self.stats.items():
+            if not stats.requests:
+                continue
+            lines.append(
+                f"{host or DEFAULT_HOST_LABEL}: {stats.succeeded} ok, {stats.failures} failed, "
+                f"{stats.succeeded / elapsed:.2f} images/s, "
+                f"{stats.busy_seconds / stats.requests:.1f}s per request"
+            )
+        return lines
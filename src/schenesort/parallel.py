@@ -0,0 +1,86 @@
+"""Bounded worker pools for the bulk commands."""
+
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from itertools import islice
+
+
+def default_jobs() -> int:
+    """Get the number of workers to use when no --jobs value is given."""
+    return os.cpu_count() or 1
+
+
+def bounded_map[T, R](
+    func: Callable[[T], R],
+    items: Iterable[T],
+    workers: int,
+    ordered: bool = True,
+    processes: bool = False,
+) -> Iterator[tuple[T, R]]:
+    """Apply func to every item on a worker pool, yielding (item, result) pairs.
+
+    At most ``workers * 2`` calls are queued at any time, so a 100k file
+    collection never turns into 100k pending futures. With ``ordered`` the
+    results come back in input order, otherwise as soon as they finish.
+    A ``workers`` value of 1 or less runs everything inline.
+
+    Args:
+        func: Callable to apply (must be picklable when ``processes`` is set)
+        items: Items to process
+        workers: Number of worker threads or processes
+        ordered: Yield results in input order
+        processes: Use a process pool instead of a thread pool
+    """
+    if workers <= 1:
+        for item in items:
+            yield item, func(item)
+        return
+
+    executor: Executor = (
+        # Spawn rather than fork: callers often have threads running (rich progress refresh)
+        ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        if processes
+        else ThreadPoolExecutor(max_workers=workers)
+    )
+    window = workers * 2
+    source = iter(items)
+
+    try:
+        if ordered:
+            queue: deque[tuple[T, Future[R]]] = deque()
+            for item in source:
+                queue.append((item, executor.submit(func, item)))
+                if len(queue) >= window:
+                    break
+            while queue:
+                item, future = queue.popleft()
+                result = future.result()
+                for next_item in islice(source, 1):
+                    queue.append((next_item, executor.submit(func, next_item)))
+                yield item, result
+        else:
+            in_flight: dict[Future[R], T] = {}
+            for item in source:
+                in_flight[executor.submit(func, item)] = item
+                if len(in_flight) >= window:
+                    break
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = in_flight.pop(future)
+                    for next_item in islice(source, 1):
+                        in_flight[executor.submit(func, next_item)] = next_item
+                    yield item, future.result()
+    finally:
+        # Also reached when the consumer stops early; drop queued work
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,202 @@
+"""Reading image type and dimensions from file headers, without decoding the image."""
+
+import struct
+from pathlib import Path
+from typing import BinaryIO
+
+# Enough for every fixed-position header below
+HEAD_SIZE = 32
+
+# JPEG start-of-frame markers; C4 (DHT), C8 (JPG) and CC (DAC) share the range
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# Markers without a length field
+_STANDALONE_MARKERS = frozenset([0x01, *range(0xD0, 0xD8)])
+
+# BMP info header sizes Pillow understands
+_BMP_HEADER_SIZES = frozenset([40, 52, 56, 64, 108, 124])
+
+_TIFF_WIDTH = 256
+_TIFF_HEIGHT = 257
+
+# filetype's image matchers look no further than this, except for PNG and ISO-BMFF
+SIGNATURE_SIZE = 262
+
+# How much filetype.guess() reads from a path itself
+MAX_SIGNATURE_SIZE = 8192
+
+_PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+
+def _signature_needs(head: bytes) -> int:
+    """Get how many bytes filetype needs to decide on a file starting with head."""
+    if head.startswith(_PNG_MAGIC):
+        # APNG is told apart by an acTL chunk ahead of the first IDAT
+        pos = len(_PNG_MAGIC)
+        while pos + 8 <= len(head):
+            chunk = head[pos + 4 : pos + 8]
+            if chunk in (b"IDAT", b"IEND", b"acTL"):
+                return len(head)
+            pos += 12 + int.from_bytes(head[pos : pos + 4], "big")
+        return pos + 8
+    if head[4:8] == b"ftyp":
+        # ISO-BMFF (HEIC, AVIF) types are matched on the whole ftyp box
+        return int.from_bytes(head[:4], "big")
+    return len(head)
+
+
+def read_signature(path: Path) -> bytes:
+    """Read just enough of a file's start for filetype.guess() to recognise its type.
+
+    Gives the same result as letting filetype read its usual 8 KB, but most
+    files only need the first few hundred bytes.
+    """
+    with open(path, "rb") as f:
+        head = f.read(SIGNATURE_SIZE)
+        while len(head) < MAX_SIGNATURE_SIZE:
+            needed = min(_signature_needs(head), MAX_SIGNATURE_SIZE)
+            if needed <= len(head):
+                break
+            more = f.read(needed - len(head))
+            if not more:
+                break
+            head += more
+    return head
+
+
+def _jpeg(f: BinaryIO) -> tuple[int, int] | None:
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            # Bytes between segments are not allowed; give up rather than guess
+            return None
+        marker = f.read(1)
+        while marker == b"\xff":
+            # Fill bytes before a marker
+            marker = f.read(1)
+        if not marker:
+            return None
+        code = marker[0]
+        if code in _STANDALONE_MARKERS:
+            continue
+        if code in (0xD9, 0xDA):
+            # End of image, or start of scan before any frame header
+            return None
+        header = f.read(2)
+        if len(header) < 2:
+            return None
+        (length,) = struct.unpack(">H", header)
+        if code in _SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            _, height, width = struct.unpack(">BHH", frame)
+            # A zero height is defined later by a DNL marker, left to the caller
+            return width, height
+        if length < 2:
+            return None
+        f.seek(length - 2, 1)
+
+
+def _tiff(f: BinaryIO, head: bytes) -> tuple[int, int] | None:
+    order = "<" if head[:2] == b"II" else ">"
+    (offset,) = struct.unpack(f"{order}I", head[4:8])
+    f.seek(offset)
+    count_data = f.read(2)
+    if len(count_data) < 2:
+        return None
+    (count,) = struct.unpack(f"{order}H", count_data)
+    entries = f.read(count * 12)
+    if len(entries) < count * 12:
+        return None
+
+    size: dict[int, int] = {}
+    for i in range(count):
+        tag, kind, n = struct.unpack_from(f"{order}HHI", entries, i * 12)
+        if tag not in (_TIFF_WIDTH, _TIFF_HEIGHT) or n != 1:
+            continue
+        if kind == 3:  # SHORT
+            (size[tag],) = struct.unpack_from(f"{order}H", entries, i * 12 + 8)
+        elif kind == 4:  # LONG
+            (size[tag],) = struct.unpack_from(f"{order}I", entries, i * 12 + 8)
+    if _TIFF_WIDTH not in size or _TIFF_HEIGHT not in size:
+        return None
+    return size[_TIFF_WIDTH], size[_TIFF_HEIGHT]
+
+
+def _webp(head: bytes) -> tuple[int, int] | None:
+    chunk = head[12:16]
+    if chunk == b"VP8 " and head[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and head[20] == 0x2F:
+        (bits,) = struct.unpack("<I", head[21:25])
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def _bmp(head: bytes) -> tuple[int, int] | None:
+    (header_size,) = struct.unpack("<I", head[14:18])
+    if header_size == 12:
+        return struct.unpack("<HH", head[18:22])
+    if header_size in _BMP_HEADER_SIZES:
+        width, height = struct.unpack("<ii", head[18:26])
+        # Negative height means rows are stored top-down
+        return width, abs(height)
+    return None
+
+
+def probe_dimensions(path: Path) -> tuple[int, int] | None:
+    """Read (width, height) from the header of a JPEG, PNG, GIF, BMP, WebP or TIFF file.
+
+    Returns None for other formats and for headers it cannot make sense of,
+    so the caller can fall back to a full decoder.
+    """
+    try:
+        with open(path, "rb") as f:
+            size = _probe(f)
+    except (OSError, struct.error):
+        return None
+    if size is None or size[0] <= 0 or size[1] <= 0:
+        return None
+    return size
+
+
+def _probe(f: BinaryIO) -> tuple[int, int] | None:
+    head = f.read(HEAD_SIZE)
+    if len(head) < HEAD_SIZE:
+        return None
+    if head.startswith(b"\xff\xd8"):
+        return _jpeg(f)
+    if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+        return struct.unpack(">II", head[16:24])
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return struct.unpack("<HH", head[6:10])
+    if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+        return _webp(head)
+    if head.startswith(b"BM"):
+        return _bmp(head)
+    if head[:4] in (b"II*\x00", b"MM\x00*"):
+        return _tiff(f, head)
+    return None
+
+
+def get_image_dimensions(filepath: Path) -> tuple[int, int]:
+    """Get image width and height from the file header, or with PIL for unusual files."""
+    size = probe_dimensions(filepath)
+    if size is not None:
+        return size
+    try:
+        from PIL import Image
+
+        with Image.open(filepath) as img:
+            return img.size  # (width, height)
+    except Exception:
+        return 0, 0
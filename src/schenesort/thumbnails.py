@@ -2,17 +2,46 @@
 
 import hashlib
 import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
 from pathlib import Path
 
 from PIL import Image
 
 APP_NAME = "schenesort"
 
+# Default cache budget; 0 disables a limit
+DEFAULT_MAX_MB = 4096
+DEFAULT_MAX_ENTRIES = 0
+
+# Fraction of the budget freed beyond what is needed, so eviction is not run on every write
+EVICTION_SLACK = 0.05
+
+# Seconds between directory scans from evict(), which a long-lived cache calls often
+RECONCILE_INTERVAL = 60.0
+
+INDEX_NAME = "index.db"
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS thumbnails (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_thumbnails_last_used ON thumbnails(last_used);
+"""
+
 # Thumbnail dimensions - larger for better quality when rendered in terminal
 # Terminal cells are ~32x14 chars, but textual-image benefits from more source pixels
 THUMBNAIL_WIDTH = 320
 THUMBNAIL_HEIGHT = 200
 
+# Decode at no less than this multiple of the target size, like Image.thumbnail does
+DRAFT_REDUCING_GAP = 2.0
+
 
 def get_cache_dir() -> Path:
     """Get the XDG cache directory for schenesort thumbnails."""
@@ -50,6 +79,16 @@ def thumbnail_exists(image_path: Path) -> bool:
         return False
 
 
+def draft_for_size(img: Image.Image, size: tuple[int, int]) -> None:
+    """Configure a reduced-resolution decode for an image about to be shrunk to size.
+
+    JPEGs are then decoded with DCT scaling (1/2, 1/4 or 1/8), which skips most
+    of the decode work for multi-megapixel sources. Formats without a draft
+    mode ignore this. Must be called before the pixel data is loaded.
+    """
+    img.draft(None, (int(size[0] * DRAFT_REDUCING_GAP), int(size[1] * DRAFT_REDUCING_GAP)))
+
+
 def generate_thumbnail(image_path: Path, force: bool = False) -> Path | None:
     """Generate a thumbnail for the given image.
 
@@ -70,6 +109,9 @@ def generate_thumbnail(image_path: Path, force: bool = False) -> Path | None:
         thumb_path.parent.mkdir(parents=True, exist_ok=True)
 
         with Image.open(image_path) as img:
+            # Decode at reduced size first so the convert below works on fewer pixels
+            draft_for_size(img, (THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT))
+
             # Convert to RGB if necessary (handles RGBA, palette, etc.)
             if img.mode not in ("RGB", "L"):
                 img = img.convert("RGB")
@@ -89,25 +131,222 @@ def generate_thumbnail(image_path: Path, force: bool = False) -> Path | None:
         return None
 
 
+class ThumbnailCache:
+    """Index of cached thumbnails by size and last use, with least-recently-used eviction.
+
+    The index is a small SQLite database next to the thumbnails, so counting
+    them and picking what to evict needs no directory walk. Thumbnails
+    written without record(), such as by generate_thumbnail() called
+    directly or by older versions, are picked up by reconcile(), which
+    runs when the index is created and from evict(). Safe to share between
+    threads.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | None = None,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.cache_dir = cache_dir or get_cache_dir()
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._reconciled_at: float | None = None
+
+    def __enter__(self) -> "ThumbnailCache":
+        self.connect()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def connect(self) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        index_path = self.cache_dir / INDEX_NAME
+        is_new = not index_path.exists()
+        # Thumbnail workers and the gallery may share the index
+        self.conn = sqlite3.connect(index_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(INDEX_SCHEMA)
+        self.conn.commit()
+        if is_new:
+            self.reconcile()
+
+    def close(self) -> None:
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def reconcile(self) -> None:
+        """Bring the index in line with the thumbnails actually on disk.
+
+        Unindexed thumbnails are added with their modification time as last
+        use, and entries whose file is gone are dropped. Only the unindexed
+        files are stat'ed, so this is one directory listing when nothing changed.
+        """
+        if not self.conn:
+            return
+
+        on_disk = {}
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".jpg") and entry.is_file():
+                    on_disk[entry.name] = entry
+
+        with self._lock:
+            indexed = {row[0] for row in self.conn.execute("SELECT name FROM thumbnails")}
+            added = []
+            for name in on_disk.keys() - indexed:
+                try:
+                    st = on_disk[name].stat()
+                except OSError:
+                    continue
+                added.append((name, st.st_size, st.st_mtime))
+            self.conn.executemany(
+                "INSERT INTO thumbnails (name, size, last_used) VALUES (?, ?, ?)", added
+            )
+            self.conn.executemany(
+                "DELETE FROM thumbnails WHERE name = ?",
+                ((name,) for name in indexed - on_disk.keys()),
+            )
+            self.conn.commit()
+            self._reconciled_at = time.monotonic()
+
+    def record(self, thumb_paths: Iterable[Path]) -> None:
+        """Add or update thumbnails that were just written or found in use."""
+        if not self.conn:
+            return
+
+        now = time.time()
+        rows = []
+        for thumb_path in thumb_paths:
+            try:
+                rows.append((thumb_path.name, thumb_path.stat().st_size, now))
+            except OSError:
+                continue
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO thumbnails (name, size, last_used) VALUES (?, ?, ?)",
+                rows,
+            )
+            self.conn.commit()
+
+    def touch(self, thumb_paths: Iterable[Path]) -> None:
+        """Mark indexed thumbnails as just used."""
+        if not self.conn:
+            return
+
+        now = time.time()
+        with self._lock:
+            self.conn.executemany(
+                "UPDATE thumbnails SET last_used = ? WHERE name = ?",
+                ((now, thumb_path.name) for thumb_path in thumb_paths),
+            )
+            self.conn.commit()
+
+    def stats(self) -> tuple[int, int]:
+        """Get the number of cached thumbnails and their total size in bytes."""
+        if not self.conn:
+            return 0, 0
+
+        with self._lock:
+            count, size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM thumbnails"
+            ).fetchone()
+        return count, size
+
+    def evict(self) -> int:
+        """Delete the least recently used thumbnails until the cache fits its budget.
+
+        Returns:
+            Number of thumbnails deleted
+        """
+        if not self.conn:
+            return 0
+
+        # Count thumbnails that were written without being recorded
+        if (
+            self._reconciled_at is None
+            or time.monotonic() - self._reconciled_at >= RECONCILE_INTERVAL
+        ):
+            self.reconcile()
+
+        count, size = self.stats()
+        over_count = self.max_entries > 0 and count > self.max_entries
+        over_size = self.max_bytes > 0 and size > self.max_bytes
+        if not (over_count or over_size):
+            return 0
+
+        target_count = int(self.max_entries * (1 - EVICTION_SLACK)) if self.max_entries else count
+        target_size = int(self.max_bytes * (1 - EVICTION_SLACK)) if self.max_bytes else size
+
+        with self._lock:
+            victims = []
+            for name, thumb_size in self.conn.execute(
+                "SELECT name, size FROM thumbnails ORDER BY last_used"
+            ):
+                if count <= target_count and size <= target_size:
+                    break
+                victims.append(name)
+                count -= 1
+                size -= thumb_size
+
+            for name in victims:
+                try:
+                    (self.cache_dir / name).unlink(missing_ok=True)
+                except OSError:
+                    pass
+            self.conn.executemany(
+                "DELETE FROM thumbnails WHERE name = ?", ((name,) for name in victims)
+            )
+            self.conn.commit()
+        return len(victims)
+
+    def clear(self) -> int:
+        """Delete every cached thumbnail.
+
+        Returns:
+            Number of thumbnails deleted
+        """
+        count = 0
+        for thumb in self.cache_dir.glob("*.jpg"):
+            try:
+                thumb.unlink()
+                count += 1
+            except OSError:
+                pass
+
+        if self.conn:
+            with self._lock:
+                self.conn.execute("DELETE FROM thumbnails")
+                self.conn.commit()
+        return count
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """Get a thumbnail cache with the budget from the config file (not yet connected)."""
+    from schenesort.config import load_config
+
+    config = load_config()
+    return ThumbnailCache(
+        max_bytes=config.thumbnail_cache_mb * 1024 * 1024,
+        max_entries=config.thumbnail_cache_entries,
+    )
+
+
 def clear_cache() -> int:
     """Clear all cached thumbnails.
 
     Returns:
         Number of thumbnails deleted
     """
-    cache_dir = get_cache_dir()
-    if not cache_dir.exists():
+    if not get_cache_dir().exists():
         return 0
 
-    count = 0
-    for thumb in cache_dir.glob("*.jpg"):
-        try:
-            thumb.unlink()
-            count += 1
-        except OSError:
-            pass
-
-    return count
+    with get_thumbnail_cache() as cache:
+        return cache.clear()
 
 
 def get_cache_stats() -> dict:
@@ -116,12 +355,14 @@ def get_cache_stats() -> dict:
     if not cache_dir.exists():
         return {"count": 0, "size_bytes": 0, "path": str(cache_dir)}
 
-    thumbnails = list(cache_dir.glob("*.jpg"))
-    total_size = sum(t.stat().st_size for t in thumbnails)
+    with get_thumbnail_cache() as cache:
+        count, total_size = cache.stats()
+        max_bytes = cache.max_bytes
 
     return {
-        "count": len(thumbnails),
+        "count": count,
         "size_bytes": total_size,
         "size_mb": total_size / (1024 * 1024),
+        "max_mb": max_bytes / (1024 * 1024),
         "path": str(cache_dir),
     }
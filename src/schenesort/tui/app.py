@@ -7,11 +7,10 @@ from textual.binding import Binding
 from textual.containers import Horizontal
 from textual.widgets import Footer, Header, Static
 
-from schenesort.tui.widgets.image_preview import ImagePreview
+from schenesort.tui.metadata import MetadataLookup
+from schenesort.tui.widgets.image_preview import ImagePreview, neighbours
 from schenesort.tui.widgets.metadata_panel import MetadataPanel
-from schenesort.xmp import read_xmp
-
-VALID_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tiff", ".tif"}
+from schenesort.walker import find_images
 
 
 class WallpaperBrowser(App):
@@ -85,6 +84,7 @@ class WallpaperBrowser(App):
         self._files = files  # Pre-specified file list (from query results)
         self._images: list[Path] = []
         self._current_index: int = 0
+        self._metadata: MetadataLookup | None = None  # Built once the images are loaded
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -99,6 +99,7 @@ class WallpaperBrowser(App):
     def on_mount(self) -> None:
         """Initialize the browser when mounted."""
         self._load_images()
+        self._metadata = MetadataLookup(self._images)
         if self._images:
             self._show_current_image()
         else:
@@ -114,30 +115,21 @@ class WallpaperBrowser(App):
         if self._base_path is None:
             return
 
-        if self._base_path.is_file():
-            if self._base_path.suffix.lower() in VALID_IMAGE_EXTENSIONS:
-                self._images = [self._base_path]
-        else:
-            pattern = "**/*" if self._recursive else "*"
-            self._images = sorted(
-                f
-                for f in self._base_path.glob(pattern)
-                if f.is_file() and f.suffix.lower() in VALID_IMAGE_EXTENSIONS
-            )
+        self._images = sorted(entry.path for entry in find_images(self._base_path, self._recursive))
 
     def _show_current_image(self) -> None:
         """Display the current image and its metadata."""
-        if not self._images:
+        if not self._images or self._metadata is None:
             return
 
         current_image = self._images[self._current_index]
 
         # Load image
         preview = self.query_one("#image-panel", ImagePreview)
-        preview.load_image(current_image)
+        preview.load_image(current_image, neighbours(self._images, self._current_index))
 
         # Load metadata
-        metadata = read_xmp(current_image)
+        metadata = self._metadata.get(self._current_index)
         panel = self.query_one("#metadata-panel", MetadataPanel)
         panel.update_metadata(metadata, current_image.name)
 
@@ -1,5 +1,6 @@
 """Gallery Grid Browser TUI application."""
 
+import threading
 from pathlib import Path
 
 from textual.app import App, ComposeResult
@@ -7,13 +8,15 @@ from textual.binding import Binding
 from textual.containers import Horizontal
 from textual.screen import Screen
 from textual.widgets import Footer, Header, Static
+from textual.worker import Worker, get_current_worker
 
-from schenesort.db import WallpaperDB
+from schenesort.db import WallpaperDB, get_default_db_path
+from schenesort.tui.metadata import MetadataLookup
 from schenesort.tui.widgets.filter_panel import FilterPanel, FilterValues
-from schenesort.tui.widgets.image_preview import ImagePreview
+from schenesort.tui.widgets.image_preview import ImagePreview, neighbours
 from schenesort.tui.widgets.metadata_panel import MetadataPanel
 from schenesort.tui.widgets.thumbnail_grid import ThumbnailGrid
-from schenesort.xmp import read_xmp
+from schenesort.walker import existing_paths
 
 
 class DetailScreen(Screen):
@@ -58,10 +61,17 @@ class DetailScreen(Screen):
     }
     """
 
-    def __init__(self, images: list[Path], start_index: int = 0, **kwargs) -> None:
+    def __init__(
+        self,
+        images: list[Path],
+        start_index: int = 0,
+        db_path: Path | None = None,
+        **kwargs,
+    ) -> None:
         super().__init__(**kwargs)
         self._images = images
         self._current_index = start_index
+        self._metadata = MetadataLookup(images, db_path)
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -84,10 +94,10 @@ class DetailScreen(Screen):
 
         # Update image
         preview = self.query_one("#image-panel", ImagePreview)
-        preview.load_image(current)
+        preview.load_image(current, neighbours(self._images, self._current_index))
 
         # Update metadata
-        metadata = read_xmp(current)
+        metadata = self._metadata.get(self._current_index)
         panel = self.query_one("#metadata-panel", MetadataPanel)
         panel.update_metadata(metadata, current.name)
 
@@ -113,7 +123,12 @@ class DetailScreen(Screen):
 
 
 class GridBrowser(App):
-    """A TUI application for browsing wallpapers in a thumbnail grid with filters."""
+    """A TUI application for browsing wallpapers in a thumbnail grid with filters.
+
+    Queries run on a worker thread over one read-only connection kept open
+    for the session. A new filter change interrupts the query it replaces,
+    so typing never waits on a search whose results would be thrown away.
+    """
 
     TITLE = "Schenesort - Gallery"
 
@@ -167,17 +182,23 @@ class GridBrowser(App):
         Binding("r", "refresh", "Refresh", show=True),
     ]
 
-    def __init__(self, initial_filters: FilterValues | None = None, **kwargs) -> None:
+    def __init__(
+        self, initial_filters: FilterValues | None = None, jobs: int | None = None, **kwargs
+    ) -> None:
         super().__init__(**kwargs)
         self._initial_filters = initial_filters or FilterValues()
+        self._jobs = jobs
         self._images: list[Path] = []
         self._db_path: Path | None = None
+        self._db: WallpaperDB | None = None
+        # Held by the query worker, so an interrupted query finishes before the next starts
+        self._query_lock = threading.Lock()
 
     def compose(self) -> ComposeResult:
         yield Header()
         with Horizontal(id="main-container"):
             yield FilterPanel(initial_filters=self._initial_filters, id="filter-panel")
-            yield ThumbnailGrid(id="grid-panel")
+            yield ThumbnailGrid(jobs=self._jobs, id="grid-panel")
         with Horizontal(id="status-bar"):
             yield Static("Loading...", id="status-left")
             yield Static("", id="status-right")
@@ -187,14 +208,58 @@ class GridBrowser(App):
         """Initialize the browser when mounted."""
         # Set initial focus to the grid
         self.query_one("#grid-panel", ThumbnailGrid).focus()
+        try:
+            self._open_database()
+        except Exception as e:
+            self._update_status(error=str(e))
+            return
         # Load initial data
         self._query_database(self._initial_filters)
 
+    def on_unmount(self) -> None:
+        """Stop any running query and close the database."""
+        self.workers.cancel_group(self, "query")
+        if self._db is not None:
+            self._db.interrupt()
+            with self._query_lock:
+                self._db.close()
+            self._db = None
+
+    def _open_database(self) -> None:
+        """Open the read-only connection used for every query, creating the database once."""
+        db_path = get_default_db_path()
+        if not db_path.exists():
+            with WallpaperDB(db_path):
+                pass
+        self._db = WallpaperDB(db_path, read_only=True)
+        self._db.connect()
+        self._db_path = db_path
+
     def _query_database(self, filters: FilterValues) -> None:
-        """Query the database with the given filters."""
-        try:
-            with WallpaperDB() as db:
-                self._db_path = db.db_path
+        """Query the database with the given filters, replacing any query still running."""
+        if self._db is None:
+            return
+
+        self.query_one("#status-left", Static).update("[dim]Searching...[/dim]")
+        # Stop a superseded query inside SQLite; its worker then drops the result
+        self._db.interrupt()
+        self.run_worker(
+            lambda: self._run_query(filters),
+            thread=True,
+            group="query",
+            exclusive=True,
+            exit_on_error=False,
+        )
+
+    def _run_query(self, filters: FilterValues) -> None:
+        """Run a query on the worker thread and hand the existing files to the grid."""
+        worker = get_current_worker()
+        error = None
+        with self._query_lock:
+            db = self._db
+            if worker.is_cancelled or db is None:
+                return
+            try:
                 results = db.query(
                     search=filters.search or None,
                     tag=filters.tag or None,
@@ -207,19 +272,28 @@ class GridBrowser(App):
                     min_width=filters.min_width,
                     min_height=filters.min_height,
                 )
+            except Exception as e:
+                error = str(e)
 
-            # Extract paths and filter for existing files
-            self._images = [Path(r["path"]) for r in results if Path(r["path"]).exists()]
-
-            # Update grid
-            grid = self.query_one("#grid-panel", ThumbnailGrid)
-            grid.set_images(self._images)
-
-            # Update status
-            self._update_status()
-
-        except Exception as e:
-            self._update_status(error=str(e))
+        if worker.is_cancelled:
+            # Also covers the "interrupted" error from a superseded query
+            return
+        if error is not None:
+            self.call_from_thread(self._update_status, error)
+            return
+        # One directory listing per folder rather than a stat per file
+        images = existing_paths(Path(r["path"]) for r in results)
+        if not worker.is_cancelled:
+            self.call_from_thread(self._show_results, worker, images)
+
+    def _show_results(self, worker: Worker, images: list[Path]) -> None:
+        # Cancellation happens on this thread, so this check cannot race a newer query
+        if worker.is_cancelled:
+            return
+        self._images = images
+        grid = self.query_one("#grid-panel", ThumbnailGrid)
+        grid.set_images(self._images)
+        self._update_status()
 
     def _update_status(self, error: str | None = None) -> None:
         """Update the status bar."""
@@ -263,7 +337,7 @@ class GridBrowser(App):
             return
 
         # Push detail screen onto the stack
-        self.push_screen(DetailScreen(self._images, start_index))
+        self.push_screen(DetailScreen(self._images, start_index, self._db_path))
 
     def action_focus_next_panel(self) -> None:
         """Switch focus to the next panel."""
@@ -0,0 +1,39 @@
+"""Metadata lookup for the browsers, served from the index where possible."""
+
+from collections.abc import Sequence
+from pathlib import Path
+
+from schenesort.db import load_indexed_metadata
+from schenesort.xmp import ImageMetadata, read_xmp
+
+
+class MetadataLookup:
+    """Metadata for a list of images, read from the index a window at a time.
+
+    Stepping to an image outside the windows read so far fetches the next
+    one in a single query, so navigation costs no file reads for indexed
+    images however slow the storage is. Images the index does not have
+    fall back to their sidecar.
+    """
+
+    WINDOW = 256
+
+    def __init__(self, images: Sequence[Path], db_path: Path | None = None) -> None:
+        self._images = images
+        self._db_path = db_path
+        self._metadata: dict[str, ImageMetadata] = {}
+        self._looked_up: set[str] = set()
+
+    def get(self, index: int) -> ImageMetadata:
+        """Get the metadata for the image at index."""
+        path = self._images[index]
+        key = str(path)
+        if key not in self._looked_up:
+            # Centred on the current image, since the browsers step both ways
+            start = max(0, index - self.WINDOW // 2)
+            window = [str(p) for p in self._images[start : start + self.WINDOW]]
+            self._metadata.update(load_indexed_metadata(window, self._db_path))
+            self._looked_up.update(window)
+
+        metadata = self._metadata.get(key)
+        return metadata if metadata is not None else read_xmp(path)
@@ -99,7 +99,7 @@ class FilterPanel(VerticalScroll):
         yield Label("Search", classes="filter-label")
         yield Input(
             value=self._filters.search,
-            placeholder="description, scene...",
+            placeholder='words, "a phrase"...',
             id="filter-search",
         )
 
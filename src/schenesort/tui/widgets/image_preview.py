@@ -1,15 +1,122 @@
 """Image preview widget using textual-image."""
 
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
 from pathlib import Path
 
+from PIL import Image as PILImage
 from textual.app import ComposeResult
 from textual.containers import Container
 from textual.widgets import Static
+from textual.worker import get_current_worker
 from textual_image.widget import Image
 
+from schenesort.thumbnails import draft_for_size
+
+try:
+    # Not public API; the fallback below keeps the preview working if it moves
+    from textual_image._terminal import get_cell_size
+except ImportError:
+    get_cell_size = None
+
+# Images either side of the current one decoded ahead of time
+PREFETCH_DEPTH = 2
+
+# Decoded previews kept in memory, shared by every preview panel
+PREVIEW_CACHE_SIZE = 16
+
+# Typical terminal cell size in pixels, used when the real one is unknown
+FALLBACK_CELL_SIZE = (10, 20)
+
+type PreviewKey = tuple[Path, int, tuple[int, int]]
+
+
+def decode_preview(path: Path, size: tuple[int, int]) -> PILImage.Image:
+    """Decode an image shrunk to fit within size pixels, ready to hand to the widget."""
+    with PILImage.open(path) as img:
+        draft_for_size(img, size)
+        img.thumbnail(size, PILImage.Resampling.LANCZOS)
+        if img.mode not in ("RGB", "RGBA", "L"):
+            img = img.convert("RGBA" if "A" in img.mode else "RGB")
+        img.load()
+    return img
+
+
+def cell_size() -> tuple[int, int]:
+    """Get the terminal's cell size in pixels as (width, height)."""
+    if get_cell_size is not None:
+        try:
+            cell = get_cell_size()
+            return cell.width, cell.height
+        except Exception:
+            pass
+    return FALLBACK_CELL_SIZE
+
+
+def neighbours(images: Sequence[Path], index: int, depth: int = PREFETCH_DEPTH) -> list[Path]:
+    """Get the images around index, nearest first and the next ahead of the previous."""
+    result = []
+    for distance in range(1, depth + 1):
+        for i in (index + distance, index - distance):
+            if 0 <= i < len(images):
+                result.append(images[i])
+    return result
+
+
+class PreviewCache:
+    """Least-recently-used store of decoded previews.
+
+    Keyed by path, modification time and target size, so an edited file or a
+    resized panel gets a fresh decode. Safe to share between threads.
+    """
+
+    def __init__(self, max_entries: int = PREVIEW_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._images: OrderedDict[PreviewKey, PILImage.Image] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(path: Path, size: tuple[int, int]) -> PreviewKey | None:
+        """Get the cache key for path at size, or None if the file is gone."""
+        try:
+            return path, path.stat().st_mtime_ns, size
+        except OSError:
+            return None
+
+    def get(self, key: PreviewKey) -> PILImage.Image | None:
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+
+    def put(self, key: PreviewKey, image: PILImage.Image) -> None:
+        with self._lock:
+            self._images[key] = image
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+
+    def __contains__(self, key: PreviewKey) -> bool:
+        with self._lock:
+            return key in self._images
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._images)
+
+
+preview_cache = PreviewCache()
+
 
 class ImagePreview(Container):
-    """Widget for displaying image preview with zoom support."""
+    """Widget for displaying image preview with zoom support.
+
+    Images are decoded at the panel's pixel size on a worker thread, and
+    the neighbours passed to load_image are decoded next, so stepping
+    through a collection mostly finds its images ready in the cache.
+    """
 
     DEFAULT_CSS = """
     ImagePreview {
@@ -33,36 +140,112 @@ class ImagePreview(Container):
     }
     """
 
-    def __init__(self, **kwargs) -> None:
+    def __init__(self, cache: PreviewCache | None = None, **kwargs) -> None:
         super().__init__(**kwargs)
         self._image_path: Path | None = None
         self._zoom_level: float = 1.0
         self._image_widget: Image | None = None
+        self._cache = cache if cache is not None else preview_cache
 
     def compose(self) -> ComposeResult:
         yield Static("No image selected", classes="no-image", id="placeholder")
 
-    def load_image(self, path: Path | None) -> None:
-        """Load and display an image."""
+    def _target_size(self) -> tuple[int, int] | None:
+        """Get the panel's size in pixels, or None before it has been laid out."""
+        width, height = self.content_size
+        if width <= 0 or height <= 0:
+            return None
+        cell_width, cell_height = cell_size()
+        return width * cell_width, height * cell_height
+
+    def load_image(self, path: Path | None, neighbours: Sequence[Path] = ()) -> None:
+        """Load and display an image, then prefetch its neighbours in the given order."""
         self._image_path = path
         self._zoom_level = 1.0
 
-        # Remove existing image widget if present
-        if self._image_widget is not None:
-            self._image_widget.remove()
-            self._image_widget = None
-
         placeholder = self.query_one("#placeholder", Static)
 
         if path is None or not path.exists():
+            self._show(None)
             placeholder.update("No image selected")
             placeholder.display = True
             return
 
+        size = self._target_size()
+        if size is None:
+            # Not laid out yet; let the widget scale the full image until it is
+            self._show(path)
+            self.call_after_refresh(self._load_when_sized, path, list(neighbours))
+            return
+
+        key = self._cache.key(path, size)
+        image = self._cache.get(key) if key is not None else None
+        if image is not None:
+            self._show(image)
+        else:
+            self._show(None)
+            placeholder.update(f"Loading {path.name}...")
+            placeholder.display = True
+
+        # A newer image replaces this worker, which stops between decodes
+        self.run_worker(
+            lambda: self._decode(path, size, list(neighbours)),
+            thread=True,
+            group="preview",
+            exclusive=True,
+            exit_on_error=False,
+        )
+
+    def _load_when_sized(self, path: Path, neighbours: list[Path]) -> None:
+        if path == self._image_path and self._target_size() is not None:
+            self.load_image(path, neighbours)
+
+    def _decode(self, path: Path, size: tuple[int, int], neighbours: list[Path]) -> None:
+        """Decode the current image if needed, then its neighbours, into the cache."""
+        worker = get_current_worker()
+        for i, image_path in enumerate([path, *neighbours]):
+            if worker.is_cancelled:
+                return
+            key = self._cache.key(image_path, size)
+            if key is None or key in self._cache:
+                continue
+            try:
+                image = decode_preview(image_path, size)
+            except Exception as e:
+                if i == 0:
+                    self.app.call_from_thread(self._show_error, path, e)
+                continue
+            self._cache.put(key, image)
+            if i == 0:
+                self.app.call_from_thread(self._show_decoded, path, image)
+
+    def _show_decoded(self, path: Path, image: PILImage.Image) -> None:
+        if path == self._image_path:
+            self._show(image)
+
+    def _show_error(self, path: Path, error: Exception) -> None:
+        if path == self._image_path:
+            self._show(None)
+            placeholder = self.query_one("#placeholder", Static)
+            placeholder.update(f"Error loading image: {error}")
+            placeholder.display = True
+
+    def _show(self, image: Path | PILImage.Image | None) -> None:
+        """Point the image widget at image, creating it on first use."""
+        if image is None:
+            if self._image_widget is not None:
+                self._image_widget.display = False
+            return
+
+        placeholder = self.query_one("#placeholder", Static)
         try:
+            if self._image_widget is None:
+                self._image_widget = Image(image)
+                self.mount(self._image_widget)
+            else:
+                self._image_widget.image = image
+            self._image_widget.display = True
             placeholder.display = False
-            self._image_widget = Image(path)
-            self.mount(self._image_widget)
         except Exception as e:
             placeholder.update(f"Error loading image: {e}")
             placeholder.display = True
@@ -1,15 +1,37 @@
 """Thumbnail grid widget for gallery view."""
 
+import multiprocessing
+import sys
+import threading
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    BrokenExecutor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from contextlib import redirect_stderr
+from multiprocessing import resource_tracker
 from pathlib import Path
 
 from textual.app import ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, VerticalScroll
+from textual.geometry import Region
 from textual.message import Message
 from textual.widgets import Static
+from textual.worker import get_current_worker
 from textual_image.widget import Image
 
-from schenesort.thumbnails import get_thumbnail_path, thumbnail_exists
+from schenesort.parallel import default_jobs
+from schenesort.thumbnails import (
+    ThumbnailCache,
+    generate_thumbnail,
+    get_thumbnail_cache,
+    get_thumbnail_path,
+    thumbnail_exists,
+)
 
 
 class ThumbnailText(Static):
@@ -31,10 +53,21 @@ class ThumbnailText(Static):
     """
 
     def __init__(self, image_path: Path, index: int, **kwargs) -> None:
+        super().__init__(self._label(image_path), **kwargs)
+        self.image_path = image_path
+        self.index = index
+
+    @staticmethod
+    def _label(image_path: Path) -> str:
         name = image_path.stem
         if len(name) > 28:
             name = name[:25] + "..."
-        super().__init__(name, **kwargs)
+        return name
+
+    def show(self, image_path: Path, index: int) -> None:
+        """Reuse this cell for another image."""
+        if image_path != self.image_path:
+            self.update(self._label(image_path))
         self.image_path = image_path
         self.index = index
 
@@ -55,8 +88,48 @@ def create_thumbnail_cell(image_path: Path, index: int) -> CellWidget:
     return ThumbnailText(image_path, index)
 
 
+def reuse_thumbnail_cell(cell: CellWidget, image_path: Path, index: int) -> bool:
+    """Point an existing cell at another image, if it is the right kind of cell for it.
+
+    Returns:
+        False when a new cell has to be created instead
+    """
+    if thumbnail_exists(image_path):
+        if not isinstance(cell, Image):
+            return False
+        if cell.image_path != image_path:  # type: ignore[attr-defined]
+            cell.image = get_thumbnail_path(image_path)
+        cell.image_path = image_path  # type: ignore[attr-defined]
+        cell.index = index  # type: ignore[attr-defined]
+        return True
+    if not isinstance(cell, ThumbnailText):
+        return False
+    cell.show(image_path, index)
+    return True
+
+
+def _start_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Create a process pool from inside a running app."""
+    # Textual replaces stderr with an object whose fileno() is -1, which the
+    # spawn start method would hand to its resource tracker; start that first
+    with redirect_stderr(sys.__stderr__):
+        resource_tracker.ensure_running()
+    # Spawn rather than fork: the app has threads running
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
 class ThumbnailGrid(VerticalScroll, can_focus=True):
-    """Scrollable grid of image thumbnails with keyboard navigation."""
+    """Scrollable grid of image thumbnails with keyboard navigation.
+
+    Only the rows in view, plus a few either side, have widgets. The grid
+    container is sized for every row so the scrollbar covers the whole
+    list, and the window of cells is moved down it and re-pointed at other
+    images as the view scrolls.
+
+    Missing thumbnails for the window are generated on a process pool,
+    visible cells first, and swapped in as they finish. Work for cells that
+    scroll away is dropped unless it has already started.
+    """
 
     BINDINGS = [
         Binding("up", "move_up", "Up", show=False),
@@ -90,6 +163,14 @@ class ThumbnailGrid(VerticalScroll, can_focus=True):
             self.index = index
             super().__init__()
 
+    class ThumbnailReady(Message):
+        """Emitted when a missing thumbnail has been generated in the background."""
+
+        def __init__(self, image_path: Path, thumb_path: Path) -> None:
+            self.image_path = image_path
+            self.thumb_path = thumb_path
+            super().__init__()
+
     DEFAULT_CSS = """
     ThumbnailGrid {
         width: 100%;
@@ -102,6 +183,10 @@ class ThumbnailGrid(VerticalScroll, can_focus=True):
     }
 
     ThumbnailGrid #grid-container {
+        width: 100%;
+    }
+
+    ThumbnailGrid #grid-window {
         layout: grid;
         grid-gutter: 0;
         width: 100%;
@@ -131,72 +216,293 @@ class ThumbnailGrid(VerticalScroll, can_focus=True):
     CELL_WIDTH = 32
     CELL_HEIGHT = 14
 
-    def __init__(self, images: list[Path] | None = None, **kwargs) -> None:
+    # Rows of cells kept above and below the visible ones
+    OVERSCAN_ROWS = 1
+
+    def __init__(self, images: list[Path] | None = None, jobs: int | None = None, **kwargs) -> None:
+        """Create the grid.
+
+        Args:
+            images: Images to show
+            jobs: Processes generating missing thumbnails (default: CPU count, 0 to disable)
+        """
         super().__init__(**kwargs)
         self._images: list[Path] = images or []
         self._selected_index: int = 0
         self._columns: int = 1
         self._cells: list[CellWidget] = []
         self._grid_container: Container | None = None
+        self._window: Container | None = None
+        self._empty_message: Static | None = None
+        self._first_row: int = 0
+        self._window_rows: int = 0
+        self._cache: ThumbnailCache | None = None
+        self._jobs = jobs if jobs is not None else default_jobs()
+        self._executor: ProcessPoolExecutor | None = None
+        # Generation jobs by image, shared by successive workers so none is submitted twice
+        self._generating: dict[Path, Future[Path | None]] = {}
+        self._generating_lock = threading.Lock()
+        self._failed: set[Path] = set()
 
     def compose(self) -> ComposeResult:
-        self._grid_container = Container(id="grid-container")
+        self._window = Container(id="grid-window")
+        self._empty_message = Static("No images to display", classes="empty-message")
+        self._grid_container = Container(self._window, self._empty_message, id="grid-container")
         yield self._grid_container
 
     def on_mount(self) -> None:
         """Initialize the grid on mount."""
+        try:
+            self._cache = get_thumbnail_cache()
+            self._cache.connect()
+        except Exception:
+            # The gallery works without usage tracking
+            self._cache = None
         # Defer initial build to after layout
         self.call_after_refresh(self._initial_build)
 
+    def on_unmount(self) -> None:
+        self.workers.cancel_group(self, "thumbnail-generation")
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
     def _initial_build(self) -> None:
         """Build grid after initial layout."""
         self._calculate_columns()
         self._rebuild_grid()
 
     def on_resize(self) -> None:
-        """Recalculate columns when resized."""
+        """Recalculate columns and visible rows when resized."""
         old_columns = self._columns
         self._calculate_columns()
         if old_columns != self._columns:
             self._rebuild_grid()
+        else:
+            self._update_window()
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        self._update_window()
 
     def _calculate_columns(self) -> None:
         """Calculate number of columns based on container width."""
         available_width = max(self.size.width - 2, self.CELL_WIDTH)
         self._columns = max(1, available_width // self.CELL_WIDTH)
 
+    @property
+    def _row_count(self) -> int:
+        return (len(self._images) + self._columns - 1) // self._columns
+
     def _rebuild_grid(self) -> None:
-        """Rebuild the grid with current images and column count."""
-        if self._grid_container is None:
+        """Lay the grid out again for the current images and column count."""
+        if self._grid_container is None or self._window is None or self._empty_message is None:
             return
 
-        container = self._grid_container
+        self._empty_message.display = not self._images
+        self._window.display = bool(self._images)
+
+        # Update grid columns CSS
+        self._window.styles.grid_size_columns = self._columns
 
-        # Clear all children from container
-        container.remove_children()
-        self._cells.clear()
+        # Size the container for every row, so scrolling covers the whole list
+        # (textual-image needs explicit height, not height: auto, to render in scroll containers)
+        self._grid_container.styles.height = (
+            self._row_count * self.CELL_HEIGHT if self._images else "auto"
+        )
 
-        if not self._images:
-            container.mount(Static("No images to display", classes="empty-message"))
+        self._update_window(force=True)
+        self._update_selection()
+
+    def _update_window(self, force: bool = False) -> None:
+        """Show the rows around the scroll position, reusing the cells already mounted."""
+        if self._window is None:
             return
 
-        # Update grid columns CSS
-        container.styles.grid_size_columns = self._columns
+        visible_rows = -(-self.scrollable_content_region.height // self.CELL_HEIGHT) + 1
+        window_rows = min(visible_rows + 2 * self.OVERSCAN_ROWS, self._row_count)
+        first_row = max(0, int(self.scroll_y) // self.CELL_HEIGHT - self.OVERSCAN_ROWS)
+        first_row = min(first_row, self._row_count - window_rows)
 
-        # Calculate and set container height based on rows
-        # (textual-image needs explicit height, not height: auto, to render in scroll containers)
-        num_rows = (len(self._images) + self._columns - 1) // self._columns
-        container_height = num_rows * self.CELL_HEIGHT
-        container.styles.height = container_height
+        if not force and first_row == self._first_row and window_rows == self._window_rows:
+            return
+        self._first_row = first_row
+        self._window_rows = window_rows
+
+        # Move the window down to its rows, and fill it from the first image on them
+        self._window.styles.margin = (first_row * self.CELL_HEIGHT, 0, 0, 0)
+        self._window.styles.height = window_rows * self.CELL_HEIGHT
+
+        start = first_row * self._columns
+        count = min(window_rows * self._columns, len(self._images) - start)
+
+        shown = []
+        missing = []
+        for slot in range(count):
+            index = start + slot
+            image_path = self._images[index]
+            cell = self._cells[slot] if slot < len(self._cells) else None
+            if cell is None or not reuse_thumbnail_cell(cell, image_path, index):
+                new_cell = create_thumbnail_cell(image_path, index)
+                if cell is None:
+                    self._cells.append(new_cell)
+                    self._window.mount(new_cell)
+                else:
+                    self._cells[slot] = new_cell
+                    self._window.mount(new_cell, before=cell)
+                    cell.remove()
+                cell = new_cell
+            if isinstance(cell, Image):
+                shown.append(get_thumbnail_path(image_path))
+            elif image_path not in self._failed:
+                missing.append((index, image_path))
+
+        for cell in self._cells[count:]:
+            cell.remove()
+        del self._cells[count:]
+
+        self._update_selection_classes()
+
+        if shown and self._cache is not None:
+            self.run_worker(
+                lambda: self._mark_used(shown),
+                thread=True,
+                group="thumbnail-cache",
+                exit_on_error=False,
+            )
 
-        # Create cells
-        for idx, image_path in enumerate(self._images):
-            cell = create_thumbnail_cell(image_path, idx)
-            self._cells.append(cell)
-            container.mount(cell)
+        self._queue_missing(missing)
 
-        # Update selection
-        self._update_selection()
+    def _queue_missing(self, missing: list[tuple[int, Path]]) -> None:
+        """Start generating the window's missing thumbnails, replacing any earlier queue."""
+        if self._jobs <= 0:
+            return
+        if not missing:
+            self.workers.cancel_group(self, "thumbnail-generation")
+            return
+
+        # Rows in view go first, then the overscan rows
+        top = int(self.scroll_y) // self.CELL_HEIGHT
+        bottom = (int(self.scroll_y) + self.scrollable_content_region.height) // self.CELL_HEIGHT
+        visible = range(top * self._columns, (bottom + 1) * self._columns)
+        ordered = [path for _, path in sorted(missing, key=lambda item: item[0] not in visible)]
+
+        if self._executor is None:
+            self._executor = _start_process_pool(self._jobs)
+        self.run_worker(
+            lambda: self._generate_missing(ordered),
+            thread=True,
+            group="thumbnail-generation",
+            exclusive=True,
+            exit_on_error=False,
+        )
+
+    def _submit(self, image_path: Path) -> Future[Path | None] | None:
+        """Get the generation job for an image, submitting one unless it is already running.
+
+        Returns None once the grid has shut its pool down.
+        """
+        with self._generating_lock:
+            future = self._generating.get(image_path)
+            # A finished job may not have been forgotten yet; only share running ones
+            if future is not None and not future.done():
+                return future
+            if self._executor is None:
+                return None
+            try:
+                future = self._executor.submit(generate_thumbnail, image_path)
+            except BrokenExecutor:
+                self._restart_pool(self._executor)
+                future = self._executor.submit(generate_thumbnail, image_path)
+            self._generating[image_path] = future
+        # Outside the lock: the callback runs right here if the job is already done
+        future.add_done_callback(lambda _: self._forget(image_path, future))
+        return future
+
+    def _restart_pool(self, broken: ProcessPoolExecutor) -> None:
+        """Replace a pool whose worker died, unless that was already done.
+
+        Call with _generating_lock held.
+        """
+        if self._executor is not broken:
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = _start_process_pool(self._jobs)
+
+    def _forget(self, image_path: Path, future: Future[Path | None]) -> None:
+        with self._generating_lock:
+            if self._generating.get(image_path) is future:
+                del self._generating[image_path]
+
+    def _generate_missing(self, missing: list[Path]) -> None:
+        """Generate thumbnails in order, queueing no more jobs than the pool can run.
+
+        Runs in a thread worker; a newer window cancels it, and jobs it has
+        queued but not started are then cancelled too.
+        """
+        worker = get_current_worker()
+        pending = deque(missing)
+        running: dict[Future[Path | None], Path] = {}
+        # Images whose job died with the pool; retried once, as the crash may not be theirs
+        crashed: set[Path] = set()
+        try:
+            while (pending or running) and not worker.is_cancelled:
+                while pending and len(running) < self._jobs:
+                    image_path = pending.popleft()
+                    future = self._submit(image_path)
+                    if future is None:
+                        return
+                    running[future] = image_path
+                done, _ = wait(running, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    image_path = running.pop(future)
+                    if future.cancelled():
+                        # Cancelled by a worker this one replaced; still wanted here
+                        pending.appendleft(image_path)
+                    elif isinstance(future.exception(), BrokenExecutor):
+                        # A worker process died, taking every running job with it; the
+                        # next submit replaces the pool
+                        if image_path not in crashed:
+                            crashed.add(image_path)
+                            pending.appendleft(image_path)
+                    elif future.exception() is None and (thumb_path := future.result()):
+                        self.post_message(self.ThumbnailReady(image_path, thumb_path))
+                    else:
+                        self._failed.add(image_path)
+        finally:
+            if worker.is_cancelled:
+                for future in running:
+                    future.cancel()
+
+    def on_thumbnail_grid_thumbnail_ready(self, event: ThumbnailReady) -> None:
+        """Swap a cell's placeholder for its newly generated thumbnail."""
+        for slot, cell in enumerate(self._cells):
+            if not isinstance(cell, ThumbnailText) or cell.image_path != event.image_path:
+                continue
+            new_cell = create_thumbnail_cell(cell.image_path, cell.index)
+            new_cell.set_class(cell.index == self._selected_index, "selected")
+            self._cells[slot] = new_cell
+            assert self._window is not None
+            self._window.mount(new_cell, before=cell)
+            cell.remove()
+        if self._cache is not None:
+            self.run_worker(
+                lambda: self._mark_used([event.thumb_path]),
+                thread=True,
+                group="thumbnail-cache",
+                exit_on_error=False,
+            )
+
+    def _mark_used(self, thumb_paths: list[Path]) -> None:
+        """Record thumbnails as just viewed and evict old ones if over budget."""
+        cache = self._cache
+        if cache is None:
+            return
+        cache.record(thumb_paths)
+        cache.evict()
 
     def set_images(self, images: list[Path]) -> None:
         """Update the images displayed in the grid."""
@@ -205,17 +511,20 @@ class ThumbnailGrid(VerticalScroll, can_focus=True):
         self._calculate_columns()
         self._rebuild_grid()
 
+    def _update_selection_classes(self) -> None:
+        for cell in self._cells:
+            cell.set_class(cell.index == self._selected_index, "selected")  # type: ignore[union-attr]
+
     def _update_selection(self) -> None:
         """Update the visual selection state."""
-        for idx, cell in enumerate(self._cells):
-            if idx == self._selected_index:
-                cell.add_class("selected")
-            else:
-                cell.remove_class("selected")
-
-        # Scroll selected cell into view
-        if 0 <= self._selected_index < len(self._cells):
-            self._cells[self._selected_index].scroll_visible()
+        # Scroll selected cell into view; the window follows the scroll position
+        if 0 <= self._selected_index < len(self._images):
+            row = self._selected_index // self._columns
+            width = self._columns * self.CELL_WIDTH
+            region = Region(0, row * self.CELL_HEIGHT, width, self.CELL_HEIGHT)
+            self.scroll_to_region(region, animate=False)
+        self._update_window()
+        self._update_selection_classes()
 
     def _move_selection(self, delta: int) -> None:
         """Move selection by delta amount."""
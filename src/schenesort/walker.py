@@ -0,0 +1,146 @@
+"""Single-pass directory walking shared by the commands and the browser."""
+
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+VALID_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tiff", ".tif"}
+
+SIDECAR_SUFFIX = ".xmp"
+
+
+def is_image_name(name: str) -> bool:
+    """Check whether a file name has a supported image extension."""
+    return os.path.splitext(name)[1].lower() in VALID_IMAGE_EXTENSIONS
+
+
+def is_sidecar_name(name: str) -> bool:
+    """Check whether a file name is an XMP sidecar, in any letter case."""
+    return name.lower().endswith(SIDECAR_SUFFIX)
+
+
+class FileEntry:
+    """A file found while walking, with its sidecar looked up in the same listing.
+
+    stat() results are cached, and come from the directory entry where the
+    platform provides them, so each file is stat'ed at most once.
+    """
+
+    __slots__ = ("path", "_entry", "_sidecar", "_stat")
+
+    def __init__(
+        self,
+        path: Path,
+        entry: os.DirEntry[str] | None = None,
+        sidecar: os.DirEntry[str] | Path | None = None,
+    ) -> None:
+        self.path = path
+        self._entry = entry
+        self._sidecar = sidecar
+        self._stat: os.stat_result | None = None
+
+    @classmethod
+    def for_file(cls, path: Path) -> "FileEntry":
+        """Create an entry for a single file given directly rather than walked."""
+        sidecar = path.parent / f"{path.name}{SIDECAR_SUFFIX}"
+        return cls(path, sidecar=sidecar if sidecar.is_file() else None)
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def has_sidecar(self) -> bool:
+        return self._sidecar is not None
+
+    def stat(self) -> os.stat_result:
+        if self._stat is None:
+            self._stat = self._entry.stat() if self._entry is not None else self.path.stat()
+        return self._stat
+
+    def sidecar_mtime(self) -> float | None:
+        """Get the sidecar's modification time, or None when there is no sidecar."""
+        if self._sidecar is None:
+            return None
+        return self._sidecar.stat().st_mtime
+
+    def __repr__(self) -> str:
+        return f"FileEntry({str(self.path)!r}, has_sidecar={self.has_sidecar})"
+
+
+def scan_tree(root: Path, recursive: bool = False) -> Iterator[tuple[Path, dict[str, os.DirEntry]]]:
+    """Yield each directory with its regular files by name, one scandir call per directory.
+
+    Symlinked files are included, symlinked directories are not descended
+    into. Directories are visited in sorted order; unreadable ones are skipped.
+    """
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        files: dict[str, os.DirEntry] = {}
+        subdirs = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_file():
+                            files[entry.name] = entry
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        yield directory, files
+        if recursive:
+            pending.extend(directory / name for name in sorted(subdirs, reverse=True))
+
+
+def walk(root: Path, recursive: bool = False, images_only: bool = True) -> Iterator[FileEntry]:
+    """Yield the files below root in name order, directory by directory.
+
+    Sidecar files are never yielded themselves; they show up as has_sidecar
+    on their image. With images_only off every other file is yielded too.
+    """
+    for directory, files in scan_tree(root, recursive):
+        for name in sorted(files):
+            if is_sidecar_name(name):
+                continue
+            if images_only and not is_image_name(name):
+                continue
+            yield FileEntry(directory / name, files[name], files.get(f"{name}{SIDECAR_SUFFIX}"))
+
+
+def find_images(path: Path, recursive: bool = False) -> list[FileEntry]:
+    """Get the images at path, which may be a single file or a directory."""
+    if path.is_file():
+        return [FileEntry.for_file(path)] if is_image_name(path.name) else []
+    return list(walk(path, recursive))
+
+
+def find_files(path: Path, recursive: bool = False) -> list[FileEntry]:
+    """Get every file at path except sidecars, which may be a single file or a directory."""
+    if path.is_file():
+        return [FileEntry.for_file(path)]
+    return list(walk(path, recursive, images_only=False))
+
+
+def existing_paths(paths: Iterable[Path]) -> list[Path]:
+    """Keep the paths that still exist, in order, listing each directory once.
+
+    Meant for long lists of indexed files spread over a few folders, where
+    one listdir per folder is far cheaper than a stat per file.
+    """
+    listings: dict[Path, set[str]] = {}
+    result = []
+    for path in paths:
+        names = listings.get(path.parent)
+        if names is None:
+            try:
+                names = set(os.listdir(path.parent))
+            except OSError:
+                names = set()
+            listings[path.parent] = names
+        if path.name in names:
+            result.append(path)
+    return result
@@ -0,0 +1,319 @@
+"""Watching a collection for changes and keeping the index up to date."""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+from schenesort.db import WallpaperDB
+from schenesort.walker import (
+    SIDECAR_SUFFIX,
+    VALID_IMAGE_EXTENSIONS,
+    is_image_name,
+    is_sidecar_name,
+    walk,
+)
+from schenesort.xmp import read_xmp
+
+# Seconds without new events before a burst of changes is applied
+DEFAULT_DEBOUNCE = 1.0
+
+# Apply anyway after this long, so a long copy still shows up while it runs
+MAX_DELAY = 10.0
+
+# Seconds between rescans when polling
+DEFAULT_POLL_INTERVAL = 2.0
+
+# Images written per transaction, small enough not to block gallery readers
+WATCH_BATCH_SIZE = 200
+
+# inotify(7) event flags
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class Watcher(Protocol):
+    """Source of changed paths below a root directory."""
+
+    def changes(self, timeout: float | None) -> set[Path]:
+        """Wait up to timeout seconds (None: the watcher's own pace) for changed paths."""
+        ...
+
+    def close(self) -> None: ...
+
+
+def _is_relevant(name: str) -> bool:
+    """Check whether a file name is an image or a sidecar."""
+    if is_sidecar_name(name):
+        name = name[: -len(SIDECAR_SUFFIX)]
+    return is_image_name(name)
+
+
+class InotifyWatcher:
+    """Recursive watch using Linux inotify through libc.
+
+    New and moved-in directories are watched as they appear, and reported
+    as a whole so their contents get indexed. A queue overflow reports the
+    root, which makes the next update rescan everything.
+    """
+
+    def __init__(self, root: Path, recursive: bool = True) -> None:
+        self.root = root
+        self.recursive = recursive
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+        self._add_tree(root)
+
+    def _add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK | IN_ONLYDIR)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            if directory == self.root:
+                raise OSError(errno, f"Cannot watch {directory}: {os.strerror(errno)}")
+            return
+        # Re-adding a moved directory returns its existing descriptor; update the path
+        self._dirs[wd] = directory
+
+    def _add_tree(self, directory: Path) -> None:
+        self._add_watch(directory)
+        if not self.recursive:
+            return
+        for dirpath, dirnames, _ in os.walk(directory):
+            for name in dirnames:
+                self._add_watch(Path(dirpath) / name)
+
+    def _remove_tree(self, directory: Path) -> None:
+        for wd, watched in list(self._dirs.items()):
+            if watched == directory or watched.is_relative_to(directory):
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._dirs[wd]
+
+    def changes(self, timeout: float | None) -> set[Path]:
+        # None blocks until something happens
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed: set[Path] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+                self._handle(wd, mask, name, changed)
+        return changed
+
+    def _handle(self, wd: int, mask: int, name: str, changed: set[Path]) -> None:
+        if mask & IN_Q_OVERFLOW:
+            changed.add(self.root)
+            return
+        if mask & IN_IGNORED:
+            self._dirs.pop(wd, None)
+            return
+        directory = self._dirs.get(wd)
+        if directory is None or not name:
+            return
+
+        path = directory / name
+        if mask & IN_ISDIR:
+            if mask & (IN_CREATE | IN_MOVED_TO) and self.recursive:
+                self._add_tree(path)
+                changed.add(path)
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                # Stop watching; a move within the tree is picked up again by its IN_MOVED_TO
+                self._remove_tree(path)
+                changed.add(path)
+        elif _is_relevant(name):
+            changed.add(path)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """Fallback watch that rescans the tree and compares stat snapshots."""
+
+    def __init__(
+        self, root: Path, recursive: bool = True, interval: float = DEFAULT_POLL_INTERVAL
+    ) -> None:
+        self.root = root
+        self.recursive = recursive
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            if not self.recursive:
+                dirnames.clear()
+            for name in filenames:
+                if not _is_relevant(name):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def changes(self, timeout: float | None) -> set[Path]:
+        # None waits a full interval
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        snapshot = self._scan()
+        old = self._snapshot
+        self._snapshot = snapshot
+        changed = {p for p, sig in snapshot.items() if old.get(p) != sig}
+        changed.update(p for p in old if p not in snapshot)
+        return {Path(p) for p in changed}
+
+    def close(self) -> None:
+        pass
+
+
+def open_watcher(root: Path, recursive: bool = True, poll: bool = False) -> Watcher:
+    """Watch root with inotify where available, otherwise by polling."""
+    if not poll:
+        try:
+            return InotifyWatcher(root, recursive)
+        except (OSError, AttributeError):
+            # Not Linux, or out of inotify instances or watches
+            pass
+    return PollingWatcher(root, recursive)
+
+
+@dataclass
+class UpdateResult:
+    """What one batch of changes did to the index."""
+
+    indexed: int = 0
+    removed: int = 0
+    thumbnails: int = 0
+
+
+class IndexUpdater:
+    """Apply changed paths to the index, and optionally the thumbnail cache."""
+
+    def __init__(self, db: WallpaperDB, recursive: bool = True, thumbnails: bool = False) -> None:
+        self.db = db
+        self.recursive = recursive
+        self.thumbnails = thumbnails
+
+    def _images_in(self, directory: Path) -> list[Path]:
+        return [entry.path for entry in walk(directory, self.recursive)]
+
+    def apply(self, changed: set[Path]) -> UpdateResult:
+        """Re-read every image touched by changed and write the result to the index."""
+        images: set[Path] = set()
+        touched_files: set[Path] = set()
+        gone: set[str] = set()
+
+        for path in changed:
+            if path.suffix.lower() == ".xmp":
+                images.add(path.with_suffix(""))
+            elif path.suffix.lower() in VALID_IMAGE_EXTENSIONS:
+                images.add(path)
+                touched_files.add(path)
+            elif path.is_dir():
+                # New or moved-in directory, or a full rescan after an overflow
+                present = self._images_in(path)
+                images.update(present)
+                touched_files.update(present)
+                gone.update(set(self.db.paths_under(path)) - {str(p) for p in present})
+            else:
+                # Directory deleted or moved away
+                gone.update(self.db.paths_under(path))
+
+        to_index = []
+        for image in sorted(images):
+            if image.is_file() and (image.parent / f"{image.name}.xmp").is_file():
+                to_index.append(image)
+            else:
+                # Image gone, or its metadata removed
+                gone.add(str(image))
+
+        result = UpdateResult()
+        result.indexed = self.db.index_many(
+            ((image, read_xmp(image)) for image in to_index), batch_size=WATCH_BATCH_SIZE
+        )
+        if gone:
+            result.removed = self.db.remove_paths(gone)
+
+        if self.thumbnails:
+            from schenesort.thumbnails import (
+                generate_thumbnail,
+                get_thumbnail_cache,
+                thumbnail_exists,
+            )
+
+            generated = []
+            for image in sorted(touched_files):
+                if image.is_file() and not thumbnail_exists(image):
+                    thumb_path = generate_thumbnail(image)
+                    if thumb_path:
+                        generated.append(thumb_path)
+            if generated:
+                with get_thumbnail_cache() as cache:
+                    cache.record(generated)
+                    cache.evict()
+            result.thumbnails = len(generated)
+        return result
+
+
+def run(
+    watcher: Watcher,
+    updater: IndexUpdater,
+    debounce: float = DEFAULT_DEBOUNCE,
+    on_update: Callable[[UpdateResult], None] | None = None,
+    should_stop: Callable[[], bool] = lambda: False,
+) -> None:
+    """Collect changes until they settle for debounce seconds, then apply them.
+
+    Runs until should_stop returns true or the process is interrupted.
+    """
+    pending: set[Path] = set()
+    first_event = last_event = 0.0
+
+    while not should_stop():
+        changed = watcher.changes(debounce if pending else None)
+        now = time.monotonic()
+        if changed:
+            if not pending:
+                first_event = now
+            pending |= changed
+            last_event = now
+
+        if pending and (now - last_event >= debounce or now - first_event >= MAX_DELAY):
+            result = updater.apply(pending)
+            pending = set()
+            if on_update is not None:
+                on_update(result)
@@ -118,6 +118,54 @@ class TestSanitizeCommand:
         assert "Renamed 0 file(s)" in result.stdout
 
 
+class TestValidateCommand:
+    """Tests for the validate CLI command."""
+
+    def _make_files(self, directory):
+        from PIL import Image
+
+        for i in range(6):
+            Image.new("RGB", (8, 8)).save(directory / f"{i}.jpg")
+        Image.new("RGB", (8, 8)).save(directory / "wrong.jpg", format="PNG")
+        Image.new("RGB", (8, 8)).save(directory / "ok.png")
+        (directory / "text.gif").write_text("not an image")
+
+    def test_parallel_report_is_ordered(self, temp_dir):
+        self._make_files(temp_dir)
+
+        serial = runner.invoke(app, ["validate", str(temp_dir)])
+        parallel = runner.invoke(app, ["validate", str(temp_dir), "--jobs", "4"])
+
+        assert serial.exit_code == parallel.exit_code == 0
+        assert parallel.stdout == serial.stdout
+        assert f"[INVALID] {temp_dir / 'wrong.jpg'} (actual: .png)" in parallel.stdout
+        assert "Not images: 1" in parallel.stdout
+
+    def test_json_summary(self, temp_dir):
+        import json
+
+        self._make_files(temp_dir)
+
+        result = runner.invoke(app, ["validate", str(temp_dir), "--json", "-j", "2", "--fix"])
+
+        assert result.exit_code == 0
+        summary = json.loads(result.stdout)
+        assert summary["files"] == 9
+        assert (summary["valid"], summary["invalid"], summary["not_images"]) == (7, 1, 1)
+        assert summary["fixed"] == 1
+        assert summary["formats"] == {".jpg": 6, ".png": 2}
+        assert summary["invalid_files"] == [
+            {
+                "path": str(temp_dir / "wrong.jpg"),
+                "actual": ".png",
+                "fixed": str(temp_dir / "wrong.png"),
+            }
+        ]
+        assert summary["not_image_files"] == [str(temp_dir / "text.gif")]
+        assert summary["elapsed_seconds"] >= 0
+        assert (temp_dir / "wrong.png").exists()
+
+
 class TestInfoCommand:
     """Tests for the info CLI command."""
 
@@ -149,3 +197,442 @@ class TestInfoCommand:
 
         assert result.exit_code == 1
         assert "does not exist" in result.output
+
+
+class TestThumbnailCommand:
+    """Tests for the thumbnail CLI command."""
+
+    def _make_images(self, directory, count):
+        from PIL import Image
+
+        directory.mkdir()
+        for i in range(count):
+            Image.new("RGB", (640, 400), color=(i * 20, 0, 0)).save(directory / f"img{i}.jpg")
+        (directory / "broken.png").write_bytes(b"not an image")
+
+    @pytest.mark.parametrize("jobs", ["1", "2"])
+    def test_thumbnail_counts(self, temp_dir, jobs):
+        """Test generated/failed totals with serial and parallel workers."""
+        images = temp_dir / "images"
+        self._make_images(images, 4)
+
+        result = runner.invoke(app, ["thumbnail", str(images), "--jobs", jobs])
+
+        assert result.exit_code == 0
+        assert "Generated: 4, Skipped: 0, Failed: 1" in result.stdout
+
+    def test_thumbnail_skips_existing(self, temp_dir):
+        """Test that a second run skips up-to-date thumbnails."""
+        images = temp_dir / "images"
+        self._make_images(images, 3)
+
+        runner.invoke(app, ["thumbnail", str(images), "--jobs", "2"])
+        result = runner.invoke(app, ["thumbnail", str(images), "--jobs", "2"])
+
+        assert result.exit_code == 0
+        assert "Generated: 0, Skipped: 3, Failed: 1" in result.stdout
+
+    def test_thumbnail_reports_budget(self, temp_dir):
+        """Test that the cache limit is shown, and an unlimited budget says so."""
+        from schenesort.config import get_config_path
+
+        images = temp_dir / "images"
+        self._make_images(images, 1)
+
+        result = runner.invoke(app, ["thumbnail", str(images), "--jobs", "1"])
+        assert "(limit 4096 MB)" in result.stdout
+
+        config_path = get_config_path()
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+        config_path.write_text("[cache]\nthumbnail_max_mb = 0\n")
+        result = runner.invoke(app, ["thumbnail", str(images), "--jobs", "1"])
+        assert "(no limit)" in result.stdout
+
+
+class TestUpdateDimensionsCommand:
+    """Tests for the metadata update-dimensions CLI command."""
+
+    def test_rerun_leaves_sidecars_untouched(self, temp_dir):
+        from PIL import Image
+
+        from schenesort.xmp import ImageMetadata, get_xmp_path, write_xmp
+
+        for name in ("a.jpg", "b.jpg"):
+            Image.new("RGB", (64, 32)).save(temp_dir / name)
+            write_xmp(temp_dir / name, ImageMetadata(description=name))
+
+        first = runner.invoke(app, ["metadata", "update-dimensions", str(temp_dir), "-j", "2"])
+        assert first.exit_code == 0
+        assert "Updated 2 sidecar(s), skipped 0." in first.stdout
+
+        mtime = get_xmp_path(temp_dir / "a.jpg").stat().st_mtime_ns
+        second = runner.invoke(app, ["metadata", "update-dimensions", str(temp_dir)])
+        assert second.exit_code == 0
+        assert "Updated 0 sidecar(s), 2 already up to date, skipped 0." in second.stdout
+        assert get_xmp_path(temp_dir / "a.jpg").stat().st_mtime_ns == mtime
+
+
+class TestMetadataGenerateCommand:
+    """Tests for the metadata generate CLI command (Ollama stubbed out)."""
+
+    @pytest.fixture
+    def images(self, temp_dir):
+        from PIL import Image
+
+        for name in ("a.jpg", "b.jpg", "c.jpg", "d.jpg"):
+            Image.new("RGB", (64, 32)).save(temp_dir / name)
+        return temp_dir
+
+    @pytest.fixture
+    def fake_analyze(self, monkeypatch):
+        import threading
+        import time
+
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def analyze(filepath, model, use_cpu=False, host=None, **kwargs):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return {"description": "same description", "tags": [filepath.stem]}
+
+        monkeypatch.setattr("schenesort.cli.analyze_image", analyze)
+        return lambda: peak
+
+    def test_concurrent_generate_renames_in_order(self, images, fake_analyze):
+        from schenesort.xmp import read_xmp
+
+        result = runner.invoke(
+            app, ["metadata", "generate", str(images), "--concurrency", "3", "--model", "m"]
+        )
+
+        assert result.exit_code == 0
+        assert fake_analyze() > 1
+        assert "Generated metadata for 4 file(s), skipped 0." in result.stdout
+        assert "images/s" in result.stdout
+        # Collisions are resolved in input order, so names are predictable
+        expected = ["same_description.jpg"] + [f"same_description_{i}.jpg" for i in (1, 2, 3)]
+        for name in expected:
+            assert (images / name).exists()
+        tags = sorted(read_xmp(images / name).tags[0] for name in expected)
+        assert tags == ["a", "b", "c", "d"]
+
+    def test_generate_skips_existing(self, images, fake_analyze):
+        from schenesort.xmp import ImageMetadata, write_xmp
+
+        write_xmp(images / "a.jpg", ImageMetadata(description="done"))
+
+        result = runner.invoke(
+            app, ["metadata", "generate", str(images), "-c", "2", "--no-rename", "--model", "m"]
+        )
+
+        assert result.exit_code == 0
+        assert "Skipping: a.jpg" in result.stdout
+        assert "Generated metadata for 3 file(s), skipped 1." in result.stdout
+
+
+class TestEncodeImage:
+    """Tests for preparing images before they are sent to the vision model."""
+
+    def _decode(self, data):
+        import base64
+        import io
+
+        from PIL import Image
+
+        return Image.open(io.BytesIO(base64.b64decode(data)))
+
+    def test_large_image_is_downscaled_to_jpeg(self, temp_dir):
+        from PIL import Image
+
+        from schenesort.cli import encode_image
+
+        source = temp_dir / "huge.png"
+        Image.new("RGBA", (4000, 2000), color=(10, 20, 30, 255)).save(source)
+
+        img = self._decode(encode_image(source, max_size=1024))
+
+        assert img.format == "JPEG"
+        assert img.size == (1024, 512)
+
+    def test_small_image_sent_unchanged(self, temp_dir):
+        import base64
+
+        from PIL import Image
+
+        from schenesort.cli import encode_image
+
+        source = temp_dir / "small.png"
+        Image.new("RGB", (800, 600)).save(source)
+
+        assert base64.b64decode(encode_image(source, max_size=1024)) == source.read_bytes()
+
+    def test_resize_disabled_sends_original(self, temp_dir):
+        import base64
+
+        from PIL import Image
+
+        from schenesort.cli import encode_image
+
+        source = temp_dir / "huge.png"
+        Image.new("RGB", (3000, 2000)).save(source)
+
+        assert base64.b64decode(encode_image(source, max_size=None)) == source.read_bytes()
+
+    def test_unreadable_file_sent_unchanged(self, temp_dir):
+        import base64
+
+        from schenesort.cli import encode_image
+
+        source = temp_dir / "odd.jpg"
+        source.write_bytes(b"not really an image")
+
+        assert base64.b64decode(encode_image(source)) == b"not really an image"
+
+
+class TestInferenceCache:
+    """Tests for reusing vision model responses across runs."""
+
+    @pytest.fixture
+    def fake_chat(self, monkeypatch):
+        calls = []
+
+        class FakeClient:
+            def __init__(self, host=None, **kwargs):
+                pass
+
+            def chat(self, model, messages, options):
+                calls.append(model)
+                return {"message": {"content": "Description: red square\nTags: red, square"}}
+
+            def close(self):
+                pass
+
+        monkeypatch.setattr("schenesort.ollama_pool.ollama.Client", FakeClient)
+        return calls
+
+    def test_hit_survives_rename(self, temp_dir, fake_chat):
+        from PIL import Image
+
+        from schenesort.cli import analyze_image
+        from schenesort.inference_cache import InferenceCache
+
+        source = temp_dir / "a.png"
+        Image.new("RGB", (8, 8), color="red").save(source)
+
+        with InferenceCache() as cache:
+            first = analyze_image(source, "m", host="http://x", cache=cache)
+            moved = source.rename(temp_dir / "moved.png")
+            second = analyze_image(moved, "m", host="http://x", cache=cache)
+            other_model = analyze_image(moved, "other", host="http://x", cache=cache)
+
+        assert first == second == other_model
+        assert first["tags"] == ["red", "square"]
+        assert fake_chat == ["m", "other"]
+
+    def test_no_cache_always_queries(self, temp_dir, fake_chat):
+        from PIL import Image
+
+        from schenesort.cli import describe_image
+
+        source = temp_dir / "a.png"
+        Image.new("RGB", (8, 8)).save(source)
+
+        describe_image(source, "m", host="http://x")
+        describe_image(source, "m", host="http://x")
+
+        assert fake_chat == ["m", "m"]
+
+    def test_evicts_least_recently_used(self, temp_dir):
+        from schenesort.inference_cache import InferenceCache
+
+        with InferenceCache(temp_dir / "c.db", max_entries=3) as cache:
+            for name in ("a", "b", "c"):
+                cache.put(name, "m", "prompt", name)
+            cache.get("a", "m", "prompt")
+            cache.put("d", "m", "prompt", "d")
+
+            assert len(cache) <= 3
+            assert cache.get("a", "m", "prompt") == "a"
+            assert cache.get("b", "m", "prompt") is None
+
+
+class TestIndexCommand:
+    """Tests for the index command."""
+
+    def test_reindex_parses_only_changed_sidecars(self, temp_dir, monkeypatch):
+        import os
+
+        from schenesort import xmp
+        from schenesort.xmp import ImageMetadata, get_xmp_path, write_xmp
+
+        for name in ("a.jpg", "b.jpg", "c.jpg"):
+            (temp_dir / name).write_bytes(b"")
+            write_xmp(temp_dir / name, ImageMetadata(description=f"picture {name[0]}"))
+        (temp_dir / "bare.jpg").write_bytes(b"")
+
+        first = runner.invoke(app, ["index", str(temp_dir)])
+        assert first.exit_code == 0
+        assert "Indexed 3 wallpaper(s) with metadata (3 parsed, 0 unchanged)." in first.stdout
+
+        parsed = []
+        original_read_xmp = xmp.read_xmp
+
+        def counting_read_xmp(path):
+            parsed.append(path.name)
+            return original_read_xmp(path)
+
+        monkeypatch.setattr("schenesort.xmp.read_xmp", counting_read_xmp)
+        write_xmp(temp_dir / "b.jpg", ImageMetadata(description="changed"))
+        sidecar = get_xmp_path(temp_dir / "b.jpg")
+        os.utime(sidecar, (sidecar.stat().st_atime, sidecar.stat().st_mtime + 10))
+
+        second = runner.invoke(app, ["index", str(temp_dir)])
+        assert second.exit_code == 0
+        assert "Indexed 3 wallpaper(s) with metadata (1 parsed, 2 unchanged)." in second.stdout
+        assert parsed == ["b.jpg"]
+
+        result = runner.invoke(app, ["get", "-q", "changed", "-p"])
+        assert result.stdout.strip() == str(temp_dir / "b.jpg")
+
+    def test_parallel_read(self, temp_dir):
+        from schenesort.xmp import ImageMetadata, write_xmp
+
+        for i in range(20):
+            (temp_dir / f"{i:02}.jpg").write_bytes(b"")
+            write_xmp(temp_dir / f"{i:02}.jpg", ImageMetadata(description=f"picture {i}"))
+
+        result = runner.invoke(app, ["index", str(temp_dir), "--jobs", "4"])
+        assert result.exit_code == 0
+        assert "Indexed 20 wallpaper(s) with metadata (20 parsed, 0 unchanged)." in result.stdout
+
+        result = runner.invoke(app, ["get", "-q", "picture 7", "-p"])
+        assert result.stdout.strip() == str(temp_dir / "07.jpg")
+
+
+class TestMultipleHosts:
+    """Tests for spreading requests over several Ollama hosts."""
+
+    def test_generate_fails_over_to_healthy_host(self, temp_dir, monkeypatch):
+        from PIL import Image
+
+        used = []
+
+        class FakeClient:
+            def __init__(self, host=None, **kwargs):
+                self.host = host
+
+            def close(self):
+                pass
+
+            def chat(self, model, messages, options):
+                used.append(self.host)
+                if self.host == "http://down:11434":
+                    raise ConnectionError("connection refused")
+                return {"message": {"content": "Description: red square"}}
+
+        monkeypatch.setattr("schenesort.ollama_pool.ollama.Client", FakeClient)
+        for name in ("a.png", "b.png", "c.png"):
+            Image.new("RGB", (8, 8), color="red").save(temp_dir / name)
+
+        result = runner.invoke(
+            app,
+            [
+                "metadata",
+                "generate",
+                str(temp_dir),
+                "--no-rename",
+                "--no-cache",
+                "-H",
+                "http://down:11434",
+                "-H",
+                "http://up:11434",
+            ],
+        )
+
+        assert result.exit_code == 0
+        assert "Generated metadata for 3 file(s), skipped 0." in result.stdout
+        assert used.count("http://down:11434") == 1
+        assert "http://up:11434: 3 ok, 0 failed" in result.stdout
+        assert "http://down:11434: 0 ok, 1 failed" in result.stdout
+
+    def test_hosts_from_config(self, monkeypatch):
+        from schenesort.cli import get_ollama_hosts
+        from schenesort.config import get_config_path
+
+        assert get_ollama_hosts() == [None]
+        assert get_ollama_hosts(["http://x:11434"]) == ["http://x:11434"]
+
+        config_path = get_config_path()
+        config_path.parent.mkdir(parents=True)
+        config_path.write_text('[ollama]\nhosts = ["http://a:11434", "http://b:11434"]\n')
+        assert get_ollama_hosts() == ["http://a:11434", "http://b:11434"]
+
+
+class TestMetadataGenerateResume:
+    """Tests for resuming metadata generate from the run journal."""
+
+    @pytest.fixture
+    def images(self, temp_dir):
+        from PIL import Image
+
+        for name in ("a.jpg", "b.jpg", "c.jpg"):
+            Image.new("RGB", (16, 16)).save(temp_dir / name)
+        return temp_dir
+
+    def test_resume_skips_done_and_retries_failed(self, images, monkeypatch):
+        calls = []
+
+        def analyze(filepath, model, **kwargs):
+            calls.append(filepath.name)
+            if filepath.name == "b.jpg":
+                return None
+            return {"description": f"{filepath.stem} renamed"}
+
+        monkeypatch.setattr("schenesort.cli.analyze_image", analyze)
+        args = ["metadata", "generate", str(images), "--model", "m"]
+
+        first = runner.invoke(app, args)
+        assert first.exit_code == 0
+        assert sorted(calls) == ["a.jpg", "b.jpg", "c.jpg"]
+
+        # Sidecars are not parsed again for files finished in the first run
+        from schenesort.xmp import read_xmp
+
+        parsed = []
+        calls.clear()
+        monkeypatch.setattr(
+            "schenesort.cli.read_xmp", lambda p: parsed.append(p.name) or read_xmp(p)
+        )
+        retry = runner.invoke(app, [*args, "--retry-failed"])
+
+        assert retry.exit_code == 0
+        assert "1 failed" in retry.stdout
+        assert calls == ["b.jpg"]
+        assert parsed == ["b.jpg"]
+
+    def test_resume_processes_remaining(self, images, monkeypatch):
+        from schenesort.journal import RunJournal
+
+        with RunJournal(images) as journal:
+            journal.start(sorted(images.glob("*.jpg")))
+            journal.mark_done(images / "a.jpg", images / "a.jpg")
+
+        calls = []
+
+        def analyze(filepath, model, **kwargs):
+            calls.append(filepath.name)
+            return {"description": filepath.stem}
+
+        monkeypatch.setattr("schenesort.cli.analyze_image", analyze)
+        result = runner.invoke(app, ["metadata", "generate", str(images), "-m", "m", "--resume"])
+
+        assert result.exit_code == 0
+        assert sorted(calls) == ["b.jpg", "c.jpg"]
+        assert "Skipped 1 file(s) completed in the previous run." in result.stdout
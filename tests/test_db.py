@@ -0,0 +1,223 @@
+"""Tests for the wallpaper index database."""
+
+import sqlite3
+
+import pytest
+
+from schenesort.db import WallpaperDB, build_fts_query, parse_search
+from schenesort.xmp import ImageMetadata
+
+
+def _add(db, tmp_path, name, **fields):
+    db.index_image(tmp_path / name, ImageMetadata(**fields))
+
+
+@pytest.fixture
+def db(tmp_path):
+    with WallpaperDB(tmp_path / "index.db") as db:
+        _add(db, tmp_path, "peaks.jpg", description="mountain sunset", scene="Snowy peaks at dusk")
+        _add(db, tmp_path, "city.jpg", description="neon city night", style="digital art")
+        _add(db, tmp_path, "lake.jpg", description="calm lake", scene="A mountain lake at dawn")
+        _add(db, tmp_path, "ship.jpg", description="sci-fi space ship", subject="space")
+        db.commit()
+        yield db
+
+
+def _names(results):
+    return [r["filename"] for r in results]
+
+
+class TestParseSearch:
+    """Tests for turning search text into FTS5 queries."""
+
+    def test_words_are_prefix_terms(self):
+        assert build_fts_query(parse_search("Mount sun")) == '"mount"* AND "sun"*'
+
+    def test_quoted_phrase_is_exact(self):
+        assert build_fts_query(parse_search('"neon city" art')) == '"neon city" AND "art"*'
+
+    def test_syntax_characters_are_not_operators(self):
+        assert build_fts_query(parse_search("sci-fi OR desc:*")) == (
+            '"sci fi"* AND "or"* AND "desc"*'
+        )
+        assert parse_search('" ! "') == []
+
+
+class TestSearch:
+    """Tests for full-text search in query()."""
+
+    def test_prefix_match(self, db):
+        assert _names(db.query(search="mount")) == ["peaks.jpg", "lake.jpg"]
+
+    def test_all_terms_must_match(self, db):
+        assert _names(db.query(search="mountain dawn")) == ["lake.jpg"]
+
+    def test_phrase(self, db):
+        assert _names(db.query(search='"city night"')) == ["city.jpg"]
+        assert db.query(search='"night city"') == []
+
+    def test_ranks_description_matches_first(self, db):
+        # Both mention mountain; the description hit outranks the scene hit
+        assert _names(db.query(search="mountain"))[0] == "peaks.jpg"
+
+    def test_hyphenated_word(self, db):
+        assert _names(db.query(search="sci-fi")) == ["ship.jpg"]
+
+    def test_combined_with_filters_and_limit(self, db):
+        assert _names(db.query(search="space", subject="space")) == ["ship.jpg"]
+        assert len(db.query(search="mountain", limit=1)) == 1
+
+    def test_reindex_and_prune_keep_index_in_sync(self, db, tmp_path):
+        db.conn.execute("UPDATE wallpapers SET mtime = -1 WHERE filename = 'city.jpg'")
+        _add(db, tmp_path, "city.jpg", description="rainy street")
+        assert db.query(search="neon") == []
+        assert _names(db.query(search="rainy")) == ["city.jpg"]
+
+        db.prune({str(tmp_path / "city.jpg")})
+        assert db.query(search="mountain") == []
+        assert _names(db.query(search="street")) == ["city.jpg"]
+
+        db.clear()
+        assert db.query(search="street") == []
+
+    def test_existing_database_is_backfilled(self, tmp_path):
+        db_path = tmp_path / "old.db"
+        with WallpaperDB(db_path) as db:
+            _add(db, tmp_path, "peaks.jpg", description="mountain sunset")
+            db.commit()
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE wallpapers_fts")
+        conn.close()
+
+        with WallpaperDB(db_path) as db:
+            assert _names(db.query(search="mount")) == ["peaks.jpg"]
+
+    def test_fallback_without_fts(self, db):
+        db.has_fts = False
+        assert _names(db.query(search="mountain dawn")) == ["lake.jpg"]
+        assert _names(db.query(search="ountain")) == ["lake.jpg", "peaks.jpg"]
+
+    def test_fallback_keeps_punctuation(self, db, tmp_path):
+        _add(db, tmp_path, "cafe.jpg", description="it's raining")
+        db.has_fts = False
+        assert _names(db.query(search="sci-fi")) == ["ship.jpg"]
+        assert _names(db.query(search="it's")) == ["cafe.jpg"]
+
+    def test_punctuation_only_matches_nothing(self, db):
+        for has_fts in (True, False):
+            db.has_fts = has_fts
+            assert db.query(search="!!") == []
+            assert db.query(search='" ! "') == []
+
+
+class TestIndexMany:
+    """Tests for bulk index writes."""
+
+    def _items(self, tmp_path, count, description="sunset"):
+        return [
+            (
+                tmp_path / f"{i:04}.jpg",
+                ImageMetadata(
+                    description=f"{description} {i}",
+                    tags=["sky", f"t{i}"],
+                    mood=["calm"],
+                    colors=["red", "blue"],
+                ),
+            )
+            for i in range(count)
+        ]
+
+    def test_writes_rows_and_children(self, tmp_path):
+        with WallpaperDB(tmp_path / "index.db") as db:
+            assert db.index_many(self._items(tmp_path, 25), batch_size=10) == 25
+            assert db.stats()["total_wallpapers"] == 25
+            assert db.stats()["top_tags"]["sky"] == 25
+            assert len(db.query(color="blue")) == 25
+            assert _names(db.query(tag="t7")) == ["0007.jpg"]
+
+    def test_unchanged_entries_skipped(self, tmp_path):
+        with WallpaperDB(tmp_path / "index.db") as db:
+            db.index_many(self._items(tmp_path, 5))
+            assert db.index_many(self._items(tmp_path, 5, description="other")) == 0
+            assert db.query(search="other") == []
+
+    def test_changed_entries_replaced(self, tmp_path):
+        with WallpaperDB(tmp_path / "index.db") as db:
+            db.index_many(self._items(tmp_path, 5))
+            db.conn.execute("UPDATE wallpapers SET mtime = -1")
+            assert db.index_many(self._items(tmp_path, 5, description="dawn")) == 5
+            assert db.stats()["total_wallpapers"] == 5
+            assert db.stats()["top_tags"]["sky"] == 5
+            assert db.query(search="sunset") == []
+
+    def test_duplicate_paths_in_batch(self, tmp_path):
+        with WallpaperDB(tmp_path / "index.db") as db:
+            items = self._items(tmp_path, 2) + self._items(tmp_path, 2, description="later")
+            assert db.index_many(items) == 2
+            assert len(db.query(search="later")) == 2
+
+    def test_committed_per_batch(self, tmp_path):
+        with WallpaperDB(tmp_path / "index.db") as db:
+            db.index_many(self._items(tmp_path, 3))
+            assert not db.conn.in_transaction
+            assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+class TestGetMetadata:
+    """Tests for reading full metadata records back."""
+
+    def test_round_trip(self, tmp_path):
+        metadata = ImageMetadata(
+            description="Harbour, at dusk",
+            scene="Boats; lights",
+            tags=["sea", "boats, small", "night"],
+            mood=["calm"],
+            style="photography",
+            colors=["blue", "orange"],
+            time_of_day="dusk",
+            subject="harbour",
+            source="camera",
+            ai_model="llava",
+            width=3840,
+            height=2160,
+            recommended_screen="4K",
+        )
+        with WallpaperDB(tmp_path / "index.db") as db:
+            db.index_image(tmp_path / "harbour.jpg", metadata)
+            db.index_image(tmp_path / "bare.jpg", ImageMetadata())
+            db.commit()
+
+            result = db.get_metadata([tmp_path / "harbour.jpg", str(tmp_path / "bare.jpg")])
+
+        assert result[str(tmp_path / "harbour.jpg")] == metadata
+        assert result[str(tmp_path / "bare.jpg")] == ImageMetadata()
+
+    def test_unindexed_paths_left_out(self, db, tmp_path):
+        paths = [tmp_path / "peaks.jpg", tmp_path / "missing.jpg"]
+        assert list(db.get_metadata(paths)) == [str(tmp_path / "peaks.jpg")]
+
+    def test_many_paths(self, tmp_path):
+        items = TestIndexMany()._items(tmp_path, 2000)
+        with WallpaperDB(tmp_path / "index.db") as db:
+            db.index_many(items)
+            result = db.get_metadata(path for path, _ in items)
+
+        assert len(result) == 2000
+        assert result[str(tmp_path / "1234.jpg")] == items[1234][1]
+
+
+class TestReadOnly:
+    """Tests for the read-only connection the browsers query through."""
+
+    def test_queries_without_writing(self, db):
+        with WallpaperDB(db.db_path, read_only=True) as ro:
+            assert ro.has_fts == db.has_fts
+            assert _names(ro.query(search="mountain")) == _names(db.query(search="mountain"))
+            with pytest.raises(sqlite3.OperationalError):
+                ro.conn.execute("DELETE FROM wallpapers")
+
+    def test_missing_database_not_created(self, tmp_path):
+        path = tmp_path / "missing" / "index.db"
+        with pytest.raises(sqlite3.OperationalError):
+            WallpaperDB(path, read_only=True).connect()
+        assert not path.parent.exists()
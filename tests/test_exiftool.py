@@ -0,0 +1,163 @@
+"""Tests for the persistent exiftool session, against a stand-in exiftool."""
+
+import json
+import sys
+import textwrap
+
+import pytest
+from typer.testing import CliRunner
+
+from schenesort.cli import app
+from schenesort.exiftool import ExifTool, ExifToolError, ExifToolPool, parse_result
+
+runner = CliRunner()
+
+# Speaks enough of exiftool's -stay_open protocol: records each command's
+# arguments next to the target file, and fails like exiftool for missing files
+FAKE_EXIFTOOL = f"""\
+#!{sys.executable}
+import json, os, sys
+
+args = []
+for line in sys.stdin:
+    line = line.rstrip("\\n")
+    if line.startswith("#[CSTR]"):
+        line = line[7:].encode().decode("unicode_escape")
+    if args[-1:] == ["-stay_open"] and line == "False":
+        sys.exit(0)
+    if not line.startswith("-execute"):
+        args.append(line)
+        continue
+    number = line[len("-execute"):]
+    echo = args[args.index("-echo4") + 1] if "-echo4" in args else ""
+    target = args[args.index("-echo4") - 1]
+    if "-crash" in args:
+        sys.exit(1)
+    if os.path.exists(target):
+        with open(target + ".args", "w") as f:
+            json.dump(args[: args.index("-echo4")], f)
+        print("    1 image files updated")
+    else:
+        print("Error: File not found - " + target, file=sys.stderr)
+        print("    0 image files updated")
+        print("    1 files weren't updated due to errors")
+    print("{{ready" + number + "}}", flush=True)
+    print(echo, file=sys.stderr, flush=True)
+    args = []
+"""
+
+
+@pytest.fixture
+def exiftool(tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "exiftool"
+    script.write_text(FAKE_EXIFTOOL)
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}:/usr/bin:/bin")
+    return str(script)
+
+
+class TestParseResult:
+    """Tests for reading exiftool's messages."""
+
+    def test_success_with_warning(self):
+        result = parse_result("    1 image files updated\n", "Warning: [minor] Odd IPTC\n")
+        assert result.ok
+        assert result.warnings == ["Warning: [minor] Odd IPTC"]
+
+    def test_error_line(self):
+        result = parse_result("    0 image files updated\n", "Error: File not found - x.jpg\n")
+        assert not result.ok
+        assert result.message == "Error: File not found - x.jpg"
+
+    def test_failed_summary_without_message(self):
+        result = parse_result("    1 files weren't updated due to errors\n", "")
+        assert result.errors == ["1 files weren't updated due to errors"]
+
+
+class TestExifTool:
+    """Tests for one long-running session."""
+
+    def test_commands_share_one_process(self, tmp_path, exiftool):
+        image = tmp_path / "a.jpg"
+        image.write_bytes(b"")
+
+        with ExifTool(exiftool) as session:
+            first = session.execute(["-XMP:Description=one", str(image)])
+            pid = session._process.pid
+            second = session.execute(["-XMP:Description=line\nbreak \\ slash", str(image)])
+            assert session._process.pid == pid
+
+        assert first.ok and second.ok
+        args = json.loads((tmp_path / "a.jpg.args").read_text())
+        assert args == ["-XMP:Description=line\nbreak \\ slash", str(image)]
+        assert session._process is None
+
+    def test_per_file_errors(self, tmp_path, exiftool):
+        with ExifTool(exiftool) as session:
+            result = session.execute([str(tmp_path / "missing.jpg")])
+            assert not result.ok
+            assert result.message.startswith("Error: File not found")
+
+            (tmp_path / "b.jpg").write_bytes(b"")
+            assert session.execute([str(tmp_path / "b.jpg")]).ok
+
+    def test_restarts_after_crash(self, tmp_path, exiftool):
+        image = tmp_path / "a.jpg"
+        image.write_bytes(b"")
+
+        with ExifTool(exiftool) as session:
+            with pytest.raises(ExifToolError):
+                session.execute(["-crash", str(image)])
+            assert session.execute([str(image)]).ok
+
+    def test_missing_executable(self, tmp_path):
+        with pytest.raises(ExifToolError, match="Cannot start"):
+            ExifTool(str(tmp_path / "nope")).execute(["x.jpg"])
+
+    def test_pool(self, tmp_path, exiftool):
+        from schenesort.parallel import bounded_map
+
+        images = [tmp_path / f"{i}.jpg" for i in range(8)]
+        for image in images:
+            image.write_bytes(b"")
+
+        with ExifToolPool(3, exiftool) as pool:
+            results = list(bounded_map(lambda p: pool.execute([str(p)]), images, 3))
+
+        assert all(result.ok for _, result in results)
+        assert all((tmp_path / f"{i}.jpg.args").exists() for i in range(8))
+
+
+class TestEmbedCommand:
+    """Tests for metadata embed through the session."""
+
+    def test_embed(self, tmp_path, exiftool):
+        from schenesort.xmp import ImageMetadata, write_xmp
+
+        images = tmp_path / "images"
+        images.mkdir()
+        for name in ("a.jpg", "b.jpg"):
+            (images / name).write_bytes(b"")
+            write_xmp(images / name, ImageMetadata(description=name, tags=["sea", "sky"]))
+        (images / "c.jpg").write_bytes(b"")
+        write_xmp(images / "c.jpg", ImageMetadata())
+
+        result = runner.invoke(app, ["metadata", "embed", str(images), "-j", "2"])
+
+        assert result.exit_code == 0
+        assert "Embedded metadata in 2 file(s), skipped 1." in result.stdout
+        args = json.loads((images / "a.jpg.args").read_text())
+        assert (
+            args
+            == textwrap.dedent(f"""\
+            -overwrite_original
+            -IPTC:Caption-Abstract=a.jpg
+            -XMP:Description=a.jpg
+            -IPTC:Keywords=sea
+            -XMP:Subject=sea
+            -IPTC:Keywords=sky
+            -XMP:Subject=sky
+            {images / "a.jpg"}""").splitlines()
+        )
@@ -0,0 +1,77 @@
+"""Tests for the gallery's filter queries."""
+
+import asyncio
+
+from schenesort.db import WallpaperDB, get_default_db_path
+from schenesort.tui.grid_app import GridBrowser
+from schenesort.tui.widgets.filter_panel import FilterValues
+from schenesort.xmp import ImageMetadata
+
+
+def _index(tmp_path, names):
+    images = tmp_path / "images"
+    images.mkdir()
+    with WallpaperDB() as db:
+        for name, style in names:
+            path = images / name
+            path.write_bytes(b"")
+            db.index_image(path, ImageMetadata(style=style))
+        db.commit()
+    return images
+
+
+def run_browser(check, filters=None):
+    """Run the gallery headless and call check(app, pilot)."""
+
+    async def main():
+        app = GridBrowser(filters, jobs=0)
+        async with app.run_test(size=(120, 40)) as pilot:
+            await check(app, pilot)
+
+    asyncio.run(main())
+
+
+async def _settle(app, pilot):
+    """Wait for the query workers, cancelled ones included, to finish."""
+    for _ in range(100):
+        if all(worker.is_finished for worker in app.workers):
+            break
+        await pilot.pause(0.05)
+    await pilot.pause()
+
+
+class TestGridBrowserQuery:
+    """Tests for running filter queries off the UI thread."""
+
+    def test_initial_query_skips_missing_files(self, tmp_path):
+        images = _index(tmp_path, [("a.jpg", "photo"), ("b.jpg", "art"), ("c.jpg", "photo")])
+        (images / "b.jpg").unlink()
+
+        async def check(app, pilot):
+            await _settle(app, pilot)
+            assert [p.name for p in app._images] == ["a.jpg", "c.jpg"]
+            assert app._db.read_only
+
+        run_browser(check)
+
+    def test_superseded_query_is_dropped(self, tmp_path):
+        _index(tmp_path, [("a.jpg", "photo"), ("b.jpg", "art"), ("c.jpg", "photo")])
+
+        async def check(app, pilot):
+            await _settle(app, pilot)
+            app._query_database(FilterValues(style="photo"))
+            app._query_database(FilterValues(style="art"))
+            await _settle(app, pilot)
+            assert [p.name for p in app._images] == ["b.jpg"]
+
+        run_browser(check)
+
+    def test_creates_missing_database(self):
+        assert not get_default_db_path().exists()
+
+        async def check(app, pilot):
+            await _settle(app, pilot)
+            assert app._images == []
+            assert get_default_db_path().exists()
+
+        run_browser(check)
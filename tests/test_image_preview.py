@@ -0,0 +1,128 @@
+"""Tests for the preview panel's decoding and prefetching."""
+
+import asyncio
+import os
+
+from PIL import Image as PILImage
+from textual.app import App
+
+from schenesort.tui.widgets import image_preview
+from schenesort.tui.widgets.image_preview import (
+    FALLBACK_CELL_SIZE,
+    ImagePreview,
+    PreviewCache,
+    cell_size,
+    decode_preview,
+    neighbours,
+)
+
+
+def _make_image(path, size=(1600, 1000), mode="RGB"):
+    PILImage.new(mode, size, "red").save(path)
+    return path
+
+
+class TestNeighbours:
+    """Tests for prefetch order."""
+
+    def test_nearest_first_next_before_previous(self):
+        images = list("abcdefg")
+        assert neighbours(images, 3, depth=2) == ["e", "c", "f", "b"]
+
+    def test_clipped_at_ends(self):
+        images = list("abc")
+        assert neighbours(images, 0, depth=2) == ["b", "c"]
+        assert neighbours(images, 2, depth=1) == ["b"]
+
+
+class TestCellSize:
+    """Tests for the terminal cell size lookup."""
+
+    def test_fallback_without_private_api(self, monkeypatch):
+        monkeypatch.setattr(image_preview, "get_cell_size", None)
+        assert cell_size() == FALLBACK_CELL_SIZE
+
+
+class TestDecodePreview:
+    """Tests for decoding at the panel size."""
+
+    def test_fits_within_size(self, tmp_path):
+        image = decode_preview(_make_image(tmp_path / "big.jpg"), (400, 400))
+        assert image.size == (400, 250)
+        assert image.mode == "RGB"
+
+    def test_small_image_not_enlarged(self, tmp_path):
+        image = decode_preview(_make_image(tmp_path / "small.png", (100, 50)), (400, 400))
+        assert image.size == (100, 50)
+
+    def test_palette_converted(self, tmp_path):
+        image = decode_preview(_make_image(tmp_path / "p.gif", (100, 50), "P"), (400, 400))
+        assert image.mode == "RGB"
+
+
+class TestPreviewCache:
+    """Tests for the decoded image LRU."""
+
+    def test_least_recently_used_dropped(self, tmp_path):
+        cache = PreviewCache(max_entries=2)
+        keys = [cache.key(_make_image(tmp_path / f"{i}.png", (8, 8)), (10, 10)) for i in range(3)]
+        for key in keys[:2]:
+            cache.put(key, PILImage.new("RGB", (1, 1)))
+        assert cache.get(keys[0]) is not None
+        cache.put(keys[2], PILImage.new("RGB", (1, 1)))
+
+        assert keys[0] in cache
+        assert keys[1] not in cache
+        assert len(cache) == 2
+
+    def test_key_changes_with_mtime_and_size(self, tmp_path):
+        path = _make_image(tmp_path / "a.png", (8, 8))
+        key = PreviewCache.key(path, (10, 10))
+        assert PreviewCache.key(path, (20, 10)) != key
+        os.utime(path, ns=(0, 0))
+        assert PreviewCache.key(path, (10, 10)) != key
+        assert PreviewCache.key(tmp_path / "missing.png", (10, 10)) is None
+
+
+class PreviewApp(App):
+    def __init__(self, cache: PreviewCache) -> None:
+        super().__init__()
+        self.cache = cache
+
+    def compose(self):
+        yield ImagePreview(cache=self.cache, id="preview")
+
+
+class TestImagePreview:
+    """Tests for loading and prefetching in the widget."""
+
+    def test_prefetches_neighbours(self, tmp_path):
+        images = [_make_image(tmp_path / f"{i}.jpg") for i in range(5)]
+        cache = PreviewCache()
+
+        async def main():
+            app = PreviewApp(cache)
+            async with app.run_test(size=(80, 30)) as pilot:
+                preview = app.query_one(ImagePreview)
+                await pilot.pause()
+                preview.load_image(images[2], neighbours(images, 2, depth=1))
+                for _ in range(100):
+                    if len(cache) == 3:
+                        break
+                    await pilot.pause(0.05)
+                await pilot.pause()
+
+                size = preview._target_size()
+                assert all(cache.key(images[i], size) in cache for i in (1, 2, 3))
+                widget = preview._image_widget
+                assert widget is not None and widget.display
+                shown = widget.image
+                assert isinstance(shown, PILImage.Image)
+                assert shown.width <= size[0] and shown.height <= size[1]
+
+                # A prefetched neighbour is shown at once, in the same widget
+                preview.load_image(images[3])
+                assert widget.image is cache.get(cache.key(images[3], size))
+                assert preview._image_widget is widget
+
+        asyncio.run(main())
@@ -0,0 +1,54 @@
+"""Tests for the browsers' metadata lookup."""
+
+from schenesort.db import WallpaperDB
+from schenesort.tui import metadata as lookup_module
+from schenesort.tui.metadata import MetadataLookup
+from schenesort.xmp import ImageMetadata, write_xmp
+
+
+def _indexed(tmp_path, count):
+    images = [tmp_path / f"{i:04}.jpg" for i in range(count)]
+    with WallpaperDB(tmp_path / "index.db") as db:
+        db.index_many((path, ImageMetadata(description=path.stem, tags=["sky"])) for path in images)
+    return images
+
+
+class TestMetadataLookup:
+    """Tests for windowed index reads and the sidecar fallback."""
+
+    def test_served_from_index_in_windows(self, tmp_path, monkeypatch):
+        images = _indexed(tmp_path, 600)
+        queries = []
+        load = lookup_module.load_indexed_metadata
+        monkeypatch.setattr(
+            lookup_module,
+            "load_indexed_metadata",
+            lambda paths, db_path: queries.append(len(paths)) or load(paths, db_path),
+        )
+        monkeypatch.setattr(lookup_module, "read_xmp", lambda path: 1 / 0)
+
+        lookup = MetadataLookup(images, tmp_path / "index.db")
+        for index in range(0, 128):
+            assert lookup.get(index).description == images[index].stem
+        assert queries == [MetadataLookup.WINDOW]
+
+        assert lookup.get(500).tags == ["sky"]
+        assert lookup.get(400).description == "0400"
+        assert len(queries) == 2
+
+    def test_unindexed_images_read_from_sidecar(self, tmp_path):
+        images = _indexed(tmp_path, 2)
+        extra = tmp_path / "new.jpg"
+        write_xmp(extra, ImageMetadata(description="not indexed yet"))
+
+        lookup = MetadataLookup([*images, extra], tmp_path / "index.db")
+        assert lookup.get(0).description == "0000"
+        assert lookup.get(2).description == "not indexed yet"
+
+    def test_without_index(self, tmp_path):
+        image = tmp_path / "a.jpg"
+        write_xmp(image, ImageMetadata(description="sidecar only"))
+
+        lookup = MetadataLookup([image], tmp_path / "missing.db")
+        assert lookup.get(0).description == "sidecar only"
+        assert not (tmp_path / "missing.db").exists()
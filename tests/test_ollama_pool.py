@@ -0,0 +1,139 @@
+"""Tests for spreading requests over several Ollama hosts."""
+
+import http.server
+import threading
+
+import httpx
+import ollama
+import pytest
+
+from schenesort.ollama_pool import HostDispatcher, is_host_error
+
+
+@pytest.fixture
+def ollama_server():
+    """Minimal keep-alive HTTP server answering the model list endpoint."""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = b'{"models": []}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestHostDispatcher:
+    """Tests for host selection, failover and backoff."""
+
+    def test_prefers_least_loaded_host(self):
+        dispatcher = HostDispatcher(["a", "b"])
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow(host):
+            started.set()
+            release.wait(5)
+            return host
+
+        worker = threading.Thread(target=dispatcher.run, args=(slow,))
+        worker.start()
+        started.wait(5)
+        try:
+            assert dispatcher.run(lambda host: host) == "b"
+        finally:
+            release.set()
+            worker.join()
+
+    def test_spreads_sequential_requests(self):
+        dispatcher = HostDispatcher(["a", "b", "c"])
+        used = [dispatcher.run(lambda host: host) for _ in range(6)]
+        assert sorted(used) == ["a", "a", "b", "b", "c", "c"]
+
+    def test_fails_over_and_backs_off(self):
+        dispatcher = HostDispatcher(["bad", "good"])
+
+        def request(host):
+            if host == "bad":
+                raise ConnectionError("down")
+            return host
+
+        assert [dispatcher.run(request) for _ in range(4)] == ["good"] * 4
+        # The failing host is only tried once, then avoided while backing off
+        assert dispatcher.stats["bad"].requests == 1
+        assert dispatcher.stats["good"].succeeded == 4
+
+    def test_raises_when_every_host_fails(self):
+        dispatcher = HostDispatcher(["a", "b"])
+
+        def request(host):
+            raise ConnectionError(host)
+
+        with pytest.raises(ConnectionError):
+            dispatcher.run(request)
+        assert dispatcher.stats["a"].failures == dispatcher.stats["b"].failures == 1
+
+    def test_request_error_not_retried(self):
+        dispatcher = HostDispatcher(["a", "b", "c"])
+        tried = []
+
+        def request(host):
+            tried.append(host)
+            raise ollama.ResponseError("model not found", 404)
+
+        with pytest.raises(ollama.ResponseError):
+            dispatcher.run(request)
+        assert tried == ["a"]
+        assert dispatcher.stats["a"].failures == 1
+        for host in ("a", "b", "c"):
+            assert dispatcher.stats[host].backoff_until == 0.0
+        assert dispatcher.stats["b"].requests == dispatcher.stats["c"].requests == 0
+
+    def test_host_errors(self):
+        assert is_host_error(ConnectionError("refused"))
+        assert is_host_error(httpx.ReadTimeout("slow"))
+        assert is_host_error(ollama.ResponseError("overloaded", 503))
+        assert not is_host_error(ollama.ResponseError("bad image", 400))
+        assert not is_host_error(ValueError("bad reply"))
+
+    def test_duplicate_hosts_collapsed(self):
+        assert HostDispatcher(["a", "a", "b"]).hosts == ["a", "b"]
+        assert HostDispatcher([]).hosts == [None]
+
+    def test_summary_lists_used_hosts(self):
+        dispatcher = HostDispatcher([None, "http://box:11434"])
+        dispatcher.run(lambda host: host)
+        lines = dispatcher.summary()
+        assert len(lines) == 1
+        assert lines[0].startswith("localhost:11434: 1 ok, 0 failed")
+
+
+class TestConnectionReuse:
+    """Tests for the shared keep-alive clients."""
+
+    def test_client_shared_per_host(self):
+        with HostDispatcher(["http://a:11434", "http://b:11434"]) as dispatcher:
+            assert dispatcher.client("http://a:11434") is dispatcher.client("http://a:11434")
+            assert dispatcher.client("http://a:11434") is not dispatcher.client("http://b:11434")
+
+    def test_requests_reuse_one_connection(self, ollama_server):
+        with HostDispatcher([ollama_server], timeout=5) as dispatcher:
+            for _ in range(4):
+                dispatcher.run(lambda host: dispatcher.client(host).list())
+
+        assert dispatcher.connections.requests == 4
+        assert dispatcher.connections.connections == 1
+        assert dispatcher.connections.reuse_rate == 0.75
@@ -0,0 +1,134 @@
+"""Tests for reading image dimensions from headers."""
+
+import random
+import struct
+
+import pytest
+from PIL import Image
+
+from schenesort.probe import (
+    SIGNATURE_SIZE,
+    get_image_dimensions,
+    probe_dimensions,
+    read_signature,
+)
+
+FORMATS = [
+    ("jpg", {}),
+    ("jpg", {"progressive": True}),
+    ("png", {}),
+    ("gif", {}),
+    ("bmp", {}),
+    ("webp", {"lossless": True}),
+    ("webp", {"quality": 80}),
+    ("tiff", {}),
+    ("tiff", {"compression": "tiff_lzw"}),
+]
+
+
+def _pil_size(path):
+    with Image.open(path) as img:
+        return img.size
+
+
+class TestProbe:
+    """The header probe must agree with PIL."""
+
+    @pytest.mark.parametrize(("ext", "options"), FORMATS)
+    def test_matches_pil(self, tmp_path, ext, options):
+        rng = random.Random(ext)
+        for i in range(5):
+            size = (rng.randint(1, 700), rng.randint(1, 700))
+            path = tmp_path / f"{i}.{ext}"
+            Image.new("RGB", size, (i * 40, 10, 200)).save(path, **options)
+            assert probe_dimensions(path) == size == _pil_size(path)
+
+    def test_jpeg_with_large_exif_and_cmyk(self, tmp_path):
+        path = tmp_path / "a.jpg"
+        exif = Image.Exif()
+        exif[0x010E] = "x" * 40000  # ImageDescription, pushes the frame header far back
+        Image.new("CMYK", (123, 45)).save(path, exif=exif)
+        assert probe_dimensions(path) == (123, 45)
+
+    def test_webp_with_alpha(self, tmp_path):
+        path = tmp_path / "a.webp"
+        Image.new("RGBA", (301, 17), (1, 2, 3, 128)).save(path, lossless=False)
+        assert probe_dimensions(path) == (301, 17) == _pil_size(path)
+
+    def test_big_endian_tiff(self, tmp_path):
+        # Minimal big-endian TIFF: one IFD with width (SHORT) and height (LONG)
+        entries = struct.pack(">HHIHH", 256, 3, 1, 640, 0) + struct.pack(">HHII", 257, 4, 1, 480)
+        data = b"MM\x00*" + struct.pack(">I", 8) + struct.pack(">H", 2) + entries + b"\0" * 8
+        path = tmp_path / "a.tif"
+        path.write_bytes(data)
+        assert probe_dimensions(path) == (640, 480)
+
+    def test_top_down_bmp(self, tmp_path):
+        path = tmp_path / "a.bmp"
+        Image.new("RGB", (10, 7)).save(path)
+        data = bytearray(path.read_bytes())
+        data[22:26] = struct.pack("<i", -7)
+        path.write_bytes(bytes(data))
+        assert probe_dimensions(path) == (10, 7)
+
+    @pytest.mark.parametrize(
+        "data",
+        [b"", b"\xff\xd8\xff", b"\xff\xd8" + b"\x00" * 40, b"not an image at all, just text"],
+    )
+    def test_unrecognised(self, tmp_path, data):
+        path = tmp_path / "a.jpg"
+        path.write_bytes(data)
+        assert probe_dimensions(path) is None
+        assert get_image_dimensions(path) == (0, 0)
+
+    def test_falls_back_to_pil(self, tmp_path):
+        path = tmp_path / "a.tga"
+        Image.new("RGB", (33, 22)).save(path)
+        assert probe_dimensions(path) is None
+        assert get_image_dimensions(path) == (33, 22)
+
+    def test_missing_file(self, tmp_path):
+        assert get_image_dimensions(tmp_path / "missing.png") == (0, 0)
+
+
+def _png_chunk(kind, data):
+    return len(data).to_bytes(4, "big") + kind + data + b"\0\0\0\0"
+
+
+class TestReadSignature:
+    """A short signature must give the same filetype result as 8 KB."""
+
+    def test_agrees_with_filetype(self, tmp_path):
+        import filetype
+
+        samples = {}
+        for ext, options in FORMATS:
+            path = tmp_path / f"sample_{len(samples)}.{ext}"
+            Image.new("RGB", (40, 30)).save(path, **options)
+            samples[path] = None
+
+        ihdr = _png_chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0))
+        padding = _png_chunk(b"iTXt", b"x" * 3000)
+        actl = _png_chunk(b"acTL", struct.pack(">II", 1, 0))
+        idat = _png_chunk(b"IDAT", b"")
+        png = b"\x89PNG\r\n\x1a\n"
+        samples[tmp_path / "apng.png"] = png + ihdr + padding + actl + idat
+        samples[tmp_path / "far_actl.png"] = png + ihdr + padding * 3 + actl + idat
+        samples[tmp_path / "plain.png"] = png + ihdr + padding + idat
+        brands = b"mif1" * 100
+        ftyp = (16 + len(brands)).to_bytes(4, "big") + b"ftypmif1\0\0\0\0" + brands
+        samples[tmp_path / "a.heic"] = ftyp + b"\0" * 100
+        samples[tmp_path / "dicom.jpg"] = b"\0" * 128 + b"DICM" + b"\0" * 200
+        samples[tmp_path / "text.jpg"] = b"hello" * 3000
+        samples[tmp_path / "tiny.jpg"] = b"\xff\xd8\xff"
+
+        for path, data in samples.items():
+            if data is not None:
+                path.write_bytes(data)
+            signature = read_signature(path)
+            expected = filetype.guess(path)
+            actual = filetype.guess(signature)
+            assert (actual and actual.mime) == (expected and expected.mime), path.name
+
+        assert len(read_signature(tmp_path / "text.jpg")) == SIGNATURE_SIZE
+        assert filetype.guess(read_signature(tmp_path / "apng.png")).extension == "apng"
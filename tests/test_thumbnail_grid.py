@@ -0,0 +1,216 @@
+"""Tests for the virtualized thumbnail grid."""
+
+import asyncio
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from PIL import Image as PILImage
+from textual.app import App
+from textual_image.widget import Image
+
+from schenesort.thumbnails import thumbnail_exists
+from schenesort.tui.widgets import thumbnail_grid
+from schenesort.tui.widgets.thumbnail_grid import ThumbnailGrid, ThumbnailText
+
+IMAGES = [Path(f"/nonexistent/wallpaper{i:05}.jpg") for i in range(5000)]
+
+
+class GridApp(App):
+    def __init__(self, images: list[Path], jobs: int = 0) -> None:
+        super().__init__()
+        self.images = images
+        self.jobs = jobs
+        self.messages: list[tuple[str, int]] = []
+
+    def compose(self):
+        yield ThumbnailGrid(jobs=self.jobs, id="grid")
+
+    def on_thumbnail_grid_selection_changed(self, event: ThumbnailGrid.SelectionChanged) -> None:
+        self.messages.append(("changed", event.index))
+
+    def on_thumbnail_grid_image_selected(self, event: ThumbnailGrid.ImageSelected) -> None:
+        self.messages.append(("selected", event.index))
+
+
+def run_grid(images, keys=(), check=None, jobs=0, until=None):
+    """Run the grid headless with images, press keys, and call check(app, grid).
+
+    With until, wait (up to a timeout) for until(grid) to hold before checking.
+    """
+
+    async def main():
+        app = GridApp(images, jobs)
+        async with app.run_test(size=(100, 40)) as pilot:
+            grid = app.query_one(ThumbnailGrid)
+            grid.set_images(app.images)
+            grid.focus()
+            await pilot.pause()
+            for key in keys:
+                await pilot.press(key)
+            await pilot.pause()
+            for _ in range(300):
+                if until is None or until(grid):
+                    break
+                await pilot.pause(0.1)
+            check(app, grid)
+
+    asyncio.run(main())
+
+
+def _selected_cells(grid):
+    return [cell.index for cell in grid._cells if cell.has_class("selected")]
+
+
+class TestThumbnailGrid:
+    """Tests for cell windowing and keyboard navigation."""
+
+    def test_mounts_only_visible_rows(self):
+        def check(app, grid):
+            assert grid._columns == 3
+            assert len(grid._cells) < 40
+            assert [cell.index for cell in grid._cells] == list(range(len(grid._cells)))
+            assert all(isinstance(cell, ThumbnailText) for cell in grid._cells)
+            assert _selected_cells(grid) == [0]
+
+        run_grid(IMAGES, check=check)
+
+    def test_navigation_moves_window(self):
+        def check(app, grid):
+            assert grid.selected_index == 31
+            assert grid.selected_image == IMAGES[31]
+            indexes = [cell.index for cell in grid._cells]
+            assert indexes[0] > 0
+            assert 31 in indexes
+            assert _selected_cells(grid) == [31]
+            assert app.messages[-1] == ("selected", 31)
+            assert ("changed", 30) in app.messages
+
+        run_grid(IMAGES, ["j"] * 10 + ["l", "enter"], check)
+
+    def test_last_and_first(self):
+        def check(app, grid):
+            assert grid.selected_index == 0
+            assert grid.scroll_y == 0
+            assert _selected_cells(grid) == [0]
+            assert app.messages == [("changed", 4999), ("changed", 0)]
+
+        run_grid(IMAGES, ["G", "g"], check)
+
+    def test_end_of_list(self):
+        def check(app, grid):
+            indexes = [cell.index for cell in grid._cells]
+            assert indexes[-1] == 4999
+            assert _selected_cells(grid) == [4999]
+            assert grid._cells[-1].image_path == IMAGES[4999]
+
+        run_grid(IMAGES, ["G"], check)
+
+    def test_recycles_cells_when_scrolling(self):
+        def check(app, grid):
+            before = list(grid._cells)
+            grid.scroll_y = grid.CELL_HEIGHT * 50
+            assert grid._cells == before
+            assert grid._cells[0].index == (50 - grid.OVERSCAN_ROWS) * grid._columns
+
+        run_grid(IMAGES, check=check)
+
+    def test_small_and_empty_lists(self):
+        def check(app, grid):
+            assert [cell.index for cell in grid._cells] == [0, 1]
+            grid.set_images([])
+            assert grid._cells == []
+            assert grid._empty_message.display
+            assert grid.selected_image is None
+
+        run_grid(IMAGES[:2], check=check)
+
+
+class TestBackgroundThumbnails:
+    """Tests for generating missing thumbnails while browsing."""
+
+    def test_placeholders_replaced_when_ready(self, tmp_path):
+        images = []
+        for i in range(4):
+            path = tmp_path / f"wallpaper{i}.jpg"
+            PILImage.new("RGB", (640, 400), (i * 60, 0, 0)).save(path)
+            images.append(path)
+        broken = tmp_path / "broken.jpg"
+        broken.write_bytes(b"not an image")
+        images.append(broken)
+
+        def ready(grid):
+            return broken in grid._failed and sum(isinstance(c, Image) for c in grid._cells) == 4
+
+        def check(app, grid):
+            assert all(thumbnail_exists(path) for path in images[:4])
+            assert [type(cell) for cell in grid._cells] == [Image] * 4 + [ThumbnailText]
+            assert [cell.index for cell in grid._cells] == list(range(5))
+            assert _selected_cells(grid) == [0]
+
+        run_grid(images, check=check, jobs=1, until=ready)
+
+    def test_pool_restarted_after_worker_crash(self, tmp_path, monkeypatch):
+        images = []
+        for i in range(3):
+            path = tmp_path / f"wallpaper{i}.jpg"
+            PILImage.new("RGB", (640, 400), (i * 60, 0, 0)).save(path)
+            images.append(path)
+
+        pools = []
+
+        class FakePool:
+            """Runs jobs in the calling thread; the first pool's first job kills it."""
+
+            def __init__(self):
+                self.broken = False
+                self.crashes = not pools
+                pools.append(self)
+
+            def submit(self, fn, *args):
+                if self.broken:
+                    raise BrokenProcessPool("pool is broken")
+                future = Future()
+                if self.crashes:
+                    self.broken = True
+                    future.set_exception(BrokenProcessPool("worker died"))
+                else:
+                    future.set_result(fn(*args))
+                return future
+
+            def shutdown(self, wait=True, cancel_futures=False):
+                pass
+
+        monkeypatch.setattr(thumbnail_grid, "_start_process_pool", lambda workers: FakePool())
+
+        def ready(grid):
+            return sum(isinstance(c, Image) for c in grid._cells) == 3
+
+        def check(app, grid):
+            assert len(pools) == 2
+            assert grid._failed == set()
+            assert all(thumbnail_exists(path) for path in images)
+
+        run_grid(images, check=check, jobs=1, until=ready)
+
+    def test_visible_cells_queued_first(self, monkeypatch):
+        queued = []
+        monkeypatch.setattr(
+            ThumbnailGrid, "_generate_missing", lambda self, paths: queued.append(paths)
+        )
+
+        def window_queued(grid):
+            window = {cell.image_path for cell in grid._cells}
+            return bool(queued) and set(queued[-1]) == window
+
+        def check(app, grid):
+            paths = queued[-1]
+            window = [cell.image_path for cell in grid._cells]
+            height = grid.scrollable_content_region.height
+            first = int(grid.scroll_y) // grid.CELL_HEIGHT * grid._columns
+            end = -(-(int(grid.scroll_y) + height) // grid.CELL_HEIGHT) * grid._columns
+            in_view = [path for path in window if first <= IMAGES.index(path) < end]
+            assert 0 < len(in_view) < len(window)
+            assert paths == in_view + [path for path in window if path not in in_view]
+
+        run_grid(IMAGES, ["G"], check, jobs=1, until=window_queued)
@@ -0,0 +1,184 @@
+"""Tests for thumbnail generation."""
+
+import os
+
+from PIL import Image, ImageChops, ImageStat
+
+from schenesort.cli import load_collage_tile
+from schenesort.thumbnails import (
+    THUMBNAIL_HEIGHT,
+    THUMBNAIL_WIDTH,
+    ThumbnailCache,
+    draft_for_size,
+    generate_thumbnail,
+    get_cache_stats,
+)
+
+
+def _make_jpeg(path, size=(2560, 1600), mode="RGB"):
+    gradient = Image.linear_gradient("L").resize(size)
+    img = Image.merge("RGB", (gradient, gradient.transpose(Image.Transpose.ROTATE_180), gradient))
+    if mode != "RGB":
+        img = img.convert(mode)
+    img.save(path, "JPEG", quality=95)
+
+
+def _mean_difference(a, b):
+    diff = ImageChops.difference(a.convert("RGB"), b.convert("RGB"))
+    return sum(ImageStat.Stat(diff).mean) / 3
+
+
+class TestDraftDecoding:
+    """Tests for reduced-resolution decoding."""
+
+    def test_draft_reduces_jpeg_decode_size(self, tmp_path):
+        source = tmp_path / "big.jpg"
+        _make_jpeg(source)
+
+        with Image.open(source) as img:
+            draft_for_size(img, (320, 200))
+            assert img.size == (640, 400)
+
+    def test_draft_ignored_for_png(self, tmp_path):
+        source = tmp_path / "big.png"
+        Image.new("RGB", (2560, 1600)).save(source)
+
+        with Image.open(source) as img:
+            draft_for_size(img, (320, 200))
+            assert img.size == (2560, 1600)
+
+    def test_thumbnail_matches_full_decode(self, tmp_path):
+        source = tmp_path / "cmyk.jpg"
+        _make_jpeg(source, mode="CMYK")
+
+        thumb = generate_thumbnail(source)
+
+        with Image.open(source) as img:
+            reference = img.convert("RGB")
+            reference.thumbnail((THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT), Image.Resampling.LANCZOS)
+        assert thumb is not None
+        with Image.open(thumb) as result:
+            assert result.size == reference.size
+            assert _mean_difference(result, reference) < 2.0
+
+    def test_collage_tile_size_and_quality(self, tmp_path):
+        source = tmp_path / "wide.jpg"
+        _make_jpeg(source, size=(3000, 1000))
+
+        tile = load_collage_tile(source, 480, 270)
+
+        with Image.open(source) as img:
+            reference = img.resize((810, 270), Image.Resampling.LANCZOS).crop((165, 0, 645, 270))
+        assert tile.size == (480, 270)
+        assert _mean_difference(tile, reference) < 2.0
+
+
+def _write_thumb(cache_dir, name, size=1000, mtime=None):
+    thumb = cache_dir / name
+    thumb.write_bytes(b"x" * size)
+    if mtime is not None:
+        os.utime(thumb, (mtime, mtime))
+    return thumb
+
+
+class TestThumbnailCache:
+    """Tests for the thumbnail cache index and eviction."""
+
+    def test_existing_thumbnails_indexed_once(self, tmp_path):
+        _write_thumb(tmp_path, "a.jpg")
+        _write_thumb(tmp_path, "b.jpg", size=500)
+
+        with ThumbnailCache(tmp_path) as cache:
+            assert cache.stats() == (2, 1500)
+
+        # Later files only count once recorded or reconciled
+        _write_thumb(tmp_path, "c.jpg")
+        with ThumbnailCache(tmp_path) as cache:
+            assert cache.stats() == (2, 1500)
+
+    def test_evicts_least_recently_used_by_size(self, tmp_path):
+        for i, name in enumerate(["old.jpg", "mid.jpg", "new.jpg"]):
+            _write_thumb(tmp_path, name, mtime=1000 + i)
+
+        with ThumbnailCache(tmp_path, max_bytes=2500) as cache:
+            assert cache.evict() == 1
+            assert cache.stats() == (2, 2000)
+
+        assert not (tmp_path / "old.jpg").exists()
+        assert (tmp_path / "mid.jpg").exists()
+        assert (tmp_path / "new.jpg").exists()
+
+    def test_touch_protects_from_eviction(self, tmp_path):
+        for i, name in enumerate(["old.jpg", "mid.jpg", "new.jpg"]):
+            _write_thumb(tmp_path, name, mtime=1000 + i)
+
+        with ThumbnailCache(tmp_path, max_bytes=0, max_entries=2) as cache:
+            cache.touch([tmp_path / "old.jpg"])
+            # Slack takes the cache down to one entry
+            assert cache.evict() == 2
+
+        assert (tmp_path / "old.jpg").exists()
+        assert not (tmp_path / "mid.jpg").exists()
+        assert not (tmp_path / "new.jpg").exists()
+
+    def test_eviction_leaves_slack(self, tmp_path):
+        for i in range(100):
+            _write_thumb(tmp_path, f"{i:03}.jpg", size=10, mtime=1000 + i)
+
+        with ThumbnailCache(tmp_path, max_bytes=0, max_entries=80) as cache:
+            assert cache.evict() == 24
+            assert cache.stats()[0] == 76
+            # Within budget now, so nothing more to do
+            cache.record([_write_thumb(tmp_path, "extra.jpg", size=10)])
+            assert cache.evict() == 0
+
+    def test_unrecorded_thumbnails_evicted(self, tmp_path):
+        with ThumbnailCache(tmp_path, max_bytes=2500) as cache:
+            cache.record([_write_thumb(tmp_path, "new.jpg", mtime=2000)])
+        # Written behind the index's back, like a direct generate_thumbnail() call
+        _write_thumb(tmp_path, "old.jpg", mtime=1000)
+        _write_thumb(tmp_path, "mid.jpg", mtime=1500)
+
+        with ThumbnailCache(tmp_path, max_bytes=2500) as cache:
+            assert cache.stats() == (1, 1000)
+            assert cache.evict() == 1
+            assert cache.stats() == (2, 2000)
+
+        assert not (tmp_path / "old.jpg").exists()
+        assert (tmp_path / "new.jpg").exists()
+
+    def test_within_budget_keeps_everything(self, tmp_path):
+        _write_thumb(tmp_path, "a.jpg")
+
+        with ThumbnailCache(tmp_path) as cache:
+            assert cache.evict() == 0
+        assert (tmp_path / "a.jpg").exists()
+
+    def test_record_and_clear(self, tmp_path):
+        with ThumbnailCache(tmp_path) as cache:
+            cache.record([_write_thumb(tmp_path, "a.jpg"), tmp_path / "missing.jpg"])
+            assert cache.stats() == (1, 1000)
+
+            assert cache.clear() == 1
+            assert cache.stats() == (0, 0)
+        assert not (tmp_path / "a.jpg").exists()
+
+    def test_reconcile_drops_deleted_files(self, tmp_path):
+        thumb = _write_thumb(tmp_path, "a.jpg")
+
+        with ThumbnailCache(tmp_path) as cache:
+            thumb.unlink()
+            cache.reconcile()
+            assert cache.stats() == (0, 0)
+
+    def test_generated_thumbnails_in_stats(self, tmp_path):
+        source = tmp_path / "img.jpg"
+        _make_jpeg(source, size=(640, 400))
+        thumb = generate_thumbnail(source)
+
+        with ThumbnailCache() as cache:
+            cache.record([thumb])
+
+        stats = get_cache_stats()
+        assert stats["count"] == 1
+        assert stats["size_bytes"] == thumb.stat().st_size
@@ -0,0 +1,134 @@
+"""Tests for the shared directory walker."""
+
+import os
+
+from schenesort.walker import (
+    FileEntry,
+    existing_paths,
+    find_files,
+    find_images,
+    is_image_name,
+    scan_tree,
+    walk,
+)
+
+
+def _touch(path, data=b""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+class TestWalk:
+    """Tests for walking a collection."""
+
+    def test_images_with_sidecar_flag(self, tmp_path):
+        _touch(tmp_path / "b.jpg")
+        _touch(tmp_path / "a.PNG")
+        _touch(tmp_path / "a.PNG.xmp")
+        _touch(tmp_path / "notes.txt")
+        _touch(tmp_path / "orphan.jpg.xmp")
+
+        entries = list(walk(tmp_path))
+        assert [e.name for e in entries] == ["a.PNG", "b.jpg"]
+        assert [e.has_sidecar for e in entries] == [True, False]
+
+    def test_non_recursive_skips_subdirectories(self, tmp_path):
+        _touch(tmp_path / "top.jpg")
+        _touch(tmp_path / "sub" / "nested.jpg")
+
+        assert [e.name for e in walk(tmp_path)] == ["top.jpg"]
+
+    def test_recursive_order(self, tmp_path):
+        _touch(tmp_path / "z.jpg")
+        _touch(tmp_path / "b" / "2.jpg")
+        _touch(tmp_path / "b" / "1.jpg")
+        _touch(tmp_path / "a" / "deep" / "x.jpg")
+
+        paths = [e.path.relative_to(tmp_path).as_posix() for e in walk(tmp_path, recursive=True)]
+        assert paths == ["z.jpg", "a/deep/x.jpg", "b/1.jpg", "b/2.jpg"]
+
+    def test_does_not_follow_directory_symlinks(self, tmp_path):
+        _touch(tmp_path / "real" / "a.jpg")
+        _touch(tmp_path / "outside" / "b.jpg")
+        (tmp_path / "real" / "link").symlink_to(tmp_path / "outside")
+        (tmp_path / "real" / "c.jpg").symlink_to(tmp_path / "outside" / "b.jpg")
+
+        names = [e.name for e in walk(tmp_path / "real", recursive=True)]
+        assert names == ["a.jpg", "c.jpg"]
+
+    def test_all_files(self, tmp_path):
+        _touch(tmp_path / "a.jpg")
+        _touch(tmp_path / "a.jpg.xmp")
+        _touch(tmp_path / "notes.txt")
+
+        assert [e.name for e in walk(tmp_path, images_only=False)] == ["a.jpg", "notes.txt"]
+
+    def test_stat_and_sidecar_mtime(self, tmp_path):
+        _touch(tmp_path / "a.jpg", b"12345")
+        sidecar = _touch(tmp_path / "a.jpg.xmp")
+        os.utime(sidecar, (1000, 1000))
+
+        (entry,) = walk(tmp_path)
+        assert entry.stat().st_size == 5
+        assert entry.stat() is entry.stat()
+        assert entry.sidecar_mtime() == 1000
+
+    def test_scan_tree_lists_directories(self, tmp_path):
+        _touch(tmp_path / "a.jpg")
+        (tmp_path / "empty").mkdir()
+
+        listing = {d.name: sorted(files) for d, files in scan_tree(tmp_path, recursive=True)}
+        assert listing == {tmp_path.name: ["a.jpg"], "empty": []}
+
+    def test_missing_root(self, tmp_path):
+        assert list(walk(tmp_path / "missing")) == []
+
+
+class TestFind:
+    """Tests for collecting images from a file or directory argument."""
+
+    def test_single_file(self, tmp_path):
+        image = _touch(tmp_path / "a.jpg")
+        _touch(tmp_path / "a.jpg.xmp")
+
+        (entry,) = find_images(image)
+        assert entry.path == image
+        assert entry.has_sidecar
+        assert entry.sidecar_mtime() is not None
+
+    def test_single_non_image(self, tmp_path):
+        text = _touch(tmp_path / "a.txt")
+
+        assert find_images(text) == []
+        assert [e.path for e in find_files(text)] == [text]
+
+    def test_file_entry_without_sidecar(self, tmp_path):
+        entry = FileEntry.for_file(_touch(tmp_path / "a.jpg", b"abc"))
+
+        assert not entry.has_sidecar
+        assert entry.sidecar_mtime() is None
+        assert entry.stat().st_size == 3
+
+    def test_uppercase_sidecar_not_listed(self, tmp_path):
+        _touch(tmp_path / "Photo.JPG")
+        _touch(tmp_path / "Photo.JPG.XMP")
+
+        assert [e.name for e in find_files(tmp_path)] == ["Photo.JPG"]
+
+    def test_is_image_name(self):
+        assert is_image_name("photo.JPEG")
+        assert is_image_name("scan.tif")
+        assert not is_image_name("photo.jpg.xmp")
+        assert not is_image_name("jpg")
+
+
+class TestExistingPaths:
+    """Tests for the batched existence check."""
+
+    def test_keeps_existing_in_order(self, tmp_path):
+        b = _touch(tmp_path / "b.jpg")
+        a = _touch(tmp_path / "sub" / "a.jpg")
+        paths = [b, tmp_path / "gone.jpg", a, tmp_path / "nodir" / "c.jpg"]
+
+        assert existing_paths(paths) == [b, a]
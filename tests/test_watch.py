@@ -0,0 +1,169 @@
+"""Tests for watching a collection and updating the index."""
+
+import sys
+
+import pytest
+
+from schenesort.db import WallpaperDB
+from schenesort.watch import IndexUpdater, InotifyWatcher, PollingWatcher, run
+from schenesort.xmp import ImageMetadata, get_xmp_path, write_xmp
+
+
+def _add_image(path, description="red square"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+    write_xmp(path, ImageMetadata(description=description))
+
+
+@pytest.fixture
+def db(tmp_path):
+    with WallpaperDB(tmp_path / "index.db") as db:
+        yield db
+
+
+def _indexed(db):
+    return sorted(r["filename"] for r in db.query())
+
+
+class TestIndexUpdater:
+    """Tests for applying changed paths to the index."""
+
+    def test_new_and_changed_images(self, tmp_path, db):
+        root = tmp_path / "w"
+        _add_image(root / "a.jpg")
+        (root / "bare.jpg").write_bytes(b"")
+        updater = IndexUpdater(db)
+
+        result = updater.apply({root / "a.jpg", root / "bare.jpg"})
+        assert (result.indexed, result.removed) == (1, 0)
+        assert _indexed(db) == ["a.jpg"]
+
+        _add_image(root / "a.jpg", "blue circle")
+        updater.apply({get_xmp_path(root / "a.jpg")})
+        assert [r["description"] for r in db.query()] == ["blue circle"]
+
+    def test_deleted_image_and_sidecar(self, tmp_path, db):
+        root = tmp_path / "w"
+        _add_image(root / "a.jpg")
+        _add_image(root / "b.jpg")
+        updater = IndexUpdater(db)
+        updater.apply({root / "a.jpg", root / "b.jpg"})
+
+        (root / "a.jpg").unlink()
+        get_xmp_path(root / "b.jpg").unlink()
+        result = updater.apply({root / "a.jpg", get_xmp_path(root / "b.jpg")})
+
+        assert result.removed == 2
+        assert _indexed(db) == []
+
+    def test_directory_moved_in_and_out(self, tmp_path, db):
+        root = tmp_path / "w"
+        _add_image(tmp_path / "outside" / "a.jpg")
+        _add_image(tmp_path / "outside" / "deep" / "b.jpg")
+        updater = IndexUpdater(db)
+
+        root.mkdir()
+        (tmp_path / "outside").rename(root / "album")
+        updater.apply({root / "album"})
+        assert _indexed(db) == ["a.jpg", "b.jpg"]
+
+        (root / "album").rename(tmp_path / "away")
+        result = updater.apply({root / "album"})
+        assert result.removed == 2
+        assert _indexed(db) == []
+
+    def test_generates_thumbnails(self, tmp_path, db):
+        from PIL import Image
+
+        from schenesort.thumbnails import thumbnail_exists
+
+        root = tmp_path / "w"
+        root.mkdir()
+        Image.new("RGB", (64, 48), "red").save(root / "a.png")
+        write_xmp(root / "a.png", ImageMetadata(description="red"))
+
+        result = IndexUpdater(db, thumbnails=True).apply({root / "a.png"})
+
+        assert result.thumbnails == 1
+        assert thumbnail_exists(root / "a.png")
+
+
+class TestPollingWatcher:
+    """Tests for the stat snapshot fallback."""
+
+    def test_reports_created_modified_and_deleted(self, tmp_path):
+        _add_image(tmp_path / "a.jpg")
+        watcher = PollingWatcher(tmp_path, interval=0)
+        assert watcher.changes(0) == set()
+
+        (tmp_path / "notes.txt").write_text("ignored")
+        _add_image(tmp_path / "sub" / "b.jpg")
+        get_xmp_path(tmp_path / "a.jpg").write_text("<x/>")
+        (tmp_path / "a.jpg").unlink()
+
+        assert watcher.changes(0) == {
+            tmp_path / "a.jpg",
+            get_xmp_path(tmp_path / "a.jpg"),
+            tmp_path / "sub" / "b.jpg",
+            get_xmp_path(tmp_path / "sub" / "b.jpg"),
+        }
+
+    def test_uppercase_sidecar_is_relevant(self, tmp_path):
+        watcher = PollingWatcher(tmp_path, interval=0)
+        (tmp_path / "Photo.JPG.XMP").write_text("<x/>")
+
+        assert watcher.changes(0) == {tmp_path / "Photo.JPG.XMP"}
+
+    def test_run_applies_settled_changes(self, tmp_path, db):
+        root = tmp_path / "w"
+        root.mkdir()
+        watcher = PollingWatcher(root, interval=0)
+        _add_image(root / "a.jpg")
+
+        updates = []
+        run(
+            watcher,
+            IndexUpdater(db),
+            debounce=0,
+            on_update=updates.append,
+            should_stop=lambda: bool(updates),
+        )
+
+        assert updates[0].indexed == 1
+        assert _indexed(db) == ["a.jpg"]
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="inotify is Linux only")
+class TestInotifyWatcher:
+    """Tests for the inotify watcher."""
+
+    def test_reports_files_and_new_directories(self, tmp_path):
+        watcher = InotifyWatcher(tmp_path)
+        try:
+            _add_image(tmp_path / "a.jpg")
+            (tmp_path / "notes.txt").write_text("ignored")
+            (tmp_path / "album").mkdir()
+            changed = watcher.changes(1.0)
+            assert changed == {
+                tmp_path / "a.jpg",
+                get_xmp_path(tmp_path / "a.jpg"),
+                tmp_path / "album",
+            }
+
+            # The new directory is watched from now on
+            _add_image(tmp_path / "album" / "b.jpg")
+            assert tmp_path / "album" / "b.jpg" in watcher.changes(1.0)
+
+            (tmp_path / "album").rename(tmp_path / "renamed")
+            assert watcher.changes(1.0) == {tmp_path / "album", tmp_path / "renamed"}
+            _add_image(tmp_path / "renamed" / "c.jpg")
+            assert tmp_path / "renamed" / "c.jpg" in watcher.changes(1.0)
+        finally:
+            watcher.close()
+
+    def test_idle_timeout(self, tmp_path):
+        watcher = InotifyWatcher(tmp_path)
+        try:
+            assert watcher.changes(0.01) == set()
+        finally:
+            watcher.close()
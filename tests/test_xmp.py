@@ -0,0 +1,258 @@
+"""Tests for reading and writing XMP sidecars."""
+
+import os
+import random
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from schenesort.xmp import (
+    NAMESPACES,
+    ImageMetadata,
+    _parse_fast,
+    _parse_general,
+    get_xmp_path,
+    read_xmp,
+    read_xmp_many,
+    serialize_xmp,
+    write_xmp,
+)
+
+WORDS = ["red", "sky", "a & b", "<tag>", "naïve", "日本", '"q"', "x'y", " pad ", "1", "-3"]
+
+
+def _random_text(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 4)))
+
+
+def _random_metadata(rng):
+    return ImageMetadata(
+        description=_random_text(rng),
+        scene=_random_text(rng),
+        tags=[_random_text(rng) for _ in range(rng.randint(0, 4))],
+        mood=[_random_text(rng) for _ in range(rng.randint(0, 3))],
+        style=_random_text(rng),
+        colors=[_random_text(rng) for _ in range(rng.randint(0, 3))],
+        time_of_day=_random_text(rng),
+        subject=_random_text(rng),
+        source=_random_text(rng),
+        ai_model=_random_text(rng),
+        width=rng.choice([0, 1, 1920, 3840]),
+        height=rng.choice([0, 1, 1080, 2160]),
+        recommended_screen=_random_text(rng),
+    )
+
+
+def _mutate(rng, root):
+    """Reshape a written sidecar the way other XMP tools might."""
+    desc = root.find(".//rdf:Description", NAMESPACES)
+    children = list(desc)
+    rdf = NAMESPACES["rdf"]
+    choice = rng.randrange(9)
+    if choice == 0 and children:
+        # Repeated property
+        desc.insert(rng.randrange(len(children) + 1), rng.choice(children))
+    elif choice == 1 and children:
+        desc.remove(rng.choice(children))
+    elif choice == 2:
+        rng.shuffle(children)
+        desc[:] = children
+    elif choice == 3:
+        # Property before the real one with no Bag or Alt inside
+        name = rng.choice(["dc:subject", "schenesort:mood", "dc:description", "schenesort:width"])
+        prefix, local = name.split(":")
+        empty = ET.Element(f"{{{NAMESPACES[prefix]}}}{local}")
+        empty.text = rng.choice(["", "loose text", "12", "wide"])
+        desc.insert(0, empty)
+    elif choice == 4:
+        # Another Description ahead of ours, or ours nested deeper
+        other = ET.Element(f"{{{rdf}}}Description")
+        ET.SubElement(other, f"{{{NAMESPACES['dc']}}}source").text = "other tool"
+        rdf_elem = root.find("rdf:RDF", NAMESPACES)
+        if rng.random() < 0.5 or desc not in list(rdf_elem):
+            rdf_elem.insert(0, other)
+        else:
+            rdf_elem.remove(desc)
+            wrapper = ET.SubElement(rdf_elem, "{urn:example}wrapper")
+            wrapper.append(desc)
+    elif choice == 5:
+        ET.SubElement(desc, "{urn:example}foreign").text = "ignored"
+    elif choice == 6:
+        for li in desc.iter(f"{{{rdf}}}li"):
+            li.text = rng.choice([None, "", li.text])
+    elif choice == 7:
+        # More languages, and an empty Alt ahead of the real one
+        for prop in desc.findall("dc:description", NAMESPACES):
+            alt = prop.find("rdf:Alt", NAMESPACES)
+            if alt is not None:
+                ET.SubElement(alt, f"{{{rdf}}}li").text = "second language"
+                alt.insert(0, ET.Element(f"{{{rdf}}}li"))
+            prop.insert(0, ET.Element(f"{{{rdf}}}Alt"))
+    else:
+        for bag in desc.iter(f"{{{rdf}}}Bag"):
+            ET.SubElement(bag, f"{{{rdf}}}Seq").text = "not an li"
+
+
+def _corpus(tmp_path, count=300):
+    rng = random.Random(14)
+    image = tmp_path / "image.jpg"
+    documents = []
+    for i in range(count):
+        write_xmp(image, _random_metadata(rng))
+        data = get_xmp_path(image).read_bytes()
+        if i % 2:
+            root = ET.fromstring(data)
+            for _ in range(rng.randint(1, 3)):
+                _mutate(rng, root)
+            data = ET.tostring(root, encoding="utf-8")
+        documents.append(data)
+    return documents
+
+
+class TestFastParser:
+    """The fast path must agree with the general parser."""
+
+    def test_fuzz_equivalence(self, tmp_path):
+        for data in _corpus(tmp_path):
+            fast = _parse_fast(data)
+            assert fast is not None
+            assert fast == _parse_general(data)
+
+    def test_round_trip(self, tmp_path):
+        rng = random.Random(1)
+        image = tmp_path / "image.jpg"
+        for _ in range(50):
+            metadata = _random_metadata(rng)
+            write_xmp(image, metadata)
+            read = read_xmp(image)
+            assert read.tags == [t for t in metadata.tags if t]
+            assert read.description == metadata.description
+            assert (read.width, read.height) == (metadata.width, metadata.height)
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b'<!DOCTYPE x [<!ENTITY a "boom">]><x:xmpmeta xmlns:x="adobe:ns:meta/">&a;</x:xmpmeta>',
+            '<?xml version="1.0" encoding="UTF-16"?><x:xmpmeta xmlns:x="adobe:ns:meta/"/>'.encode(
+                "utf-16"
+            ),
+            b"<not xml",
+        ],
+    )
+    def test_falls_back(self, data):
+        assert _parse_fast(data) is None
+
+    def test_entities_rejected(self, tmp_path):
+        image = tmp_path / "image.jpg"
+        get_xmp_path(image).write_bytes(
+            b'<!DOCTYPE x [<!ENTITY a "boom">]>'
+            b'<x:xmpmeta xmlns:x="adobe:ns:meta/" xmlns:rdf="'
+            + NAMESPACES["rdf"].encode()
+            + b'" xmlns:dc="'
+            + NAMESPACES["dc"].encode()
+            + b'"><rdf:RDF><rdf:Description><dc:source>&a;</dc:source>'
+            b"</rdf:Description></rdf:RDF></x:xmpmeta>"
+        )
+        assert read_xmp(image) == ImageMetadata()
+
+    def test_utf16_sidecar(self, tmp_path):
+        image = tmp_path / "image.jpg"
+        write_xmp(image, ImageMetadata(description="wide", tags=["sea"]))
+        text = get_xmp_path(image).read_text(encoding="utf-8")
+        text = text.replace('encoding="UTF-8"', 'encoding="UTF-16"')
+        get_xmp_path(image).write_bytes(text.encode("utf-16"))
+
+        metadata = read_xmp(image)
+        assert (metadata.description, metadata.tags) == ("wide", ["sea"])
+
+    def test_missing_sidecar(self, tmp_path):
+        assert read_xmp(tmp_path / "none.jpg") == ImageMetadata()
+
+
+class TestReadMany:
+    """Tests for reading many sidecars at once."""
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_ordered(self, tmp_path, workers):
+        images = [tmp_path / f"{i:02}.jpg" for i in range(20)]
+        for i, image in enumerate(images):
+            if i % 3:
+                write_xmp(image, ImageMetadata(description=f"picture {i}"))
+
+        pairs = list(read_xmp_many(images, workers))
+        assert [path for path, _ in pairs] == images
+        assert [m.description for _, m in pairs] == [
+            f"picture {i}" if i % 3 else "" for i in range(20)
+        ]
+
+    def test_unordered(self, tmp_path):
+        images = [tmp_path / f"{i:02}.jpg" for i in range(20)]
+        for image in images:
+            write_xmp(image, ImageMetadata(description=image.stem))
+
+        pairs = list(read_xmp_many(iter(images), workers=4, ordered=False))
+        assert sorted(pairs, key=lambda p: p[0]) == [
+            (image, ImageMetadata(description=image.stem)) for image in images
+        ]
+
+
+class TestWriteXmp:
+    """Tests for skipping unchanged writes and replacing sidecars atomically."""
+
+    def test_skips_identical(self, tmp_path):
+        image = tmp_path / "image.jpg"
+        metadata = ImageMetadata(description="sea", tags=["blue"], width=10, height=5)
+        assert write_xmp(image, metadata)
+
+        sidecar = get_xmp_path(image)
+        os.utime(sidecar, (1000, 1000))
+        assert not write_xmp(image, metadata)
+        assert sidecar.stat().st_mtime == 1000
+
+        metadata.tags.append("calm")
+        assert write_xmp(image, metadata)
+        assert sidecar.stat().st_mtime != 1000
+        assert read_xmp(image).tags == ["blue", "calm"]
+
+    def test_document_format(self, tmp_path):
+        image = tmp_path / "image.jpg"
+        write_xmp(image, ImageMetadata(description="sea"))
+
+        data = get_xmp_path(image).read_bytes()
+        assert data.startswith(b'<?xml version="1.0" encoding="UTF-8"?>\n<x:xmpmeta')
+        assert data.endswith(b"</x:xmpmeta>\n")
+        assert data == serialize_xmp(ImageMetadata(description="sea"))
+
+    def test_keeps_mode_and_leaves_no_temp_files(self, tmp_path):
+        image = tmp_path / "image.jpg"
+        write_xmp(image, ImageMetadata(description="one"))
+        sidecar = get_xmp_path(image)
+        sidecar.chmod(0o640)
+
+        assert write_xmp(image, ImageMetadata(description="two"))
+        assert sidecar.stat().st_mode & 0o777 == 0o640
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["image.jpg.xmp"]
+
+    def test_new_sidecar_follows_umask(self, tmp_path):
+        image = tmp_path / "image.jpg"
+        umask = os.umask(0o027)
+        try:
+            write_xmp(image, ImageMetadata(description="one"))
+        finally:
+            os.umask(umask)
+
+        assert get_xmp_path(image).stat().st_mode & 0o777 == 0o640
+
+    def test_failed_write_keeps_old_sidecar(self, tmp_path, monkeypatch):
+        image = tmp_path / "image.jpg"
+        write_xmp(image, ImageMetadata(description="old"))
+
+        def fail(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("schenesort.xmp.os.replace", fail)
+        with pytest.raises(OSError):
+            write_xmp(image, ImageMetadata(description="new"))
+
+        assert read_xmp(image).description == "old"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["image.jpg.xmp"]